@@ -4,12 +4,20 @@
 page_copy.json + research_report.json → design_spec.json
 """
 
+import argparse
+import asyncio
 import json
 import sys
+import time
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
-from gemini_client import generate_json
+from gemini_client import (
+    SETTINGS, PartialJSONError, append_call_log, configure, format_cache_stats,
+    format_call_stats, format_limiter_stats, generate_json, generate_json_async,
+    generate_json_stream, record_calls, require_object,
+)
+from prompt_builder import PromptBudgetError, check_budget, compact_json, prune
 
 PROJECT_ROOT = Path(__file__).parent.parent
 OUTPUT_DIR = PROJECT_ROOT / "output"
@@ -19,68 +27,36 @@ SYSTEM_INSTRUCTION = """당신은 이커머스 상세페이지 디자인 디렉
 모든 색상은 hex 코드로, 폰트 사이즈는 px 단위로 지정하세요.
 반드시 한국어로 작성하세요."""
 
+# 설계할 섹션: (id, 권장 사이즈, 레이아웃)
+DESIGN_SECTIONS = [
+    ("01_hero", "1080×1080", "중앙 대형 텍스트, 배지"),
+    ("02_pain_point", "1080×800", "아이콘+텍스트 리스트"),
+    ("03_solution", "1080×700", "중앙 강조"),
+    ("04_features", "1080×1000", "2×2 카드 그리드"),
+    ("05_specs", "1080×800", "테이블 레이아웃"),
+    ("06_how_to_use", "1080×800", "번호 스텝 리스트"),
+    ("07_difference", "1080×800", "좌우 비교 테이블"),
+    ("08_reviews", "1080×900", "카드 리스트"),
+    ("09_faq", "1080×800", "Q&A 리스트"),
+    ("10_cta", "1080×600", "중앙 집중, 강조 배경"),
+]
 
-def main():
-    # 입력 파일 읽기
-    copy_path = OUTPUT_DIR / "page_copy.json"
-    research_path = OUTPUT_DIR / "research_report.json"
-
-    if not copy_path.exists():
-        print(f"ERROR: {copy_path} 파일이 없습니다.")
-        sys.exit(1)
-    if not research_path.exists():
-        print(f"ERROR: {research_path} 파일이 없습니다.")
-        sys.exit(1)
-
-    with open(copy_path, "r", encoding="utf-8") as f:
-        copy_data = json.load(f)
-    with open(research_path, "r", encoding="utf-8") as f:
-        research = json.load(f)
-
-    print("디자인 설계 시작...")
-    print("Gemini 2.5 Flash 호출 중...")
-
-    prompt = f"""아래 카피와 리서치 결과를 기반으로 상세페이지 10개 섹션의 디자인 스펙을 설계하세요.
-
-## 카피 데이터
-{json.dumps(copy_data, ensure_ascii=False, indent=2)}
-
-## 리서치 결과
-추천 톤앤매너: {research.get('recommended_tone', '')}
-
-## 설계할 10개 섹션
-
-| 섹션 | 권장 사이즈 | 레이아웃 |
-|------|-----------|---------|
-| 01_hero | 1080×1080 | 중앙 대형 텍스트, 배지 |
-| 02_pain_point | 1080×800 | 아이콘+텍스트 리스트 |
-| 03_solution | 1080×700 | 중앙 강조 |
-| 04_features | 1080×1000 | 2×2 카드 그리드 |
-| 05_specs | 1080×800 | 테이블 레이아웃 |
-| 06_how_to_use | 1080×800 | 번호 스텝 리스트 |
-| 07_difference | 1080×800 | 좌우 비교 테이블 |
-| 08_reviews | 1080×900 | 카드 리스트 |
-| 09_faq | 1080×800 | Q&A 리스트 |
-| 10_cta | 1080×600 | 중앙 집중, 강조 배경 |
-
-## 디자인 원칙
+DESIGN_PRINCIPLES = """## 디자인 원칙
 - 섹션 간 배경색 교차 (시각적 리듬감)
 - 충분한 여백 (최소 60px 마진)
 - 가독성 최우선 (텍스트-배경 대비)
-- 모던하고 깔끔한 한국 이커머스 스타일
+- 모던하고 깔끔한 한국 이커머스 스타일"""
 
-## 출력 JSON 스키마
-{{
-  "global_style": {{
+GLOBAL_STYLE_SCHEMA = """  "global_style": {
     "primary_color": "#hex",
     "secondary_color": "#hex",
     "accent_color": "#hex",
     "bg_color": "#hex",
     "text_color": "#hex",
     "mood": "분위기 설명"
-  }},
-  "sections": [
-    {{
+  }"""
+
+SECTION_SCHEMA = """    {
       "id": "01_hero",
       "width": 1080,
       "height": 1080,
@@ -89,16 +65,14 @@ def main():
       "accent_color": "#hex",
       "layout": "centered",
       "elements": [
-        {{
+        {
           "type": "text 또는 rectangle 또는 badge 또는 line 또는 icon_text",
           "설명": "각 요소의 속성"
-        }}
+        }
       ]
-    }}
-  ]
-}}
+    }"""
 
-각 섹션의 elements에는 실제 Pillow로 렌더링할 수 있는 구체적 요소를 포함하세요:
+ELEMENT_GUIDE = """각 섹션의 elements에는 실제 Pillow로 렌더링할 수 있는 구체적 요소를 포함하세요:
 - text: content, x, y, font_size, font_weight(bold/normal), color, align(left/center/right), max_width
 - rectangle: x, y, width, height, fill, radius, outline, outline_width
 - line: x1, y1, x2, y2, color, width
@@ -107,16 +81,359 @@ def main():
 
 카피 데이터의 실제 텍스트를 text 요소의 content에 그대로 넣으세요."""
 
-    result = generate_json(prompt, SYSTEM_INSTRUCTION)
+# global_style 단계에 넘길 카피 (상품 포지셔닝이 드러나는 섹션만)
+GLOBAL_STYLE_COPY = ("01_hero", "03_solution", "10_cta")
+
+# 호출 기록 파일 (output_dir 기준, 실행마다 한 줄씩 추가)
+CALL_LOG_NAME = "gemini_calls.jsonl"
+
+
+def design_copy(copy_data, section_ids=None):
+    """프롬프트에 넣을 카피: 설계할 섹션의 카피만 id별로 모으고 빈 값 제거
+
+    한 섹션도 찾지 못하면 (스키마가 다른 page_copy) 전체 카피를 씁니다.
+    """
+    section_ids = section_ids or [section[0] for section in DESIGN_SECTIONS]
+    found = {}
+    for section_id in section_ids:
+        copy = _find_section_copy(copy_data, section_id)
+        if copy is not None:
+            found[section_id] = copy
+    return prune(found or copy_data)
+
+
+def _tone(research):
+    return prune(research.get("recommended_tone", "")) or "(없음)"
+
+
+def build_prompt(copy_data, research):
+    """10개 섹션 + global_style 전체를 한 번에 요청하는 프롬프트
+
+    고정된 섹션 표/원칙/스키마를 앞에, 상품별 톤과 카피를 뒤에 둡니다.
+    """
+    rows = "\n".join(f"| {sid} | {size} | {layout} |" for sid, size, layout in DESIGN_SECTIONS)
+    return f"""마지막의 카피와 리서치 결과를 기반으로 상세페이지 10개 섹션의 디자인 스펙을 설계하세요.
+
+## 설계할 10개 섹션
+
+| 섹션 | 권장 사이즈 | 레이아웃 |
+|------|-----------|---------|
+{rows}
+
+{DESIGN_PRINCIPLES}
+
+## 출력 JSON 스키마
+{{
+{GLOBAL_STYLE_SCHEMA},
+  "sections": [
+{SECTION_SCHEMA}
+  ]
+}}
+
+{ELEMENT_GUIDE}
+
+## 리서치 결과
+추천 톤앤매너: {_tone(research)}
+
+## 카피 데이터
+{compact_json(design_copy(copy_data))}"""
+
+
+def build_global_style_prompt(copy_data, research):
+    """global_style만 요청하는 프롬프트 (--per-section 1단계)"""
+    return f"""마지막의 카피와 리서치 결과를 기반으로 상세페이지 전체에 적용할 글로벌 스타일을 설계하세요.
+
+{DESIGN_PRINCIPLES}
+
+## 출력 JSON 스키마
+{{
+{GLOBAL_STYLE_SCHEMA}
+}}
+
+## 리서치 결과
+추천 톤앤매너: {_tone(research)}
+
+## 카피 데이터
+{compact_json(design_copy(copy_data, GLOBAL_STYLE_COPY))}"""
+
+
+def section_copy(copy_data, section_id):
+    """page_copy.json에서 한 섹션의 카피 찾기 (못 찾으면 전체 카피)
+
+    {"01_hero": {...}}, {"sections": {"01_hero": {...}}},
+    {"sections": [{"id": "01_hero", ...}]} 형태와 "01" 번호 접두어를 지원합니다.
+    """
+    found = _find_section_copy(copy_data, section_id)
+    return copy_data if found is None else found
+
+
+def _find_section_copy(copy_data, section_id):
+    """section_copy와 같은 규칙으로 찾되, 못 찾으면 None"""
+    candidates = [copy_data]
+    sections = copy_data.get("sections") if isinstance(copy_data, dict) else None
+    if isinstance(sections, dict):
+        candidates.append(sections)
+    elif isinstance(sections, list):
+        for item in sections:
+            if isinstance(item, dict) and item.get("id") == section_id:
+                return item
+        candidates.append({
+            item.get("id", ""): item for item in sections if isinstance(item, dict)
+        })
+
+    number = section_id.split("_", 1)[0]
+    for mapping in candidates:
+        if not isinstance(mapping, dict):
+            continue
+        if section_id in mapping:
+            return mapping[section_id]
+        for key, value in mapping.items():
+            if str(key).split("_", 1)[0] == number:
+                return value
+    return None
+
+
+def build_section_prompt(section, copy_data, global_style):
+    """한 섹션의 elements만 요청하는 프롬프트 (--per-section 2단계)"""
+    section_id, size, layout = section
+    width, height = size.split("×")
+    schema = (SECTION_SCHEMA
+              .replace('"01_hero"', f'"{section_id}"')
+              .replace('"width": 1080', f'"width": {width}')
+              .replace('"height": 1080', f'"height": {height}')
+              .replace("\n    ", "\n"))
+    # 원칙/요소 규칙/글로벌 스타일까지는 10개 섹션 요청이 모두 같음
+    return f"""마지막의 카피와 글로벌 스타일을 기반으로 상세페이지 섹션 하나의 디자인 스펙을 설계하세요.
+
+{DESIGN_PRINCIPLES}
+
+{ELEMENT_GUIDE}
+
+## 글로벌 스타일
+{compact_json(global_style)}
+
+## 설계할 섹션
+- id: {section_id}
+- 권장 사이즈: {size}
+- 레이아웃: {layout}
+
+## 출력 JSON 스키마
+{schema.strip()}
+
+## 카피 데이터
+{compact_json(prune(section_copy(copy_data, section_id)))}"""
+
+
+def _valid_section(result):
+    return isinstance(result, dict) and isinstance(result.get("elements"), list)
+
+
+def _require_spec(result, step):
+    """설계 응답 형태 확인 (객체이고 global_style은 객체, sections는 배열이어야 함)"""
+    require_object(result, step)
+    for key, kind in (("global_style", dict), ("sections", list)):
+        if key in result and not isinstance(result[key], kind):
+            raise ValueError(
+                f"{step} 응답의 {key} 항목이 {kind.__name__} 형식이 아닙니다 "
+                f"({type(result[key]).__name__}): {str(result[key])[:80]}"
+            )
+    return result
+
+
+async def design_per_section(copy_data, research, concurrency=4, retries=2, use_cache=None):
+    """global_style을 먼저 받은 뒤 섹션별 elements를 동시에 생성
+
+    섹션마다 최대 retries번 개별 재시도하며 (재시도는 캐시를 건너뜀),
+    끝까지 실패한 섹션은 결과에서 빠지고 이름이 반환됩니다.
+
+    Returns:
+        (design_spec dict, 실패한 섹션 id 리스트)
+    """
+    start = time.perf_counter()
+    prompt = build_global_style_prompt(copy_data, research)
+    check_budget("design_global", prompt, SYSTEM_INSTRUCTION)
+    global_style = await generate_json_async(
+        prompt, SYSTEM_INSTRUCTION, use_cache=use_cache, step="design_global",
+    )
+    global_style = require_object(global_style, "design_global")
+    global_style = require_object(global_style.get("global_style", global_style), "design_global")
+    print(f"  - global_style: {time.perf_counter() - start:.1f}초")
+
+    limit = asyncio.Semaphore(concurrency)
+
+    async def run(section):
+        section_id = section[0]
+        prompt = build_section_prompt(section, copy_data, global_style)
+        try:
+            check_budget("design_section", prompt, SYSTEM_INSTRUCTION)
+        except PromptBudgetError as e:
+            print(f"  - {section_id}: 실패 ({e})")
+            return None
+        for attempt in range(retries + 1):
+            async with limit:
+                began = time.perf_counter()
+                try:
+                    result = await generate_json_async(
+                        prompt, SYSTEM_INSTRUCTION,
+                        use_cache=use_cache if attempt == 0 else False,
+                        step=f"design_section:{section_id}",
+                    )
+                    error = None if _valid_section(result) else "elements 누락"
+                except Exception as e:
+                    result, error = None, e
+                elapsed = time.perf_counter() - began
+            if error is None:
+                result.setdefault("id", section_id)
+                print(f"  - {section_id}: {elapsed:.1f}초" + (f" (재시도 {attempt}회)" if attempt else ""))
+                return result
+            print(f"  - {section_id}: 실패 ({error}), {elapsed:.1f}초")
+        return None
+
+    results = await asyncio.gather(*(run(section) for section in DESIGN_SECTIONS))
+
+    failed = [section[0] for section, result in zip(DESIGN_SECTIONS, results) if result is None]
+    spec = {
+        "global_style": global_style,
+        "sections": [result for result in results if result is not None],
+    }
+    return spec, failed
+
+
+def design_streaming(copy_data, research, use_cache=None):
+    """전체 스펙을 스트리밍으로 받으며 섹션이 닫히는 즉시 검증
+
+    첫 섹션 도착 시간(time-to-first-section)을 출력합니다. 응답이 잘리면
+    그때까지 받은 global_style/섹션으로 스펙을 구성하고 실패 목록에
+    "(잘림)"을 넣습니다.
+
+    Returns:
+        (design_spec dict, 실패한 섹션 id 리스트)
+    """
+    start = time.perf_counter()
+    sections = []
+    failed = []
+    result = None
+    prompt = build_prompt(copy_data, research)
+    check_budget("design", prompt, SYSTEM_INSTRUCTION)
+
+    try:
+        for key, item in generate_json_stream(
+            prompt, SYSTEM_INSTRUCTION, use_cache=use_cache, step="design",
+        ):
+            if key is None:
+                result = item
+                continue
+            if key != "sections":
+                continue
+            elapsed = time.perf_counter() - start
+            if not sections:
+                print(f"  첫 섹션 도착: {elapsed:.1f}초")
+            section_id = f"#{len(sections) + 1}"
+            if isinstance(item, dict):
+                section_id = item.get("id", section_id)
+            if _valid_section(item):
+                print(f"  - {section_id}: 수신 ({elapsed:.1f}초)")
+            else:
+                print(f"  - {section_id}: elements 누락 ({elapsed:.1f}초)")
+                failed.append(section_id)
+            sections.append(item)
+    except PartialJSONError as e:
+        print(f"  WARNING: {e}")
+        failed.append("(잘림)")
+        result = {**e.fields, "sections": sections}
+
+    return _require_spec(result, "design"), failed
+
+
+def design(copy_data, research, mode="single", concurrency=4, retries=2, use_cache=None):
+    """page_copy + research_report dict → (design_spec dict, 실패 섹션 목록)
+
+    mode: single(한 번에 요청) / per_section / stream. 파일 입출력 없음
+    """
+    if mode == "per_section":
+        return asyncio.run(design_per_section(
+            copy_data, research, concurrency, retries, use_cache,
+        ))
+    if mode == "stream":
+        return design_streaming(copy_data, research, use_cache)
+    prompt = build_prompt(copy_data, research)
+    check_budget("design", prompt, SYSTEM_INSTRUCTION)
+    result = generate_json(prompt, SYSTEM_INSTRUCTION, use_cache=use_cache, step="design")
+    return _require_spec(result, "design"), []
+
+
+def run(output_dir=OUTPUT_DIR, mode="single", concurrency=4, retries=2, use_cache=None):
+    """output_dir의 page_copy.json + research_report.json → design_spec.json
+
+    (결과 dict, 실패 섹션 목록) 반환
+    """
+    output_dir = Path(output_dir)
+    copy_path = output_dir / "page_copy.json"
+    research_path = output_dir / "research_report.json"
+
+    for path in (copy_path, research_path):
+        if not path.exists():
+            raise FileNotFoundError(f"{path} 파일이 없습니다.")
+
+    with open(copy_path, "r", encoding="utf-8") as f:
+        copy_data = json.load(f)
+    with open(research_path, "r", encoding="utf-8") as f:
+        research = json.load(f)
+
+    print("디자인 설계 시작...")
+    print(f"{SETTINGS['model']} 호출 중...")
+
+    start = time.perf_counter()
+    try:
+        with record_calls() as calls:
+            result, failed = design(copy_data, research, mode, concurrency, retries, use_cache)
+    finally:
+        append_call_log(output_dir / CALL_LOG_NAME, calls)
+    elapsed = time.perf_counter() - start
 
     # 저장
-    output_path = OUTPUT_DIR / "design_spec.json"
+    output_path = output_dir / "design_spec.json"
     with open(output_path, "w", encoding="utf-8") as f:
         json.dump(result, ensure_ascii=False, indent=2, fp=f)
 
-    print(f"완료: {output_path}")
+    print(f"완료: {output_path} ({elapsed:.1f}초)")
     print(f"글로벌 스타일: {result.get('global_style', {}).get('mood', '')}")
     print(f"섹션 {len(result.get('sections', []))}개 설계")
+    if failed:
+        print(f"WARNING: 섹션 생성 실패 {len(failed)}개: {', '.join(failed)}")
+    print(format_call_stats(calls))
+    return result, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="디자인 에이전트: page_copy.json + research_report.json → design_spec.json")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Gemini 응답 캐시를 읽지 않고 새로 호출")
+    parser.add_argument("--model", help=f"Gemini 모델 (기본: {SETTINGS['model']})")
+    parser.add_argument("--per-section", action="store_true",
+                        help="global_style을 먼저 받고 섹션별로 동시 생성")
+    parser.add_argument("--stream", action="store_true",
+                        help="스트리밍으로 받으며 섹션이 완성되는 즉시 검증")
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="--per-section 동시 요청 수 (기본 4)")
+    parser.add_argument("--retries", type=int, default=2,
+                        help="--per-section 섹션별 재시도 횟수 (기본 2)")
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR,
+                        help=f"입출력 폴더 (기본: {OUTPUT_DIR})")
+    args = parser.parse_args(argv)
+    configure(model=args.model)
+
+    mode = "per_section" if args.per_section else "stream" if args.stream else "single"
+    try:
+        _, failed = run(args.output_dir, mode, args.concurrency, args.retries,
+                        use_cache=False if args.no_cache else None)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    print(format_cache_stats())
+    print(format_limiter_stats())
+    if failed:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
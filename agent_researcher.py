@@ -4,12 +4,19 @@
 product_brief.json → research_report.json
 """
 
+import argparse
+import asyncio
 import json
 import sys
+import time
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
-from gemini_client import generate_json
+from gemini_client import (
+    SETTINGS, append_call_log, configure, format_cache_stats, format_call_stats,
+    format_limiter_stats, generate_json, generate_json_async, record_calls, require_object,
+)
+from prompt_builder import check_budget, compact_json, prune, select
 
 PROJECT_ROOT = Path(__file__).parent.parent
 OUTPUT_DIR = PROJECT_ROOT / "output"
@@ -18,69 +25,172 @@ SYSTEM_INSTRUCTION = """당신은 이커머스 시장 리서치 전문가입니
 상품 정보를 분석하여 경쟁사 비교, 소비자 인사이트, 셀링포인트를 도출합니다.
 반드시 한국어로 작성하세요."""
 
+# 리서치 작업 단위: (작업 제목, 작업 설명, 출력 스키마 조각)
+# --split 모드에서는 작업마다 별도 요청을 동시에 보냅니다.
+RESEARCH_TASKS = {
+    "competitors": (
+        "경쟁사 분석",
+        """- 동일 카테고리 경쟁 상품 3~5개 조사
+- 각 경쟁 상품의 가격대, 강점, 약점 분석""",
+        """  "competitors": [
+    {"name": "경쟁상품명", "price": "가격", "strengths": ["강점1"], "weaknesses": ["약점1"]}
+  ]""",
+    ),
+    "buyer_insights": (
+        "소비자 인사이트",
+        """- 이 카테고리에서 소비자가 가장 중시하는 구매 결정 요인
+- 자주 언급되는 칭찬/불만 포인트
+- 구매 전 망설이는 이유 (hesitation reasons)""",
+        """  "buyer_insights": {
+    "purchase_factors": ["구매결정요인1", "구매결정요인2"],
+    "common_praise": ["칭찬1", "칭찬2"],
+    "common_complaints": ["불만1", "불만2"],
+    "hesitation_reasons": ["고민1", "고민2"]
+  }""",
+    ),
+    "selling_strategy": (
+        "셀링포인트 전략",
+        """- 우선순위 정렬된 셀링포인트 (1위가 가장 강력)
+- 각 포인트에 대한 근거
+- 추천 톤앤매너 (신뢰감/감성적/전문적/위트 등)""",
+        """  "selling_points": [
+    {"rank": 1, "point": "셀링포인트", "evidence": "근거"}
+  ],
+  "recommended_tone": "추천 톤앤매너 설명\"""",
+    ),
+}
 
-def main():
-    # product_brief.json 읽기
-    brief_path = OUTPUT_DIR / "product_brief.json"
-    if not brief_path.exists():
-        print(f"ERROR: {brief_path} 파일이 없습니다.")
-        print("먼저 Step 1 (정보수집 에이전트)을 실행하세요.")
-        sys.exit(1)
+# 리서치에 쓰는 product_brief 필드 (Step 1 스키마, 나머지는 프롬프트에서 제외)
+BRIEF_FIELDS = (
+    "product_name", "brand", "category", "price", "options", "specs", "usp",
+    "target_audience", "use_cases", "keywords",
+)
 
-    with open(brief_path, "r", encoding="utf-8") as f:
-        brief = json.load(f)
+# 호출 기록 파일 (output_dir 기준, 실행마다 한 줄씩 추가)
+CALL_LOG_NAME = "gemini_calls.jsonl"
 
-    print(f"리서치 시작: {brief.get('product_name', '상품')}")
-    print("Gemini 2.5 Flash 호출 중...")
 
-    prompt = f"""아래 상품 정보를 기반으로 시장 리서치를 수행하세요.
+def build_prompt(brief, task_names=tuple(RESEARCH_TASKS)):
+    """선택한 리서치 작업만 담은 프롬프트
 
-## 상품 정보
-{json.dumps(brief, ensure_ascii=False, indent=2)}
-
-## 수행할 작업
+    고정된 작업 설명/스키마를 앞에, 상품 정보를 뒤에 두어 같은 작업끼리
+    프롬프트 앞부분이 같도록 합니다.
+    """
+    tasks = [RESEARCH_TASKS[name] for name in task_names]
+    steps = "\n\n".join(
+        f"### {i}. {title}\n{detail}" for i, (title, detail, _) in enumerate(tasks, 1)
+    )
+    schema = ",\n".join(fragment for _, _, fragment in tasks)
 
-### 1. 경쟁사 분석
-- 동일 카테고리 경쟁 상품 3~5개 조사
-- 각 경쟁 상품의 가격대, 강점, 약점 분석
+    return f"""마지막의 상품 정보를 기반으로 시장 리서치를 수행하세요.
 
-### 2. 소비자 인사이트
-- 이 카테고리에서 소비자가 가장 중시하는 구매 결정 요인
-- 자주 언급되는 칭찬/불만 포인트
-- 구매 전 망설이는 이유 (hesitation reasons)
+## 수행할 작업
 
-### 3. 셀링포인트 전략
-- 우선순위 정렬된 셀링포인트 (1위가 가장 강력)
-- 각 포인트에 대한 근거
-- 추천 톤앤매너 (신뢰감/감성적/전문적/위트 등)
+{steps}
 
 ## 출력 JSON 스키마
 {{
-  "competitors": [
-    {{"name": "경쟁상품명", "price": "가격", "strengths": ["강점1"], "weaknesses": ["약점1"]}}
-  ],
-  "buyer_insights": {{
-    "purchase_factors": ["구매결정요인1", "구매결정요인2"],
-    "common_praise": ["칭찬1", "칭찬2"],
-    "common_complaints": ["불만1", "불만2"],
-    "hesitation_reasons": ["고민1", "고민2"]
-  }},
-  "selling_points": [
-    {{"rank": 1, "point": "셀링포인트", "evidence": "근거"}}
-  ],
-  "recommended_tone": "추천 톤앤매너 설명"
-}}"""
+{schema}
+}}
+
+## 상품 정보
+{compact_json(prune(select(brief, BRIEF_FIELDS)))}"""
+
+
+def _prepared(brief, task_names=tuple(RESEARCH_TASKS)):
+    """프롬프트 생성 + 토큰 예산 확인"""
+    prompt = build_prompt(brief, task_names)
+    check_budget("research", prompt, SYSTEM_INSTRUCTION)
+    return prompt
+
+
+async def research_split(brief, use_cache=None):
+    """작업별 하위 요청을 동시에 보내고 하나의 리포트로 병합
+
+    전체 소요 시간은 가장 느린 하위 요청 수준으로 줄어듭니다.
+    """
+    prompts = {name: _prepared(brief, (name,)) for name in RESEARCH_TASKS}
+
+    async def run(name):
+        start = time.perf_counter()
+        result = await generate_json_async(
+            prompts[name], SYSTEM_INSTRUCTION, use_cache=use_cache, step=f"research:{name}",
+        )
+        print(f"  - {RESEARCH_TASKS[name][0]}: {time.perf_counter() - start:.1f}초")
+        return result
+
+    parts = await asyncio.gather(*(run(name) for name in RESEARCH_TASKS))
+
+    report = {}
+    for name, part in zip(RESEARCH_TASKS, parts):
+        report.update(require_object(part, f"research:{name}"))
+    return report
 
-    result = generate_json(prompt, SYSTEM_INSTRUCTION)
+
+def research(brief, split=False, use_cache=None):
+    """product_brief dict → research_report dict (파일 입출력 없음)"""
+    if split:
+        return asyncio.run(research_split(brief, use_cache))
+    return require_object(
+        generate_json(_prepared(brief), SYSTEM_INSTRUCTION, use_cache=use_cache, step="research"),
+        "research",
+    )
+
+
+def run(output_dir=OUTPUT_DIR, split=False, use_cache=None):
+    """output_dir의 product_brief.json → research_report.json, 결과 dict 반환"""
+    output_dir = Path(output_dir)
+    brief_path = output_dir / "product_brief.json"
+    if not brief_path.exists():
+        raise FileNotFoundError(
+            f"{brief_path} 파일이 없습니다.\n먼저 Step 1 (정보수집 에이전트)을 실행하세요."
+        )
+
+    with open(brief_path, "r", encoding="utf-8") as f:
+        brief = json.load(f)
+
+    print(f"리서치 시작: {brief.get('product_name', '상품')}")
+    print(f"{SETTINGS['model']} 호출 중...")
+
+    start = time.perf_counter()
+    try:
+        with record_calls() as calls:
+            result = research(brief, split, use_cache)
+    finally:
+        append_call_log(output_dir / CALL_LOG_NAME, calls)
+    elapsed = time.perf_counter() - start
 
     # 저장
-    output_path = OUTPUT_DIR / "research_report.json"
+    output_path = output_dir / "research_report.json"
     with open(output_path, "w", encoding="utf-8") as f:
         json.dump(result, ensure_ascii=False, indent=2, fp=f)
 
-    print(f"완료: {output_path}")
+    print(f"완료: {output_path} ({elapsed:.1f}초)")
     print(f"경쟁사 {len(result.get('competitors', []))}개 분석")
     print(f"셀링포인트 {len(result.get('selling_points', []))}개 도출")
+    print(format_call_stats(calls))
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="리서치 에이전트: product_brief.json → research_report.json")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Gemini 응답 캐시를 읽지 않고 새로 호출")
+    parser.add_argument("--model", help=f"Gemini 모델 (기본: {SETTINGS['model']})")
+    parser.add_argument("--split", action="store_true",
+                        help="경쟁사/소비자 인사이트/셀링 전략을 동시 요청으로 나눠 실행")
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR,
+                        help=f"입출력 폴더 (기본: {OUTPUT_DIR})")
+    args = parser.parse_args(argv)
+    configure(model=args.model)
+
+    try:
+        run(args.output_dir, split=args.split, use_cache=False if args.no_cache else None)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    print(format_cache_stats())
+    print(format_limiter_stats())
 
 
 if __name__ == "__main__":
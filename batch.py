@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""
+배치 모드: 상품 카탈로그(JSONL/CSV) → 상품별 상세페이지
+각 상품은 output/batch/<sku>/ 폴더에서 리서치 → 디자인 → 렌더 데이터 → 렌더링을 거칩니다.
+
+- API 단계(리서치/디자인)는 스레드 풀에서 실행되어 gemini_client의 쿼터 제한기를 함께 씁니다.
+- CPU 단계(렌더 데이터 컴파일/렌더링)는 프로세스 풀에서 실행됩니다.
+- 한 상품의 단계가 끝나는 즉시 다음 단계가 큐에 들어가므로 상품들이 파이프라인처럼 겹쳐 진행됩니다.
+- 단계마다 batch_state.json에 진행 상황을 기록하므로 중단 후 다시 실행하면 이어서 진행합니다.
+"""
+
+import argparse
+import csv
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+import agent_designer
+import agent_researcher
+import render
+import render_compiler
+from gemini_client import (
+    SETTINGS, configure, format_cache_stats, format_call_stats, format_limiter_stats,
+)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+OUTPUT_DIR = PROJECT_ROOT / "output"
+BATCH_ROOT = OUTPUT_DIR / "batch"
+STATE_FILE = "batch_state.json"
+LOG_FILE = "batch.log"
+
+# 단계: (이름, 풀 종류, 필요한 입력 파일, 완료 표시 파일)
+STAGES = [
+    ("research", "api", ["product_brief.json"], "research_report.json"),
+    ("design", "api", ["page_copy.json", "research_report.json"], "design_spec.json"),
+    ("compile", "cpu", ["page_copy.json", "design_spec.json"], "render_data.json"),
+    ("render", "cpu", ["render_data.json"], "detail_page_full.png"),
+]
+
+# 카탈로그 행에서 브리프가 아닌 특수 키
+# page_copy / render_data: dict 또는 파일 경로, photos: {슬롯: 사진 경로}
+ID_KEYS = ("sku", "id")
+FILE_KEYS = {"page_copy": "page_copy.json", "render_data": "render_data.json"}
+# render_data를 직접 준 상품은 render_data.json을 만드는 단계를 모두 건너뜀
+RENDER_DATA_SKIP = {"research", "design", "compile"}
+
+
+# ──────────────────────────────────────────────
+# 카탈로그
+# ──────────────────────────────────────────────
+
+def _csv_value(value):
+    """CSV 셀에 JSON 배열/객체가 들어 있으면 파싱"""
+    value = value.strip()
+    if value[:1] in "[{":
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+    return value
+
+
+def load_catalog(path):
+    """JSONL(한 줄에 상품 하나) 또는 CSV(헤더 = 필드명) 카탈로그 읽기
+
+    CSV의 photo_<슬롯> 열은 photos[<슬롯>]으로 모읍니다.
+    """
+    path = Path(path)
+    rows = []
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if path.suffix.lower() == ".csv":
+            for record in csv.DictReader(f):
+                row, photos = {}, {}
+                for key, value in record.items():
+                    if not key or value is None or not value.strip():
+                        continue
+                    if key.startswith("photo_"):
+                        photos[key[len("photo_"):]] = value.strip()
+                    else:
+                        row[key] = _csv_value(value)
+                if photos:
+                    row["photos"] = photos
+                rows.append(row)
+        else:
+            for number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                try:
+                    rows.append(json.loads(line))
+                except ValueError as e:
+                    raise ValueError(f"{path.name}:{number} JSON 파싱 실패: {e}") from e
+    return rows
+
+
+def product_id(row, index):
+    """상품 폴더 이름: sku/id → 상품명 → 순번"""
+    for key in ID_KEYS:
+        if row.get(key):
+            name = str(row[key])
+            break
+    else:
+        name = str(row.get("product_name", ""))
+    slug = re.sub(r"[^\w\-]+", "_", name).strip("_")
+    return slug or f"product_{index:03d}"
+
+
+def _write_if_changed(path, data):
+    """내용이 같으면 파일을 건드리지 않음 (수정 시각 기반 재실행 판단 유지)"""
+    if path.exists() and path.read_bytes() == data:
+        return
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def _dump(value):
+    return json.dumps(value, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def prepare_product(row, product_dir, catalog_dir):
+    """카탈로그 행 → 상품 폴더의 product_brief.json과 준비된 입력 파일/사진"""
+    product_dir.mkdir(parents=True, exist_ok=True)
+    special = set(ID_KEYS) | set(FILE_KEYS) | {"photos"}
+    brief = {key: value for key, value in row.items() if key not in special}
+    _write_if_changed(product_dir / "product_brief.json", _dump(brief))
+
+    for key, filename in FILE_KEYS.items():
+        value = row.get(key)
+        if isinstance(value, dict):
+            _write_if_changed(product_dir / filename, _dump(value))
+        elif value:
+            _write_if_changed(product_dir / filename, (catalog_dir / value).read_bytes())
+
+    for slot, source in (row.get("photos") or {}).items():
+        source = catalog_dir / source
+        target = product_dir / render.PHOTO_SLOTS.get(slot, slot)
+        stat = source.stat()
+        if target.exists():
+            existing = target.stat()
+            if (existing.st_size, existing.st_mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+                continue
+        shutil.copy2(source, target)
+
+
+# ──────────────────────────────────────────────
+# 체크포인트
+# ──────────────────────────────────────────────
+
+def input_digest(paths):
+    """입력 파일들의 크기 + 수정 시각 지문 (없는 파일은 건너뜀)"""
+    parts = []
+    for path in paths:
+        if path.exists():
+            stat = path.stat()
+            parts.append([path.name, stat.st_size, stat.st_mtime_ns])
+    return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+
+class Checkpoint:
+    """상품별 단계 상태를 batch_state.json에 기록 (스케줄러 스레드에서만 갱신)"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.state = json.load(f)
+        except (OSError, ValueError):
+            self.state = {}
+        self.state.setdefault("products", {})
+
+    def get(self, product, stage):
+        return self.state["products"].get(product, {}).get(stage, {})
+
+    def is_done(self, product, stage, digest):
+        entry = self.get(product, stage)
+        return entry.get("status") == "done" and entry.get("inputs") == digest
+
+    def mark(self, product, stage, status, **fields):
+        entry = {"status": status, "updated": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        entry.update(fields)
+        self.state["products"].setdefault(product, {})[stage] = entry
+        self.save()
+
+    def save(self):
+        """임시 파일에 쓴 뒤 교체 (중간에 죽어도 이전 상태가 남음)"""
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+# ──────────────────────────────────────────────
+# 상품별 로그
+# ──────────────────────────────────────────────
+
+class _StdoutRouter(io.TextIOBase):
+    """작업 스레드의 print 출력을 상품 폴더의 batch.log로 돌려보내는 stdout 래퍼"""
+
+    def __init__(self, default):
+        self.default = default
+        self.local = threading.local()
+
+    def _target(self):
+        return getattr(self.local, "target", None) or self.default
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def flush(self):
+        self._target().flush()
+
+
+@contextmanager
+def product_log(product_dir):
+    router = sys.stdout
+    if not isinstance(router, _StdoutRouter):
+        # 프로세스 풀 워커(spawn)처럼 라우터가 없는 경우 이 프로세스에 설치
+        router = sys.stdout = _StdoutRouter(sys.stdout)
+    with open(Path(product_dir) / LOG_FILE, "a", encoding="utf-8") as log:
+        log.write(f"\n--- {time.strftime('%Y-%m-%d %H:%M:%S')} ---\n")
+        router.local.target = log
+        try:
+            yield
+        finally:
+            router.local.target = None
+
+
+# ──────────────────────────────────────────────
+# 단계 실행 (프로세스 풀에 넘길 수 있도록 모듈 최상위 함수)
+# ──────────────────────────────────────────────
+
+def stage_research(product_dir, options):
+    with product_log(product_dir):
+        agent_researcher.run(product_dir, split=options["split"], use_cache=options["use_cache"])
+
+
+def stage_design(product_dir, options):
+    with product_log(product_dir):
+        _, failed = agent_designer.run(
+            product_dir, options["design_mode"], use_cache=options["use_cache"],
+        )
+    if failed:
+        raise RuntimeError(f"섹션 생성 실패: {', '.join(failed)}")
+
+
+def stage_compile(product_dir, options):
+    product_dir = Path(product_dir)
+    with product_log(product_dir):
+        inputs = {}
+        for name in ("page_copy", "design_spec"):
+            with open(product_dir / f"{name}.json", "r", encoding="utf-8") as f:
+                inputs[name] = json.load(f)
+        result = render_compiler.compile_render_data(inputs["page_copy"], inputs["design_spec"])
+        output_path = product_dir / "render_data.json"
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(result, ensure_ascii=False, indent=2, fp=f)
+        print(f"컴파일 완료: {output_path} (섹션 {len(result['sections'])}개)")
+
+
+def stage_render(product_dir, options):
+    with product_log(product_dir):
+        result = render.run(
+            product_dir, png_preset=options["png_preset"], resample=options["resample"],
+            slice_height=options["slice_height"],
+        )
+    if result["failed"]:
+        raise RuntimeError(f"렌더링 실패: {', '.join(result['failed'])}")
+
+
+STAGE_FUNCS = {
+    "research": stage_research,
+    "design": stage_design,
+    "compile": stage_compile,
+    "render": stage_render,
+}
+
+
+def _init_render_worker(font_path):
+    """렌더링 워커가 부모 프로세스와 같은 폰트를 쓰도록"""
+    render.FONT_PATH = font_path
+
+
+# ──────────────────────────────────────────────
+# 파이프라인 스케줄러
+# ──────────────────────────────────────────────
+
+def run_batch(products, checkpoint, options, api_workers=4, cpu_workers=1, skip=None):
+    """상품 목록 [(상품 id, 폴더)]을 단계별 풀에 흘려보내고 결과 상태 dict 반환
+
+    skip: {상품 id: 건너뛸 단계 집합} (카탈로그가 render_data를 직접 준 상품의 RENDER_DATA_SKIP 등)
+    """
+    skip = skip or {}
+    pools = {
+        "api": ThreadPoolExecutor(max_workers=api_workers),
+        # API 스레드가 클라이언트/캐시/쿼터 락을 쥔 채 fork되면 워커가 멈출 수 있어 spawn 사용
+        # (폰트 경로는 initializer가 다시 설정)
+        "cpu": ProcessPoolExecutor(max_workers=cpu_workers, initializer=_init_render_worker,
+                                   initargs=(render.FONT_PATH,),
+                                   mp_context=multiprocessing.get_context("spawn")),
+    }
+    pending = {}
+    results = {name: {} for name, _ in products}
+
+    def schedule(name, product_dir, index):
+        """index 단계부터 완료되지 않은 첫 단계를 큐에 넣음"""
+        for stage_index in range(index, len(STAGES)):
+            stage, kind, requires, marker = STAGES[stage_index]
+            if stage in skip.get(name, ()):
+                results[name][stage] = "SKIP (카탈로그 제공)"
+                continue
+            inputs = [product_dir / filename for filename in requires]
+            missing = [path.name for path in inputs if not path.exists()]
+            if missing:
+                checkpoint.mark(name, stage, "blocked", missing=missing)
+                results[name][stage] = f"대기 ({', '.join(missing)} 없음)"
+                print(f"  [{name}] {stage}: 대기 - {', '.join(missing)} 없음")
+                return
+            if stage == "render":
+                # 렌더링 입력에는 사진도 포함
+                inputs += [product_dir / filename for filename in render.PHOTO_SLOTS.values()]
+            digest = input_digest(inputs)
+            if checkpoint.is_done(name, stage, digest) and (product_dir / marker).exists():
+                results[name][stage] = "SKIP"
+                continue
+            future = pools[kind].submit(STAGE_FUNCS[stage], str(product_dir), options)
+            pending[future] = (name, product_dir, stage_index, digest, time.perf_counter())
+            print(f"  [{name}] {stage}: 시작")
+            return
+
+    try:
+        for name, product_dir in products:
+            schedule(name, product_dir, 0)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, product_dir, stage_index, digest, start = pending.pop(future)
+                stage = STAGES[stage_index][0]
+                elapsed = time.perf_counter() - start
+                try:
+                    future.result()
+                except Exception as e:
+                    checkpoint.mark(name, stage, "failed", error=str(e), seconds=round(elapsed, 2))
+                    results[name][stage] = f"FAILED ({e})"
+                    print(f"  [{name}] {stage}: FAILED ({e}) - {product_dir / LOG_FILE} 참고")
+                    continue
+                checkpoint.mark(name, stage, "done", inputs=digest, seconds=round(elapsed, 2))
+                results[name][stage] = f"OK ({elapsed:.1f}초)"
+                print(f"  [{name}] {stage}: OK ({elapsed:.1f}초)")
+                schedule(name, product_dir, stage_index + 1)
+    finally:
+        for pool in pools.values():
+            pool.shutdown(wait=True, cancel_futures=True)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="배치 모드: 상품 카탈로그(JSONL/CSV) → 상품별 상세페이지")
+    parser.add_argument("catalog", type=Path, help="카탈로그 파일 (.jsonl 또는 .csv)")
+    parser.add_argument("--output-root", type=Path, default=BATCH_ROOT,
+                        help=f"상품별 폴더가 만들어질 위치 (기본: {BATCH_ROOT})")
+    parser.add_argument("--api-workers", type=int, default=4,
+                        help="리서치/디자인 동시 실행 수 (기본 4, 실제 요청 속도는 쿼터 제한기가 조절)")
+    parser.add_argument("--cpu-workers", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="렌더링 프로세스 수 (기본: CPU 코어 수의 절반)")
+    parser.add_argument("--only", nargs="+", metavar="SKU", help="지정한 상품만 실행")
+    parser.add_argument("--reset", action="store_true",
+                        help="체크포인트를 무시하고 모든 단계를 다시 실행")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Gemini 응답 캐시를 읽지 않고 새로 호출")
+    parser.add_argument("--model", help=f"Gemini 모델 (기본: {SETTINGS['model']})")
+    parser.add_argument("--split", action="store_true", help="리서치를 작업별 동시 요청으로 실행")
+    parser.add_argument("--design-mode", choices=["single", "per_section", "stream"],
+                        default="single", help="디자인 에이전트 실행 방식 (기본 single)")
+    parser.add_argument("--png-preset", choices=list(render.PNG_PRESETS), default=render.PNG_PRESET,
+                        help="렌더링 PNG 압축 프리셋")
+    parser.add_argument("--resample", choices=sorted(render.RESAMPLE_PRESETS),
+                        default=render.RESAMPLE_MODE, help="사진 축소 방식")
+    parser.add_argument("--slice-height", type=render.positive_int, default=None,
+                        help="통합 이미지를 최대 N px 높이로 나눠 함께 저장")
+    args = parser.parse_args(argv)
+    configure(model=args.model)
+
+    try:
+        rows = load_catalog(args.catalog)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    args.output_root.mkdir(parents=True, exist_ok=True)
+    catalog_dir = args.catalog.resolve().parent
+    products, seen, skip = [], set(), {}
+    for index, row in enumerate(rows, 1):
+        name = product_id(row, index)
+        if name in seen:
+            name = f"{name}_{index:03d}"
+        seen.add(name)
+        if args.only and name not in args.only:
+            continue
+        product_dir = args.output_root / name
+        try:
+            prepare_product(row, product_dir, catalog_dir)
+        except OSError as e:
+            print(f"  [{name}] 준비 실패: {e}")
+            continue
+        products.append((name, product_dir))
+        if row.get("render_data"):
+            skip[name] = RENDER_DATA_SKIP
+
+    checkpoint = Checkpoint(args.output_root / STATE_FILE)
+    if args.reset:
+        checkpoint.state["products"] = {}
+
+    options = {
+        "split": args.split,
+        "design_mode": args.design_mode,
+        "use_cache": False if args.no_cache else None,
+        "png_preset": args.png_preset,
+        "resample": args.resample,
+        "slice_height": args.slice_height,
+    }
+
+    print(f"\n{'='*50}")
+    print(f"  배치 시작: 상품 {len(products)}개")
+    print(f"  API 동시 실행 {args.api_workers} / 렌더링 프로세스 {args.cpu_workers}")
+    print(f"  출력 폴더: {args.output_root}")
+    print(f"{'='*50}\n")
+
+    sys.stdout = _StdoutRouter(sys.stdout)
+    start = time.perf_counter()
+    try:
+        results = run_batch(products, checkpoint, options, args.api_workers, args.cpu_workers,
+                            skip)
+    finally:
+        sys.stdout = sys.stdout.default
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{'='*50}")
+    print(f"  배치 완료 ({elapsed:.1f}초)")
+    print(f"{'='*50}")
+    failed = 0
+    for name, stages in results.items():
+        summary = " / ".join(f"{stage} {status}" for stage, status in stages.items())
+        print(f"  {name}: {summary}")
+        failed += any(status.startswith("FAILED") for status in stages.values())
+    print(format_cache_stats())
+    print(format_limiter_stats())
+    print(format_call_stats())
+    print(f"\n  상태 파일: {checkpoint.path}")
+    if failed:
+        print(f"  실패한 상품 {failed}개 - 다시 실행하면 실패한 단계부터 이어서 진행합니다.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+파이프라인 벤치마크: 고정 코퍼스의 상품마다 리서치 → 디자인 → 렌더 데이터 → 렌더링 실행
+Gemini 호출은 fake 백엔드(fake_gemini_client.py)가 녹화 응답으로 대신하므로
+API 키 없이 매번 같은 조건에서 측정할 수 있습니다.
+
+단계별 p50/p95 지연, 처리량(상품/분), 최대 RSS를 보고하고 저장된 기준선과 비교합니다.
+
+사용 예:
+    python3 benchmarks/bench_pipeline.py --repeat 3
+    python3 benchmarks/bench_pipeline.py --rate-429 0.2 --design-mode per_section
+    python3 benchmarks/bench_pipeline.py --save-baseline      # 현재 결과를 기준선으로 저장
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import platform
+import sys
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+import batch
+import fake_gemini_client
+import gemini_client
+import pipeline
+import render
+from bench_utils import change, condition_warnings, load_json, peak_rss_mb, save_json, summarize
+from rate_limiter import QuotaLimiter
+
+PROJECT_ROOT = BENCH_DIR.parent.parent
+OUTPUT_DIR = PROJECT_ROOT / "output"
+WORK_DIR = OUTPUT_DIR / "bench" / "pipeline"
+RESULT_PATH = OUTPUT_DIR / "bench" / "pipeline_result.json"
+CORPUS_PATH = BENCH_DIR / "corpus" / "products.jsonl"
+RESPONSES_PATH = BENCH_DIR / "corpus" / "responses.json"
+BASELINE_PATH = BENCH_DIR / "baseline_pipeline.json"
+
+# 기준선 비교: 비율(TOLERANCE)과 절대 차이(노이즈 하한)를 모두 넘어야 회귀로 봄
+TOLERANCE = 0.2
+MIN_DELTA_SECONDS = 0.05
+MIN_DELTA_RSS_MB = 16
+# 조건이 다르면 비교 결과 앞에 경고할 meta 항목
+COMPARABLE_META = ("corpus", "stages", "design_mode", "split", "workers", "fake", "cpus")
+
+
+def load_corpus(path):
+    """카탈로그 → [(상품 id, product_brief, page_copy)] (batch.py와 같은 형식)"""
+    special = set(batch.ID_KEYS) | set(batch.FILE_KEYS) | {"photos"}
+    corpus = []
+    for index, row in enumerate(batch.load_catalog(path), 1):
+        brief = {key: value for key, value in row.items() if key not in special}
+        corpus.append((batch.product_id(row, index), brief, row.get("page_copy") or {}))
+    return corpus
+
+
+def setup_backend(args):
+    """fake 백엔드 연결, 응답 캐시는 작업 폴더로, 쿼터 제한은 --rpm만 적용"""
+    client = fake_gemini_client.FakeGeminiClient(
+        args.responses, latency=args.latency, jitter=args.jitter,
+        latency_scale=args.latency_scale, rate_429=args.rate_429, error_rate=args.error_rate,
+        retry_after=args.retry_after, seed=args.seed,
+    )
+    if not len(client.recordings):
+        raise ValueError(f"녹화된 응답이 없습니다: {args.responses}")
+    gemini_client.register_backend("fake", lambda timeout: client)
+    gemini_client.configure(backend="fake")
+    gemini_client.RESPONSE_CACHE = gemini_client.ResponseCache(WORK_DIR / ".gemini_cache.sqlite")
+    gemini_client.LIMITER = QuotaLimiter(rpm=args.rpm)
+    return client
+
+
+def run_product(product, brief, page_copy, stages, options, verbose):
+    """상품 하나를 단계별로 실행 → (단계별 초, 단계 직후 최대 RSS)"""
+    output_dir = WORK_DIR / product
+    output_dir.mkdir(parents=True, exist_ok=True)
+    artifacts = {"product_brief": brief, "page_copy": page_copy}
+    timings, rss = {}, {}
+    quiet = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    with quiet:
+        for name in stages:
+            artifacts, _ = pipeline.run_pipeline([name], output_dir, options, artifacts, timings)
+            rss[name] = peak_rss_mb()
+    return timings, rss
+
+
+def run_benchmark(args, corpus, client):
+    options = {
+        "split": args.split,
+        "design_mode": args.design_mode,
+        "use_cache": False,   # 매 실행 fake 백엔드까지 요청
+        "workers": args.workers,
+        "png_preset": render.PNG_PRESET,
+        "resample": render.RESAMPLE_MODE,
+        "slice_height": None,
+        "force": True,        # 변경 없는 섹션 건너뛰기 없이 매번 렌더링
+        "profiles": None,
+    }
+    for product, brief, page_copy in corpus[:args.warmup]:
+        print(f"  워밍업: {product}")
+        run_product(product, brief, page_copy, args.stages, options, args.verbose)
+
+    samples = {name: [] for name in args.stages}
+    stage_rss = {name: 0.0 for name in args.stages}
+    totals, failures = [], []
+    client.stats = dict.fromkeys(client.stats, 0)
+    retries_before = gemini_client.LIMITER.stats()["retries"]
+
+    with gemini_client.record_calls() as calls:
+        started = time.perf_counter()
+        for round_index in range(args.repeat):
+            for product, brief, page_copy in corpus:
+                try:
+                    timings, rss = run_product(product, brief, page_copy, args.stages,
+                                               options, args.verbose)
+                except Exception as e:
+                    failures.append({"product": product, "round": round_index, "error": str(e)})
+                    print(f"  {product}: 실패 ({e})")
+                    continue
+                for name, seconds in timings.items():
+                    samples[name].append(seconds)
+                    stage_rss[name] = max(stage_rss[name], rss[name])
+                totals.append(sum(timings.values()))
+                print(f"  {product} [{round_index + 1}/{args.repeat}]: {totals[-1]:.2f}초 ("
+                      + ", ".join(f"{name} {seconds:.2f}" for name, seconds in timings.items()) + ")")
+        wall = time.perf_counter() - started
+
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "corpus": Path(args.corpus).name,
+            "products": len(corpus),
+            "repeat": args.repeat,
+            "stages": args.stages,
+            "design_mode": args.design_mode,
+            "split": args.split,
+            "workers": args.workers,
+            "fake": {
+                "latency": args.latency, "jitter": args.jitter, "latency_scale": args.latency_scale,
+                "rate_429": args.rate_429, "error_rate": args.error_rate, "seed": args.seed,
+            },
+        },
+        "stages": {name: {**summarize(values), "peak_rss_mb": round(stage_rss[name], 1)}
+                   for name, values in samples.items()},
+        "total": summarize(totals),
+        "wall_seconds": round(wall, 3),
+        "throughput_per_min": round(len(totals) / wall * 60, 2) if wall else 0.0,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "failures": failures,
+        "gemini": {
+            "calls": len(calls),
+            "failed_calls": sum("error" in entry for entry in calls),
+            "retries": gemini_client.LIMITER.stats()["retries"] - retries_before,
+            **client.stats,
+        },
+    }
+
+
+def format_results(results):
+    lines = [f"  {'단계':<10} {'횟수':>4} {'p50':>8} {'p95':>8} {'최대':>8} {'RSS MB':>8}"]
+    rows = list(results["stages"].items()) + [("합계", results["total"])]
+    for name, stats in rows:
+        rss = f"{stats['peak_rss_mb']:8.1f}" if "peak_rss_mb" in stats else f"{'':>8}"
+        lines.append(f"  {name:<10} {stats['count']:>4} {stats['p50']:7.3f}s {stats['p95']:7.3f}s "
+                     f"{stats['max']:7.3f}s {rss}")
+    gemini = results["gemini"]
+    lines.append(f"  처리량 {results['throughput_per_min']:.1f}상품/분 "
+                 f"({results['total']['count']}개 / {results['wall_seconds']:.1f}초), "
+                 f"최대 RSS {results['peak_rss_mb']:.1f} MB")
+    lines.append(f"  Gemini(fake): 요청 {gemini['requests']}회, 429 {gemini['rate_limited']}회, "
+                 f"503 {gemini['errors']}회, 재시도 {gemini['retries']}회, 녹화 없음 {gemini['misses']}회")
+    if results["failures"]:
+        lines.append(f"  실패 {len(results['failures'])}건")
+    return "\n".join(lines)
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """기준선 대비 지표 목록 [(이름, 기준, 현재, 변화율, 회귀 여부)]"""
+    rows = []
+
+    def add(name, base, current, min_delta, higher_is_better=False):
+        if base is None or current is None:
+            return
+        rows.append((name, base, current,
+                     *change(base, current, tolerance, min_delta, higher_is_better)))
+
+    for name, stats in results["stages"].items():
+        base = baseline.get("stages", {}).get(name)
+        if base:
+            for metric in ("p50", "p95"):
+                add(f"{name} {metric}", base.get(metric), stats[metric], MIN_DELTA_SECONDS)
+    for metric in ("p50", "p95"):
+        add(f"합계 {metric}", baseline.get("total", {}).get(metric), results["total"][metric],
+            MIN_DELTA_SECONDS)
+    add("처리량/분", baseline.get("throughput_per_min"), results["throughput_per_min"], 0,
+        higher_is_better=True)
+    add("최대 RSS MB", baseline.get("peak_rss_mb"), results["peak_rss_mb"], MIN_DELTA_RSS_MB)
+    return rows
+
+
+def format_comparison(rows, results, baseline):
+    lines = condition_warnings(results, baseline, COMPARABLE_META)
+    for name, base, current, ratio, regressed in rows:
+        mark = "  ← 회귀" if regressed else ""
+        lines.append(f"  {name:<14} {base:10.3f} → {current:10.3f} ({ratio:+7.1%}){mark}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    names = [name for name, _, _, _ in pipeline.STAGES]
+    parser = argparse.ArgumentParser(description="파이프라인 벤치마크 (fake Gemini 백엔드, 기준선 비교)")
+    parser.add_argument("--corpus", type=Path, default=CORPUS_PATH, help="상품 카탈로그 (JSONL/CSV)")
+    parser.add_argument("--responses", type=Path, default=RESPONSES_PATH,
+                        help="재생할 녹화 응답 (GEMINI_BACKEND=record 결과도 가능)")
+    parser.add_argument("--stages", nargs="+", choices=names, default=names, help="측정할 단계")
+    parser.add_argument("--repeat", type=int, default=1, help="코퍼스 반복 횟수")
+    parser.add_argument("--warmup", type=int, default=1, help="측정 전에 실행할 상품 수")
+    parser.add_argument("--split", action="store_true", help="리서치를 작업별 동시 요청으로 실행")
+    parser.add_argument("--design-mode", choices=["single", "per_section", "stream"],
+                        default="single", help="디자인 에이전트 실행 방식")
+    parser.add_argument("--workers", type=int, default=1, help="섹션 병렬 렌더링 프로세스 수")
+    parser.add_argument("--latency", type=float, default=0.0, help="녹화에 latency가 없는 응답의 지연 (초)")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="응답 지연 배율 (0이면 지연 없음)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="응답마다 더할 최대 난수 지연 (초)")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="429 응답 비율 (0~1)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 응답 비율 (0~1)")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="429 응답의 재시도 대기 (초)")
+    parser.add_argument("--rpm", type=int, default=0, help="분당 요청 한도 (0이면 제한 없음)")
+    parser.add_argument("--seed", type=int, default=0, help="오류 주입/지터 난수 시드")
+    parser.add_argument("--output", type=Path, default=RESULT_PATH, help=f"결과 JSON (기본: {RESULT_PATH})")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH,
+                        help=f"비교할 기준선 JSON (기본: {BASELINE_PATH})")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준선으로 저장")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="회귀로 볼 변화율 (기본 0.2)")
+    parser.add_argument("--strict", action="store_true", help="회귀나 실패가 있으면 종료 코드 1")
+    parser.add_argument("--verbose", action="store_true", help="파이프라인 출력 표시")
+    args = parser.parse_args(argv)
+    args.stages = [name for name in names if name in args.stages]
+
+    try:
+        corpus = load_corpus(args.corpus)
+        client = setup_backend(args)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    print(f"코퍼스 {len(corpus)}개 × {args.repeat}회, 단계: {' → '.join(args.stages)}")
+    results = run_benchmark(args, corpus, client)
+
+    save_json(args.output, results)
+    print(f"\n{'='*50}")
+    print(format_results(results))
+    print(f"{'='*50}")
+    print(f"결과: {args.output}")
+
+    regressed = []
+    if args.baseline.exists():
+        baseline = load_json(args.baseline)
+        rows = compare(results, baseline, args.tolerance)
+        regressed = [row[0] for row in rows if row[4]]
+        print(f"\n기준선 비교 ({args.baseline.name}, 허용 {args.tolerance:.0%}):")
+        print(format_comparison(rows, results, baseline))
+        if regressed:
+            print(f"  회귀 {len(regressed)}개: {', '.join(regressed)}")
+    elif not args.save_baseline:
+        print(f"\n기준선 없음: --save-baseline으로 {args.baseline} 생성")
+
+    if args.save_baseline:
+        save_json(args.baseline, results)
+        print(f"기준선 저장: {args.baseline}")
+    if args.strict and (regressed or results["failures"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+렌더러 벤치마크: 합성 render_data 코퍼스로 render.py의 단계별 시간 측정
+
+짧은 한국어 헤드라인부터 2,000자 FAQ 블록까지의 텍스트, 요소 수, 사진 크기, 캔버스 높이를
+바꿔 만든 페이지(output/bench/render/<페이지>/render_data.json + 사진)로 wrap_text, get_font,
+paste_product_photo, render_section, merge_sections, PNG 인코딩을 따로 측정합니다.
+결과는 JSON으로 저장하고 저장된 기준선과 비교하므로 커밋마다 렌더링 회귀를 잡을 수 있습니다.
+
+사용 예:
+    python3 benchmarks/bench_render.py
+    python3 benchmarks/bench_render.py --cases "wrap_text/*" "png_encode/*"
+    python3 benchmarks/bench_render.py --strict           # 회귀가 있으면 종료 코드 1
+    python3 benchmarks/bench_render.py --save-baseline    # 현재 결과를 기준선으로 저장
+    python3 render.py --output-dir output/bench/render/heavy --force   # 합성 페이지 전체 렌더링
+"""
+
+import argparse
+import fnmatch
+import gc
+import io
+import os
+import platform
+import random
+import sys
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import PIL
+from PIL import Image, ImageDraw
+
+BENCH_DIR = Path(__file__).parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+import render
+from bench_utils import change, condition_warnings, load_json, peak_rss_mb, save_json, summarize
+
+PROJECT_ROOT = BENCH_DIR.parent.parent
+OUTPUT_DIR = PROJECT_ROOT / "output"
+WORK_DIR = OUTPUT_DIR / "bench" / "render"
+RESULT_PATH = OUTPUT_DIR / "bench" / "render_result.json"
+BASELINE_PATH = BENCH_DIR / "baseline_render.json"
+
+# 측정: 케이스마다 repeat개 표본, 표본 하나는 최소 MIN_TIME초가 되도록 반복 호출
+REPEAT = 5
+MIN_TIME = 0.05
+# 기준선 비교: p50이 비율(TOLERANCE)과 절대 차이(초)를 모두 넘어야 회귀로 봄
+TOLERANCE = 0.25
+MIN_DELTA_SECONDS = 0.0005
+COMPARABLE_META = ("pillow", "font", "resample", "seed", "cpus")
+
+# 합성 페이지: 사진 크기(장면/제품)와 섹션 목록 (종류, 캔버스 높이, 크기 인자)
+# 크기 인자: faq는 글자 수, icon_list는 항목 수, table은 행 수
+PAGES = {
+    "light": {
+        "photo": (800, 600), "product": (500, 500),
+        "sections": [("hero", 900, None), ("icon_list", 700, 4), ("faq", 800, 300), ("cta", 600, None)],
+    },
+    "typical": {
+        "photo": (2000, 1500), "product": (1200, 1200),
+        "sections": [("hero", 1080, None), ("cover", 800, None), ("icon_list", 800, 6),
+                     ("table", 1000, 8), ("faq", 1200, 800), ("cover", 900, None), ("cta", 600, None)],
+    },
+    "heavy": {
+        "photo": (4000, 3000), "product": (2400, 2400),
+        "sections": [("hero", 1080, None), ("cover", 1600, None), ("icon_list", 1800, 40),
+                     ("table", 3000, 26), ("faq", 3000, 2000), ("cover", 2400, None), ("cta", 600, None)],
+    },
+}
+WIDTH = 1080
+# wrap_text 측정 글자 수 (헤드라인 / 본문 단락 / FAQ 블록)
+TEXT_LENGTHS = (20, 200, 2000)
+
+WORDS = [
+    "캠핑", "의자", "초경량", "알루미늄", "프레임", "내하중", "설치", "원터치", "방수", "원단",
+    "가볍게", "떠나는", "휴식", "공간", "편안한", "등받이", "튼튼한", "누구나", "안심하고",
+    "사용할", "수", "있습니다", "주말", "백패킹", "피크닉", "낚시", "수납", "파우치", "무게",
+    "2.5kg", "150kg", "10초", "600D", "A/S", "1년", "무상", "세탁", "가능", "합니다", "제품",
+]
+ICONS = ["✓", "★", "●", "🔥", "⚡", "💧", "🛡️", "🪶"]
+
+_MEASURE = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+
+
+# ──────────────────────────────────────────────
+# 합성 코퍼스
+# ──────────────────────────────────────────────
+
+def korean_text(rng, length):
+    """단어 목록으로 만든 length자 문장 (여덟 단어마다 마침표)"""
+    words = []
+    while sum(len(word) + 1 for word in words) < length:
+        words.append(rng.choice(WORDS) + ("." if len(words) % 8 == 7 else ""))
+    return " ".join(words)[:length].rstrip()
+
+
+def _text(content, y, font_size, color, weight="normal", align="center", max_width=960):
+    x = {"center": WIDTH // 2, "left": 60}[align]
+    return {"type": "text", "content": content, "x": x, "y": y, "font_size": font_size,
+            "font_weight": weight, "color": color, "align": align, "max_width": max_width}
+
+
+def make_section(rng, index, kind, height, size):
+    """합성 섹션 하나 (사진은 "photo"로 명시해 SECTION_PHOTOS 기본값과 무관)"""
+    section = {"id": f"{index:02d}_{kind}", "canvas": {"width": WIDTH, "height": height},
+               "background": rng.choice(["#FFFFFF", "#F4F1EA", "#1F3A5F"]), "photo": None}
+    dark = section["background"] == "#1F3A5F"
+    color = "#FFFFFF" if dark else "#222222"
+    elements = section["elements"] = []
+
+    if kind == "hero":
+        section["photo"] = {"slot": "product", "layout": "side", "align": "right",
+                            "height_ratio": 0.8, "max_width_ratio": 0.4, "margin": 20}
+        elements.append({"type": "badge", "content": korean_text(rng, 8), "x": 60, "y": 120,
+                         "bg_color": "#E8743B", "text_color": "#FFFFFF", "font_size": 22})
+        elements.append(_text(korean_text(rng, 14), 200, 64, color, "bold", "left", 560))
+        elements.append(_text(korean_text(rng, 70), 420, 28, color, align="left", max_width=560))
+    elif kind == "cover":
+        section["photo"] = {"slot": rng.choice(["scene", "lifestyle"]), "layout": "cover",
+                            "overlay": [0, 0, 0, 130]}
+        elements.append(_text(korean_text(rng, 18), height // 3, 56, "#FFFFFF", "bold"))
+        elements.append(_text(korean_text(rng, 120), height // 3 + 120, 28, "#FFFFFF"))
+    elif kind == "icon_list":
+        elements.append(_text(korean_text(rng, 16), 60, 44, color, "bold"))
+        step = (height - 180) // size
+        for i in range(size):
+            elements.append({"type": "icon_text", "icon": rng.choice(ICONS),
+                             "label": korean_text(rng, rng.randint(10, 30)), "x": 80,
+                             "y": 160 + i * step, "font_size": min(26, step - 8), "color": color})
+    elif kind == "table":
+        elements.append(_text(korean_text(rng, 10), 50, 44, color, "bold"))
+        row_height = (height - 160) // size
+        for row in range(size):
+            y = 140 + row * row_height
+            elements.append({"type": "rectangle", "x": 60, "y": y, "width": 960,
+                             "height": row_height - 6, "fill": "#FFFFFF" if row % 2 else "#EEF2F6",
+                             "radius": 8})
+            for column, x in enumerate((80, 420, 760)):
+                elements.append({"type": "text", "content": korean_text(rng, rng.randint(3, 12)),
+                                 "x": x, "y": y + 10, "font_size": min(24, row_height - 20),
+                                 "color": "#222222", "font_weight": "bold" if column == 0 else "normal",
+                                 "max_width": 300})
+            elements.append({"type": "line", "x1": 60, "y1": y + row_height - 3, "x2": 1020,
+                             "y2": y + row_height - 3, "color": "#D0D7DE", "width": 1})
+    elif kind == "faq":
+        elements.append(_text(korean_text(rng, 12), 60, 44, color, "bold"))
+        y, remaining = 160, size
+        while remaining > 0:
+            answer = min(remaining, rng.randint(120, 600))
+            elements.append(_text("Q. " + korean_text(rng, 24), y, 28, color, "bold", "left"))
+            elements.append(_text(korean_text(rng, answer), y + 48, 24, color, align="left"))
+            y += 48 + (answer * 24 // 900 + 1) * 34 + 40
+            remaining -= answer
+    elif kind == "cta":
+        elements.append(_text(korean_text(rng, 20), 160, 52, color, "bold"))
+        elements.append({"type": "rectangle", "x": 340, "y": 360, "width": 400, "height": 90,
+                         "fill": "#E8743B", "radius": 45})
+        elements.append(_text(korean_text(rng, 8), 384, 32, "#FFFFFF", "bold"))
+        elements.append({"type": "circle", "cx": 980, "cy": 100, "radius": 40, "fill": "#FFD166"})
+    return section
+
+
+def make_photo(path, size, seed, alpha=False):
+    """결정적인 그라데이션 + 노이즈 사진 (같은 크기 파일이 있으면 그대로 사용)"""
+    if path.exists():
+        with Image.open(path) as im:
+            if im.size == size:
+                return
+    width, height = size
+    rng = random.Random(seed)
+    gradient = Image.linear_gradient("L").resize(size)
+    noise = Image.frombytes("L", size, rng.randbytes(width * height))
+    radial = Image.radial_gradient("L").resize(size)
+    photo = Image.merge("RGB", (gradient, Image.blend(gradient, noise, 0.35), radial))
+    if alpha:
+        mask = Image.new("L", size, 0)
+        ImageDraw.Draw(mask).ellipse((width // 10, height // 10, width * 9 // 10, height * 9 // 10),
+                                     fill=255)
+        photo.putalpha(mask)
+        photo.save(path, "PNG", compress_level=1)
+    else:
+        photo.save(path, "JPEG", quality=90)
+
+
+def build_corpus(seed, names):
+    """페이지별 폴더에 render_data.json과 사진 생성 → {페이지: render_data}"""
+    pages = {}
+    for name in names:
+        profile = PAGES[name]
+        rng = random.Random(f"{seed}:{name}")
+        page_dir = WORK_DIR / name
+        page_dir.mkdir(parents=True, exist_ok=True)
+        make_photo(page_dir / render.PHOTO_SLOTS["product"], profile["product"], seed, alpha=True)
+        for slot in ("scene", "lifestyle"):
+            make_photo(page_dir / render.PHOTO_SLOTS[slot], profile["photo"], f"{seed}:{slot}")
+        data = {"sections": [make_section(rng, index, kind, height, size)
+                             for index, (kind, height, size) in enumerate(profile["sections"], 1)]}
+        save_json(page_dir / "render_data.json", data)
+        pages[name] = data
+    return pages
+
+
+# ──────────────────────────────────────────────
+# 측정 케이스: (이름, 인자 없는 함수)
+# ──────────────────────────────────────────────
+
+def font_cases():
+    def cold():
+        render.load_font.cache_clear()
+        render.get_font(48)
+
+    yield "get_font/cold", cold
+    yield "get_font/warm", lambda: render.get_font(48)
+
+
+def wrap_cases(seed):
+    rng = random.Random(f"{seed}:wrap")
+    font = render.get_font(24)
+    texts = {length: korean_text(rng, length) for length in TEXT_LENGTHS}
+    for length, text in texts.items():
+        yield f"wrap_text/{length}", lambda text=text: render.wrap_text(text, font, 960, _MEASURE)
+    longest = texts[TEXT_LENGTHS[-1]]
+    yield (f"wrap_text/{TEXT_LENGTHS[-1]}_char",
+           lambda: render.wrap_text(longest, font, 960, _MEASURE, mode="char"))
+
+
+def _use_photos(page_dir, fresh=False):
+    if fresh or render.PHOTOS.base_dir != page_dir:
+        render.PHOTOS = render.PhotoRegistry(page_dir)
+
+
+def photo_cases(names):
+    """사진 크기별 cover/side 배치 (cold: 디코딩 포함, warm: 디코딩된 사진 재사용)"""
+    for name in names:
+        page_dir = WORK_DIR / name
+        profile = PAGES[name]
+        specs = {
+            "cover": ({"slot": "scene", "layout": "cover", "overlay": [0, 0, 0, 130]}, profile["photo"]),
+            "side": ({"slot": "product", "layout": "side", "height_ratio": 0.8,
+                      "max_width_ratio": 0.4}, profile["product"]),
+        }
+        for layout, (spec, size) in specs.items():
+            for state in ("cold", "warm"):
+                def paste(page_dir=page_dir, spec=spec, fresh=state == "cold"):
+                    _use_photos(page_dir, fresh)
+                    canvas = Image.new("RGBA", (WIDTH, 1080), "#FFFFFF")
+                    render.paste_product_photo(canvas, "", WIDTH, 1080, spec)
+
+                yield f"paste_product_photo/{layout}_{size[0]}x{size[1]}/{state}", paste
+
+
+def section_cases(pages):
+    for name, data in pages.items():
+        page_dir = WORK_DIR / name
+        for section in data["sections"]:
+            def draw(page_dir=page_dir, section=section):
+                _use_photos(page_dir)
+                render.render_section(section)
+
+            yield f"render_section/{name}/{section['id']}", draw
+
+
+def _render_all(name, data):
+    _use_photos(WORK_DIR / name)
+    return [render.render_section(section) for section in data["sections"]]
+
+
+def merge_cases(rendered):
+    for name, images in rendered.items():
+        yield f"merge_sections/{name}", lambda images=images: render.merge_sections(images)
+
+
+def encode_cases(rendered):
+    """섹션 하나는 프리셋별, 통합 이미지는 기본 프리셋"""
+    section = next(iter(rendered.values()))[0]
+    for preset in render.PNG_PRESETS:
+        yield f"png_encode/{preset}/section", lambda preset=preset: render.encode_png(section, preset)
+    for name, images in rendered.items():
+        merged = render.merge_sections(images)
+        yield f"png_encode/default/page_{name}", lambda merged=merged: render.encode_png(merged, "default")
+
+
+def measure(func, repeat=REPEAT, min_time=MIN_TIME):
+    """timeit 방식: 워밍업 1회 후 표본마다 min_time을 넘도록 반복 → (호출 수, 호출당 초 목록)"""
+    func()
+    start = time.perf_counter()
+    func()
+    once = time.perf_counter() - start
+    number = max(1, min(100_000, int(min_time / once))) if once < min_time else 1
+    samples = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            samples.append((time.perf_counter() - start) / number)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return number, samples
+
+
+def run_cases(cases, patterns, repeat, min_time):
+    results = {}
+    for name, func in cases:
+        if patterns and not any(fnmatch.fnmatch(name, pattern) for pattern in patterns):
+            continue
+        with redirect_stdout(io.StringIO()):
+            number, samples = measure(func, repeat, min_time)
+        stats = {**summarize(samples, 6), "min": round(min(samples), 6), "number": number}
+        results[name] = stats
+        print(f"  {name:<44} {stats['p50'] * 1000:10.3f}ms  (p95 {stats['p95'] * 1000:.3f}, ×{number})")
+    return results
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """케이스별 p50 기준선 비교 [(이름, 기준, 현재, 변화율, 회귀 여부)]"""
+    rows = []
+    for name, stats in results["cases"].items():
+        base = baseline.get("cases", {}).get(name)
+        if base:
+            rows.append((name, base["p50"], stats["p50"],
+                         *change(base["p50"], stats["p50"], tolerance, MIN_DELTA_SECONDS)))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="렌더러 벤치마크 (합성 코퍼스, 함수별 측정, 기준선 비교)")
+    parser.add_argument("--cases", nargs="+", metavar="PATTERN",
+                        help='측정할 케이스 (glob, 예: "wrap_text/*" "render_section/heavy/*")')
+    parser.add_argument("--pages", nargs="+", choices=list(PAGES), default=list(PAGES),
+                        help="합성 페이지 (기본: 전체)")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help=f"케이스당 표본 수 (기본 {REPEAT})")
+    parser.add_argument("--min-time", type=float, default=MIN_TIME,
+                        help=f"표본 하나의 최소 측정 시간 (초, 기본 {MIN_TIME})")
+    parser.add_argument("--seed", type=int, default=0, help="합성 코퍼스 시드")
+    parser.add_argument("--font", help="폰트 파일 (기본: render.py가 찾은 폰트)")
+    parser.add_argument("--resample", choices=sorted(render.RESAMPLE_PRESETS),
+                        default=render.RESAMPLE_MODE, help="사진 축소 방식")
+    parser.add_argument("--output", type=Path, default=RESULT_PATH, help=f"결과 JSON (기본: {RESULT_PATH})")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH,
+                        help=f"비교할 기준선 JSON (기본: {BASELINE_PATH})")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준선으로 저장")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help=f"회귀로 볼 p50 변화율 (기본 {TOLERANCE})")
+    parser.add_argument("--strict", action="store_true", help="회귀가 있으면 종료 코드 1")
+    args = parser.parse_args(argv)
+
+    if args.font:
+        render.FONT_PATH = args.font
+        render.load_font.cache_clear()
+    render.RESAMPLE_MODE = args.resample
+    # 레이어 캐시를 끄고 매번 축소/합성까지 측정
+    render.LAYERS = render.LayerCache(WORK_DIR / "layers", enabled=False)
+
+    pages = build_corpus(args.seed, args.pages)
+    sections = sum(len(data["sections"]) for data in pages.values())
+    print(f"합성 코퍼스: 페이지 {len(pages)}개 / 섹션 {sections}개 → {WORK_DIR}")
+    print(f"폰트: {render.FONT_PATH or '기본 폰트'}\n")
+
+    with redirect_stdout(io.StringIO()):
+        rendered = {name: _render_all(name, data) for name, data in pages.items()}
+    cases = [
+        *font_cases(),
+        *wrap_cases(args.seed),
+        *photo_cases(args.pages),
+        *section_cases(pages),
+        *merge_cases(rendered),
+        *encode_cases(rendered),
+    ]
+    started = time.perf_counter()
+    measured = run_cases(cases, args.cases, args.repeat, args.min_time)
+    results = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pillow": PIL.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "font": Path(render.FONT_PATH).name if render.FONT_PATH else None,
+            "resample": args.resample,
+            "seed": args.seed,
+            "pages": {name: len(data["sections"]) for name, data in pages.items()},
+            "repeat": args.repeat,
+        },
+        "cases": measured,
+        "seconds": round(time.perf_counter() - started, 2),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+    save_json(args.output, results)
+    print(f"\n케이스 {len(measured)}개 측정 ({results['seconds']:.1f}초, "
+          f"최대 RSS {results['peak_rss_mb']:.1f} MB) → {args.output}")
+
+    regressed = []
+    if args.baseline.exists():
+        baseline = load_json(args.baseline)
+        rows = compare(results, baseline, args.tolerance)
+        regressed = [row for row in rows if row[4]]
+        print(f"\n기준선 비교 ({args.baseline.name}, p50 허용 {args.tolerance:.0%}):")
+        for line in condition_warnings(results, baseline, COMPARABLE_META):
+            print(line)
+        improved = sum(1 for row in rows if row[3] < -args.tolerance)
+        print(f"  케이스 {len(rows)}개 중 회귀 {len(regressed)}개, 개선 {improved}개")
+        for name, base, current, ratio, _ in regressed:
+            print(f"  {name:<44} {base * 1000:9.3f} → {current * 1000:9.3f}ms ({ratio:+.1%})  ← 회귀")
+    elif not args.save_baseline:
+        print(f"\n기준선 없음: --save-baseline으로 {args.baseline} 생성")
+
+    if args.save_baseline:
+        if args.cases and args.baseline.exists():
+            # 일부 케이스만 측정했으면 기존 기준선의 나머지 케이스는 유지
+            results = {**results, "cases": {**load_json(args.baseline)["cases"], **measured}}
+        save_json(args.baseline, results)
+        print(f"기준선 저장: {args.baseline}")
+    if args.strict and regressed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+벤치마크 공용 도구: 백분위수 요약, 최대 RSS, 기준선 비교
+"""
+
+import json
+import resource
+import sys
+from pathlib import Path
+
+
+def percentile(values, q):
+    """선형 보간 백분위수 (q: 0~100)"""
+    values = sorted(values)
+    if not values:
+        return 0.0
+    position = (len(values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def summarize(values, digits=4):
+    return {
+        "count": len(values),
+        "mean": round(sum(values) / len(values), digits) if values else 0.0,
+        "p50": round(percentile(values, 50), digits),
+        "p95": round(percentile(values, 95), digits),
+        "max": round(max(values), digits) if values else 0.0,
+    }
+
+
+def peak_rss_mb():
+    """프로세스 최대 RSS (MB, Linux는 KB 단위 / macOS는 바이트 단위)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def change(base, current, tolerance, min_delta, higher_is_better=False):
+    """기준 대비 (변화율, 회귀 여부): 비율과 절대 차이(노이즈 하한)를 모두 넘어야 회귀"""
+    ratio = (current - base) / base if base else 0.0
+    worse = -ratio if higher_is_better else ratio
+    return ratio, worse > tolerance and abs(current - base) > min_delta
+
+
+def condition_warnings(results, baseline, keys):
+    """기준선과 측정 조건(meta)이 다른 항목 경고 줄"""
+    lines = []
+    for key in keys:
+        before, after = baseline.get("meta", {}).get(key), results["meta"].get(key)
+        if before != after:
+            lines.append(f"  WARNING: 측정 조건이 다릅니다: {key} {before} → {after}")
+    return lines
+
+
+def load_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_json(path, data):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write("\n")
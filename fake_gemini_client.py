@@ -0,0 +1,302 @@
+"""
+프로세스 내 가짜 Gemini 클라이언트 (API 키 없이 실행/벤치마크/회귀 테스트용)
+GEMINI_BACKEND=fake 이면 gemini_client가 google-genai 대신 이 클라이언트를 씁니다.
+녹화 파일의 응답을 재생하고, 지정한 지연과 비율로 429(RetryInfo 포함)/503 오류를
+google-genai와 같은 예외로 섞어 보내므로 재시도/쿼터 제한 경로도 그대로 거칩니다.
+
+녹화 파일 (JSON 배열 또는 JSONL, 항목 하나에 응답 하나):
+    {"key": "<응답 캐시 키>", "text": "...", "latency": 12.3}    같은 요청에만 재생
+    {"match": "프롬프트 일부", "response": {...}}                  프롬프트에 문자열이 있으면 재생
+key 항목을 먼저 찾고, 없으면 match 항목을 파일 순서대로 찾습니다.
+항목의 latency(초)는 기본 지연 대신 쓰이며 latency_scale을 곱합니다.
+
+사용 예:
+    GEMINI_BACKEND=record python3 pipeline.py --no-cache      # 실제 응답 녹화
+    GEMINI_BACKEND=fake GEMINI_FAKE_LATENCY_SCALE=0.1 GEMINI_FAKE_429_RATE=0.2 \\
+        python3 pipeline.py --no-cache                        # 녹화 재생
+"""
+
+import asyncio
+import json
+import random
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from gemini_client import ResponseCache, env_setting, estimate_tokens
+
+# GEMINI_BACKEND=record 녹화 파일이자 fake 백엔드의 기본 재생 파일
+RECORD_PATH = Path(__file__).parent.parent / "output" / "gemini_recordings.jsonl"
+
+
+class ReplayMissError(LookupError):
+    """요청에 맞는 녹화 응답이 없음 (재시도하지 않음)"""
+
+
+def request_key(model, contents, config):
+    """요청 → 응답 캐시와 같은 키 (모델/시스템 지시/온도/MIME 타입/프롬프트)"""
+    return ResponseCache.make_key(
+        model, getattr(config, "system_instruction", None), getattr(config, "temperature", None),
+        getattr(config, "response_mime_type", None), contents if isinstance(contents, str) else "",
+    )
+
+
+def _api_error(code, status, retry_delay=None):
+    """google-genai와 같은 APIError (fake_gemini_server.py의 오류 응답과 같은 본문)"""
+    from google.genai import errors
+
+    error = {"code": code, "message": f"fake {status}", "status": status}
+    if retry_delay is not None:
+        error["details"] = [{
+            "@type": "type.googleapis.com/google.rpc.RetryInfo",
+            "retryDelay": f"{retry_delay}s",
+        }]
+    error_class = errors.ClientError if code < 500 else errors.ServerError
+    return error_class(code, {"error": error})
+
+
+def _response(text, prompt_tokens=None):
+    """.text와 .usage_metadata만 가진 응답 (prompt_tokens가 None이면 사용량 없음)"""
+    usage = None
+    if prompt_tokens is not None:
+        output_tokens = estimate_tokens(text)
+        usage = SimpleNamespace(
+            prompt_token_count=prompt_tokens,
+            candidates_token_count=output_tokens,
+            total_token_count=prompt_tokens + output_tokens,
+        )
+    return SimpleNamespace(text=text, usage_metadata=usage)
+
+
+class Recordings:
+    """녹화 응답 목록 (key 항목은 dict, match 항목은 순서 유지 리스트)"""
+
+    def __init__(self, path=None):
+        self.by_key = {}
+        self.matches = []
+        if path and Path(path).exists():
+            self.load(path)
+
+    def load(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        if text.lstrip().startswith("["):
+            entries = json.loads(text)
+        else:
+            entries = [json.loads(line) for line in text.splitlines() if line.strip()]
+        for entry in entries:
+            self.add(entry)
+
+    def add(self, entry):
+        entry = dict(entry)
+        if "text" not in entry and "response" in entry:
+            entry["text"] = json.dumps(entry.pop("response"), ensure_ascii=False)
+        if entry.get("key"):
+            self.by_key[entry["key"]] = entry
+        elif entry.get("match"):
+            self.matches.append(entry)
+
+    def lookup(self, key, prompt):
+        """요청에 맞는 항목 (없으면 None)"""
+        entry = self.by_key.get(key)
+        if entry is None and isinstance(prompt, str):
+            entry = next((e for e in self.matches if e["match"] in prompt), None)
+        return entry
+
+    def __len__(self):
+        return len(self.by_key) + len(self.matches)
+
+
+class FakeGeminiClient:
+    """google-genai Client의 models / aio.models 중 이 프로젝트가 쓰는 메서드만 흉내
+
+    지연 = (녹화 항목의 latency 또는 latency) × latency_scale + [0, jitter) 난수.
+    요청마다 rate_429 비율로 429, error_rate 비율로 503을 지연 후 돌려줍니다.
+    """
+
+    def __init__(self, recordings=None, latency=0.0, jitter=0.0, latency_scale=1.0,
+                 rate_429=0.0, error_rate=0.0, retry_after=1.0, chunk_size=64,
+                 chunk_delay=0.0, seed=None):
+        if not isinstance(recordings, Recordings):
+            recordings = Recordings(recordings)
+        self.recordings = recordings
+        self.latency = latency
+        self.jitter = jitter
+        self.latency_scale = latency_scale
+        self.rate_429 = rate_429
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.stats = {"requests": 0, "replayed": 0, "rate_limited": 0, "errors": 0, "misses": 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.models = _FakeModels(self)
+        self.aio = SimpleNamespace(models=_FakeAsyncModels(self))
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def plan(self, model, contents, config):
+        """요청 하나의 (지연 초, 오류 또는 None, 응답 텍스트)"""
+        with self._lock:
+            self.stats["requests"] += 1
+            roll = self._random.random()
+            jitter = self._random.uniform(0, self.jitter) if self.jitter else 0.0
+        entry = self.recordings.lookup(request_key(model, contents, config), contents)
+        if entry is None:
+            self._count("misses")
+            head = contents[:60] if isinstance(contents, str) else ""
+            return 0.0, ReplayMissError(f"녹화된 응답이 없습니다 (프롬프트: {head!r}...)"), None
+
+        delay = entry.get("latency", self.latency) * self.latency_scale + jitter
+        if roll < self.rate_429:
+            self._count("rate_limited")
+            return delay, _api_error(429, "RESOURCE_EXHAUSTED", self.retry_after), None
+        if roll < self.rate_429 + self.error_rate:
+            self._count("errors")
+            return delay, _api_error(503, "UNAVAILABLE"), None
+        self._count("replayed")
+        return delay, None, entry["text"]
+
+    def pieces(self, text):
+        return [text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size)] or [""]
+
+
+def _prompt_tokens(contents, config):
+    texts = contents if isinstance(contents, list) else [contents]
+    return estimate_tokens(getattr(config, "system_instruction", None), *texts)
+
+
+class _FakeModels:
+    def __init__(self, client):
+        self._client = client
+
+    def generate_content(self, model, contents, config=None):
+        delay, error, text = self._client.plan(model, contents, config)
+        time.sleep(delay)
+        if error:
+            raise error
+        return _response(text, _prompt_tokens(contents, config))
+
+    def generate_content_stream(self, model, contents, config=None):
+        delay, error, text = self._client.plan(model, contents, config)
+        time.sleep(delay)
+        if error:
+            raise error
+        return self._chunks(text, _prompt_tokens(contents, config))
+
+    def _chunks(self, text, prompt_tokens):
+        """chunk_size 글자씩, 사용량은 마지막 조각에만"""
+        pieces = self._client.pieces(text)
+        for i, piece in enumerate(pieces):
+            if i and self._client.chunk_delay:
+                time.sleep(self._client.chunk_delay)
+            yield _response(piece, prompt_tokens if i == len(pieces) - 1 else None)
+
+    def count_tokens(self, model, contents, config=None):
+        return SimpleNamespace(total_tokens=_prompt_tokens(contents, config))
+
+
+class _FakeAsyncModels:
+    def __init__(self, client):
+        self._client = client
+
+    async def generate_content(self, model, contents, config=None):
+        delay, error, text = self._client.plan(model, contents, config)
+        await asyncio.sleep(delay)
+        if error:
+            raise error
+        return _response(text, _prompt_tokens(contents, config))
+
+
+def from_env():
+    """GEMINI_FAKE_* 환경변수(.env 포함)로 설정한 가짜 클라이언트"""
+    seed = env_setting("GEMINI_FAKE_SEED")
+    return FakeGeminiClient(
+        recordings=env_setting("GEMINI_FAKE_RECORDINGS", RECORD_PATH),
+        latency=float(env_setting("GEMINI_FAKE_LATENCY", "0")),
+        jitter=float(env_setting("GEMINI_FAKE_JITTER", "0")),
+        latency_scale=float(env_setting("GEMINI_FAKE_LATENCY_SCALE", "1")),
+        rate_429=float(env_setting("GEMINI_FAKE_429_RATE", "0")),
+        error_rate=float(env_setting("GEMINI_FAKE_ERROR_RATE", "0")),
+        retry_after=float(env_setting("GEMINI_FAKE_RETRY_AFTER", "1")),
+        seed=int(seed) if seed else None,
+    )
+
+
+# ──────────────────────────────────────────────
+# 녹화 (GEMINI_BACKEND=record)
+# ──────────────────────────────────────────────
+
+class RecordingClient:
+    """실제 클라이언트를 감싸 성공한 응답을 key 항목으로 녹화 파일에 추가"""
+
+    def __init__(self, client, path=RECORD_PATH):
+        self.client = client
+        self.path = Path(path)
+        self.models = _RecordingModels(self, client.models)
+        self._aio = None
+        self._lock = threading.Lock()
+
+    @property
+    def aio(self):
+        if self._aio is None:
+            self._aio = SimpleNamespace(models=_RecordingAsyncModels(self, self.client.aio.models))
+        return self._aio
+
+    def record(self, model, contents, config, text, started):
+        if not text:
+            return
+        entry = {
+            "key": request_key(model, contents, config),
+            "model": model,
+            "latency": round(time.perf_counter() - started, 3),
+            "text": text,
+        }
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+class _RecordingModels:
+    def __init__(self, recorder, models):
+        self._recorder = recorder
+        self._models = models
+
+    def generate_content(self, model, contents, config=None):
+        started = time.perf_counter()
+        response = self._models.generate_content(model=model, contents=contents, config=config)
+        self._recorder.record(model, contents, config, response.text, started)
+        return response
+
+    def generate_content_stream(self, model, contents, config=None):
+        started = time.perf_counter()
+        stream = self._models.generate_content_stream(model=model, contents=contents, config=config)
+        return self._chunks(stream, model, contents, config, started)
+
+    def _chunks(self, stream, model, contents, config, started):
+        """조각을 그대로 넘기고 끝까지 받으면 합친 텍스트를 녹화"""
+        parts = []
+        for chunk in stream:
+            parts.append(chunk.text or "")
+            yield chunk
+        self._recorder.record(model, contents, config, "".join(parts), started)
+
+    def count_tokens(self, model, contents, config=None):
+        return self._models.count_tokens(model=model, contents=contents, config=config)
+
+
+class _RecordingAsyncModels:
+    def __init__(self, recorder, models):
+        self._recorder = recorder
+        self._models = models
+
+    async def generate_content(self, model, contents, config=None):
+        started = time.perf_counter()
+        response = await self._models.generate_content(model=model, contents=contents, config=config)
+        self._recorder.record(model, contents, config, response.text, started)
+        return response
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+로컬 가짜 Gemini API 서버 (재시도/쿼터 제한 테스트용)
+generateContent / streamGenerateContent 요청에 정해진 응답을 돌려주고,
+지정한 비율로 429(Retry-After 포함)와 5xx 오류를 섞어 보냅니다.
+
+사용 예:
+    python3 fake_gemini_server.py --port 8765 --rate-429 0.3 --retry-after 1
+    GEMINI_BASE_URL=http://127.0.0.1:8765 GEMINI_API_KEY=test \\
+        python3 agent_researcher.py --no-cache
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeGeminiHandler(BaseHTTPRequestHandler):
+    """server.options 설정에 따라 응답하는 요청 처리기"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        if self.server.options.verbose:
+            super().log_message(format, *args)
+
+    def do_POST(self):
+        options = self.server.options
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        with self.server.lock:
+            self.server.requests += 1
+
+        if options.latency:
+            time.sleep(options.latency)
+
+        roll = random.random()
+        if roll < options.rate_429:
+            return self._error(429, "RESOURCE_EXHAUSTED", retry_delay=options.retry_after)
+        if roll < options.rate_429 + options.error_rate:
+            return self._error(503, "UNAVAILABLE")
+
+        if ":countTokens" in self.path:
+            return self._json(200, {"totalTokens": _count(body)})
+
+        text = self.server.response_text
+        usage = {
+            "promptTokenCount": _count(body),
+            "candidatesTokenCount": max(1, len(text) // 2),
+        }
+        usage["totalTokenCount"] = usage["promptTokenCount"] + usage["candidatesTokenCount"]
+
+        if ":streamGenerateContent" in self.path:
+            return self._stream(text, usage)
+        return self._json(200, _response(text, usage))
+
+    def _json(self, status, payload, headers=None):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, code, status, retry_delay=None):
+        error = {"code": code, "message": f"fake {status}", "status": status}
+        headers = {}
+        if retry_delay is not None:
+            error["details"] = [{
+                "@type": "type.googleapis.com/google.rpc.RetryInfo",
+                "retryDelay": f"{retry_delay}s",
+            }]
+            headers["Retry-After"] = str(retry_delay)
+        self._json(code, {"error": error}, headers)
+
+    def _stream(self, text, usage):
+        """SSE(alt=sse)로 chunk_size 글자씩 나눠 전송"""
+        size = self.server.options.chunk_size
+        pieces = [text[i:i + size] for i in range(0, len(text), size)] or [""]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for i, piece in enumerate(pieces):
+            payload = _response(piece, usage if i == len(pieces) - 1 else None)
+            self.wfile.write(f"data: {json.dumps(payload, ensure_ascii=False)}\r\n\r\n".encode("utf-8"))
+            self.wfile.flush()
+            if self.server.options.chunk_delay:
+                time.sleep(self.server.options.chunk_delay)
+        self.close_connection = True
+
+
+def _count(body):
+    """요청 본문 글자 수 기반 토큰 추정"""
+    return max(1, len(json.dumps(body.get("contents", ""), ensure_ascii=False)) // 2)
+
+
+def _response(text, usage=None):
+    payload = {
+        "candidates": [{
+            "content": {"role": "model", "parts": [{"text": text}]},
+            "finishReason": "STOP",
+            "index": 0,
+        }],
+    }
+    if usage:
+        payload["usageMetadata"] = usage
+    return payload
+
+
+def make_server(options, response_text='{"ok": true}'):
+    """옵션이 연결된 서버 생성 (serve_forever는 호출하지 않음)"""
+    server = ThreadingHTTPServer((options.host, options.port), FakeGeminiHandler)
+    server.options = options
+    server.response_text = response_text
+    server.requests = 0
+    server.lock = threading.Lock()
+    return server
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="로컬 가짜 Gemini API 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--response-file", help="응답으로 돌려줄 텍스트/JSON 파일")
+    parser.add_argument("--latency", type=float, default=0.0, help="요청당 지연 (초)")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="429 응답 비율 (0~1)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 응답 비율 (0~1)")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="429 응답의 재시도 대기 (초)")
+    parser.add_argument("--chunk-size", type=int, default=64, help="스트리밍 조각 크기 (글자)")
+    parser.add_argument("--chunk-delay", type=float, default=0.0, help="스트리밍 조각 간격 (초)")
+    parser.add_argument("--verbose", action="store_true", help="요청 로그 출력")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    response_text = '{"ok": true}'
+    if options.response_file:
+        with open(options.response_file, "r", encoding="utf-8") as f:
+            response_text = f.read()
+
+    server = make_server(options, response_text)
+    print(f"가짜 Gemini 서버: http://{options.host}:{options.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"처리한 요청: {server.requests}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,26 +5,62 @@ Gemini 2.5 Pro 클라이언트
 
 import os
 import json
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 
+from rate_limiter import QuotaLimiter, RetryPolicy, call_with_retry, call_with_retry_async
+
 # .env 파일에서 API 키 로드
 ENV_PATH = Path(__file__).parent.parent / ".env"
 
+# 응답 캐시 (output/.gemini_cache.sqlite)
+# GEMINI_CACHE=0 이면 캐시를 읽지 않고 항상 API를 호출합니다.
+CACHE_PATH = Path(__file__).parent.parent / "output" / ".gemini_cache.sqlite"
+CACHE_TTL = 7 * 24 * 60 * 60          # 초
+CACHE_MAX_BYTES = 50 * 1024 * 1024    # 초과 시 오래 안 쓴 항목부터 삭제
+CACHE_ENABLED = os.environ.get("GEMINI_CACHE", "1") != "0"
+
+CACHE_STATS = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+# CACHE_STATS / CALL_LOG 갱신용 (배치 api 스레드 풀과 비동기 경로에서 동시에 갱신)
+_stats_lock = threading.Lock()
+
+_client = None
+_client_lock = threading.Lock()
+_async_clients = weakref.WeakKeyDictionary()
 
-def load_api_key():
-    """Load GEMINI_API_KEY from .env file or environment"""
-    # 환경변수 우선
-    key = os.environ.get("GEMINI_API_KEY")
-    if key:
-        return key
 
-    # .env 파일에서 읽기
+@lru_cache(maxsize=1)
+def read_env_file():
+    """.env 파일의 KEY=VALUE 목록 (프로세스당 1회 읽기)"""
+    values = {}
     if ENV_PATH.exists():
         with open(ENV_PATH, "r") as f:
             for line in f:
                 line = line.strip()
-                if line.startswith("GEMINI_API_KEY="):
-                    return line.split("=", 1)[1].strip()
+                if line and not line.startswith("#") and "=" in line:
+                    name, value = line.split("=", 1)
+                    values[name.strip()] = value.strip()
+    return values
+
+
+def env_setting(name, default=None):
+    """환경변수 우선, 없으면 .env 파일 값"""
+    return os.environ.get(name) or read_env_file().get(name, default)
+
+
+@lru_cache(maxsize=1)
+def load_api_key():
+    """Load GEMINI_API_KEY from .env file or environment (프로세스당 1회)"""
+    key = env_setting("GEMINI_API_KEY")
+    if key:
+        return key
 
     raise ValueError(
         f"GEMINI_API_KEY를 찾을 수 없습니다.\n"
@@ -33,72 +69,711 @@ def load_api_key():
     )
 
 
-def create_client():
-    """Gemini API 클라이언트 생성"""
-    from google import genai
+# 모델/타임아웃/기본 temperature (configure()로 한 번에 변경)
+SETTINGS = {
+    "model": env_setting("GEMINI_MODEL", "gemini-2.5-flash"),
+    "timeout": float(env_setting("GEMINI_TIMEOUT", "300")),  # 초
+    "base_url": env_setting("GEMINI_BASE_URL"),  # 로컬 가짜 서버 등 (기본: Google API)
+    "text_temperature": 0.7,
+    "json_temperature": 0.3,
+    # 프롬프트 토큰 계산: estimate(로컬 추정, 기본) / api(models.count_tokens 호출)
+    "token_counter": env_setting("GEMINI_TOKEN_COUNTER", "estimate"),
+    # 클라이언트 백엔드: google(기본) / fake(녹화 응답 재생, API 키 불필요) / record(google + 녹화)
+    "backend": env_setting("GEMINI_BACKEND", "google"),
+}
 
-    api_key = load_api_key()
-    return genai.Client(api_key=api_key)
+
+# 쿼터 제한 (기본값은 2.5 Flash 무료 티어, 0이면 제한 없음)
+LIMITER = QuotaLimiter(
+    rpm=int(env_setting("GEMINI_RPM", "10")),
+    tpm=int(env_setting("GEMINI_TPM", "250000")),
+    rpd=int(env_setting("GEMINI_RPD", "250")),
+    tpd=int(env_setting("GEMINI_TPD", "0")),
+)
+# 429/5xx 재시도 (첫 호출 포함 최대 시도 횟수)
+RETRY = RetryPolicy(attempts=int(env_setting("GEMINI_RETRIES", "5")))
 
 
-def generate_text(prompt, system_instruction=None, temperature=0.7):
+def estimate_tokens(*texts):
+    """로컬 토큰 추정치 (ASCII 4자당 1토큰, 한글 등은 1자당 1토큰)"""
+    total = 0
+    for text in texts:
+        if text:
+            ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+            total += ascii_chars // 4 + (len(text) - ascii_chars)
+    return total
+
+
+def api_count_tokens(prompt, system_instruction=None):
+    """models.count_tokens 요청으로 센 입력 토큰 수 (실패하면 None)
+
+    Gemini API는 count_tokens의 system_instruction을 받지 않으므로 본문과 함께 셉니다.
     """
-    Gemini 2.5 Pro로 텍스트 생성
+    contents = [system_instruction, prompt] if system_instruction else prompt
+    try:
+        response = get_client().models.count_tokens(model=SETTINGS["model"], contents=contents)
+    except Exception as e:
+        print(f"  WARNING: count_tokens 실패 ({e})")
+        return None
+    return response.total_tokens
 
-    Args:
-        prompt: 사용자 프롬프트
-        system_instruction: 시스템 지시사항
-        temperature: 창의성 조절 (0.0~1.0)
 
-    Returns:
-        생성된 텍스트 (str)
+def count_tokens(prompt, system_instruction=None):
+    """보내기 전 입력 토큰 수 (SETTINGS["token_counter"] 방식)
+
+    api 방식은 count_tokens 요청으로 정확히 세고, 실패하면 로컬 추정치를 씁니다.
+    """
+    if SETTINGS["token_counter"] == "api":
+        tokens = api_count_tokens(prompt, system_instruction)
+        if tokens is not None:
+            return tokens
+    return estimate_tokens(prompt, system_instruction)
+
+
+def _usage(response):
+    """응답의 토큰 사용량 (usage_metadata가 없으면 빈 dict)"""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return {}
+    fields = {
+        "input_tokens": "prompt_token_count",
+        "cached_tokens": "cached_content_token_count",
+        "output_tokens": "candidates_token_count",
+        "thinking_tokens": "thoughts_token_count",
+        "total_tokens": "total_token_count",
+    }
+    return {name: getattr(usage, attr, None) or 0 for name, attr in fields.items()}
+
+
+def _record_usage(response, estimated):
+    """실제 사용 토큰으로 제한기 보정, 사용량 dict 반환"""
+    usage = _usage(response)
+    if usage.get("total_tokens"):
+        LIMITER.adjust(usage["total_tokens"] - estimated)
+    return usage
+
+
+# 호출 기록: 프로세스 전체(CALL_LOG)와 record_calls() 안의 스레드별 목록
+CALL_LOG = []
+_call_local = threading.local()
+
+
+@contextmanager
+def record_calls():
+    """이 스레드에서 일어나는 Gemini 호출 기록을 모으는 컨텍스트 (기록 list를 yield)
+
+    asyncio.run으로 실행한 동시 요청도 같은 스레드이므로 함께 모입니다.
     """
+    previous = getattr(_call_local, "calls", None)
+    calls = _call_local.calls = []
+    try:
+        yield calls
+    finally:
+        _call_local.calls = previous
+        if previous is not None:
+            previous.extend(calls)
+
+
+def _log_call(step, estimated, started, cached, usage=None):
+    entry = {
+        "step": step or "",
+        "model": SETTINGS["model"],
+        "cached": cached,
+        "estimated_tokens": estimated,
+        "seconds": round(time.perf_counter() - started, 3),
+        **(usage or {}),
+    }
+    with _stats_lock:
+        CALL_LOG.append(entry)
+    calls = getattr(_call_local, "calls", None)
+    if calls is not None:
+        calls.append(entry)
+
+
+def format_call_stats(calls=None):
+    """호출 기록 요약 (단계별 호출 수, 입력/출력 토큰, 지연 시간)"""
+    calls = CALL_LOG if calls is None else calls
+    if not calls:
+        return "Gemini 호출: 없음"
+    steps = {}
+    for entry in calls:
+        steps.setdefault(entry["step"].split(":", 1)[0] or "-", []).append(entry)
+
+    def line(name, entries):
+        sent = [e for e in entries if not e["cached"] and "error" not in e]
+        errors = sum("error" in e for e in entries)
+        tokens_in = sum(e.get("input_tokens") or e["estimated_tokens"] for e in sent)
+        tokens_out = sum(e.get("output_tokens", 0) + e.get("thinking_tokens", 0) for e in sent)
+        latency = max(e["seconds"] for e in entries)
+        cached = len(entries) - len(sent) - errors
+        failed = f", 실패 {errors}" if errors else ""
+        return (f"  {name:<16} 호출 {len(entries)}회 (캐시 {cached}{failed}) / "
+                f"입력 {tokens_in:,} / 출력 {tokens_out:,}토큰 / 최대 {latency:.1f}초")
+
+    lines = ["Gemini 호출 기록:"]
+    lines.extend(line(name, entries) for name, entries in steps.items())
+    if len(steps) > 1:
+        lines.append(line("합계", calls))
+    return "\n".join(lines)
+
+
+def append_call_log(path, calls):
+    """호출 기록을 JSONL 파일에 추가 (실행 시각 포함)"""
+    if not calls:
+        return
+    stamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+    with open(path, "a", encoding="utf-8") as f:
+        for entry in calls:
+            f.write(json.dumps({"time": stamp, **entry}, ensure_ascii=False) + "\n")
+
+
+def format_limiter_stats():
+    """에이전트 출력용 쿼터/재시도 요약 한 줄"""
+    stats = LIMITER.stats()
+    return (f"Gemini 쿼터: 대기 {stats['waits']}회 {stats['wait_seconds']:.1f}초"
+            f" (최대 {stats['max_wait']:.1f}초, 최대 대기열 {stats['max_queue_depth']}),"
+            f" 재시도 {stats['retries']}회")
+
+
+def configure(model=None, timeout=None, text_temperature=None, json_temperature=None,
+              base_url=None, backend=None):
+    """모델 이름, 요청 타임아웃(초), 기본 temperature, API 주소, 백엔드 설정
+
+    타임아웃/주소/백엔드가 바뀌면 공유 클라이언트를 다음 호출 때 새로 만듭니다.
+    """
+    global _client
+
+    if backend and backend != SETTINGS["backend"]:
+        if backend not in BACKENDS:
+            raise ValueError(f"알 수 없는 Gemini 백엔드: {backend} (가능: {', '.join(BACKENDS)})")
+        SETTINGS["backend"] = backend
+        with _client_lock:
+            _client = None
+            _async_clients.clear()
+
+    if base_url and base_url != SETTINGS["base_url"]:
+        SETTINGS["base_url"] = base_url
+        with _client_lock:
+            _client = None
+            _async_clients.clear()
+
+    if model:
+        SETTINGS["model"] = model
+    if text_temperature is not None:
+        SETTINGS["text_temperature"] = text_temperature
+    if json_temperature is not None:
+        SETTINGS["json_temperature"] = json_temperature
+    if timeout is not None and timeout != SETTINGS["timeout"]:
+        SETTINGS["timeout"] = timeout
+        with _client_lock:
+            _client = None
+            _async_clients.clear()
+
+
+def _google_client(timeout):
+    """google-genai 클라이언트 (실제 API 또는 GEMINI_BASE_URL 서버)"""
+    from google import genai
     from google.genai import types
 
-    client = create_client()
+    api_key = load_api_key()
+    http_options = types.HttpOptions(timeout=int(timeout * 1000))
+    if SETTINGS["base_url"]:
+        http_options.base_url = SETTINGS["base_url"]
+    return genai.Client(api_key=api_key, http_options=http_options)
+
+
+def _fake_client(timeout):
+    """녹화된 응답을 재생하는 프로세스 내 가짜 클라이언트 (GEMINI_FAKE_* 환경변수)"""
+    import fake_gemini_client
+    return fake_gemini_client.from_env()
 
-    config = types.GenerateContentConfig(
-        temperature=temperature,
+
+def _recording_client(timeout):
+    """google 클라이언트 응답을 GEMINI_RECORD_PATH에 녹화 (fake 백엔드에서 재생)"""
+    import fake_gemini_client
+    return fake_gemini_client.RecordingClient(
+        _google_client(timeout), env_setting("GEMINI_RECORD_PATH", fake_gemini_client.RECORD_PATH),
     )
+
+
+# 백엔드 이름 → 클라이언트 생성 함수 (timeout 초를 받아 client.models / client.aio.models 제공)
+BACKENDS = {
+    "google": _google_client,
+    "fake": _fake_client,
+    "record": _recording_client,
+}
+
+
+def register_backend(name, factory):
+    """백엔드 추가/교체 (벤치마크 등에서 옵션을 준 가짜 클라이언트를 끼울 때)"""
+    global _client
+
+    BACKENDS[name] = factory
+    if SETTINGS["backend"] == name:
+        with _client_lock:
+            _client = None
+            _async_clients.clear()
+
+
+def create_client(timeout=None):
+    """SETTINGS["backend"] 백엔드의 Gemini 클라이언트 생성"""
+    backend = SETTINGS["backend"]
+    if backend not in BACKENDS:
+        raise ValueError(f"알 수 없는 Gemini 백엔드: {backend} (가능: {', '.join(BACKENDS)})")
+    timeout = SETTINGS["timeout"] if timeout is None else timeout
+    return BACKENDS[backend](timeout)
+
+
+def get_client():
+    """프로세스 공유 클라이언트 (처음 호출할 때 생성, 스레드 안전)
+
+    같은 HTTP 커넥션 풀을 재사용하므로 keep-alive/TLS 세션이 유지됩니다.
+    """
+    global _client
+
+    client = _client
+    if client is None:
+        with _client_lock:
+            if _client is None:
+                _client = create_client()
+            client = _client
+    return client
+
+
+class ResponseCache:
+    """SQLite 기반 Gemini 응답 캐시
+
+    TTL이 지난 항목은 읽지 않고, 전체 크기가 max_bytes를 넘으면 마지막
+    사용 시각이 오래된 항목부터 지웁니다.
+    """
+
+    def __init__(self, path=CACHE_PATH, ttl=CACHE_TTL, max_bytes=CACHE_MAX_BYTES):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+
+    @contextmanager
+    def _connect(self):
+        """트랜잭션 하나 (블록이 끝나면 커밋/롤백 후 커넥션을 닫음)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    " key TEXT PRIMARY KEY, response TEXT NOT NULL,"
+                    " created REAL NOT NULL, accessed REAL NOT NULL, size INTEGER NOT NULL)"
+                )
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(model, system_instruction, temperature, mime_type, prompt):
+        """모델/시스템 지시/온도/MIME 타입/프롬프트 해시로 캐시 키 생성"""
+        prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        material = json.dumps(
+            [model, system_instruction or "", temperature, mime_type or "", prompt_hash],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """캐시된 응답 텍스트 (없거나 만료되면 None)"""
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT response, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        return row[0]
+
+    def put(self, key, response):
+        """응답 저장 후 TTL/크기 기준 정리"""
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, response, now, now, size),
+            )
+            _count("writes")
+            self._evict(conn, now)
+
+    def _evict(self, conn, now):
+        expired = conn.execute(
+            "DELETE FROM responses WHERE created < ?", (now - self.ttl,)
+        ).rowcount
+        _count("evictions", expired)
+
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed"
+        ).fetchall():
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            _count("evictions")
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+
+
+RESPONSE_CACHE = ResponseCache()
+
+
+def _count(name, amount=1):
+    with _stats_lock:
+        CACHE_STATS[name] += amount
+
+
+def cache_stats():
+    """응답 캐시 적중/미스 카운터"""
+    with _stats_lock:
+        return dict(CACHE_STATS)
+
+
+def format_cache_stats():
+    """에이전트 출력용 캐시 요약 한 줄"""
+    return (f"Gemini 캐시: hit {CACHE_STATS['hits']} / miss {CACHE_STATS['misses']}"
+            f" (저장 {CACHE_STATS['writes']}, 정리 {CACHE_STATS['evictions']})")
+
+
+def _content_config(temperature, mime_type, system_instruction):
+    from google.genai import types
+
+    config = types.GenerateContentConfig(temperature=temperature)
+    if mime_type:
+        config.response_mime_type = mime_type
     if system_instruction:
         config.system_instruction = system_instruction
+    return config
 
-    response = client.models.generate_content(
-        model="gemini-2.5-flash",
-        contents=prompt,
-        config=config,
-    )
 
-    return response.text
+def _cache_lookup(key, use_cache):
+    """캐시 조회 → (적중 여부, 응답 텍스트)"""
+    if use_cache is None:
+        use_cache = CACHE_ENABLED
+    if use_cache:
+        cached = RESPONSE_CACHE.get(key)
+        if cached is not None:
+            _count("hits")
+            return True, cached
+    _count("misses")
+    return False, None
+
+
+def _finish(key, text, parse):
+    """응답 파싱 후 캐시에 저장 (파싱 실패 시 저장하지 않음)"""
+    result = parse(text) if parse else text
+    if text:
+        RESPONSE_CACHE.put(key, text)
+    return result
+
+
+def _generate(prompt, system_instruction, temperature, mime_type=None,
+              use_cache=None, parse=None, step=None):
+    """generate_content 호출 (응답 캐시 경유)
+
+    parse가 주어지면 파싱에 성공한 응답만 캐시에 저장합니다.
+    use_cache=False는 캐시를 읽지 않고 새 응답으로 덮어씁니다.
+    step은 호출 기록에 남길 단계 이름입니다.
+    """
+    started = time.perf_counter()
+    model = SETTINGS["model"]
+    key = ResponseCache.make_key(model, system_instruction, temperature, mime_type, prompt)
+    estimated = estimate_tokens(prompt, system_instruction)
+    hit, cached = _cache_lookup(key, use_cache)
+    if hit:
+        _log_call(step, estimated, started, cached=True)
+        return parse(cached) if parse else cached
+
+    try:
+        response = call_with_retry(
+            lambda: get_client().models.generate_content(
+                model=model,
+                contents=prompt,
+                config=_content_config(temperature, mime_type, system_instruction),
+            ),
+            RETRY, LIMITER, estimated,
+        )
+    except Exception as e:
+        _log_call(step, estimated, started, False, {"error": str(e)})
+        raise
+    _log_call(step, estimated, started, False, _record_usage(response, estimated))
+    return _finish(key, response.text, parse)
+
+
+class PartialJSONError(ValueError):
+    """스트리밍 응답이 완전한 JSON으로 끝나지 않음 (잘림 등)
+
+    items에는 그때까지 완성된 (키, 항목) 목록이, fields에는 완성된
+    최상위 객체/배열 값(예: global_style)이 남습니다.
+    """
+
+    def __init__(self, message, items, fields=None):
+        super().__init__(message)
+        self.items = items
+        self.fields = fields or {}
+
+
+class JSONArrayStream:
+    """조각으로 들어오는 JSON 텍스트에서 최상위 배열 항목을 완성되는 즉시 추출
+
+    {"sections": [{...}, {...}]}처럼 최상위 객체의 배열 값이면 (키, 항목)을,
+    최상위가 배열이면 (None, 항목)을 돌려줍니다. 객체/배열 항목만 대상입니다.
+    완성된 최상위 객체/배열 값은 fields에 키별로 모읍니다.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.fields = {}
+        self._pos = 0
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_key = None
+        self._array_key = None
+        self._item_start = None
+        self._value_start = None
+
+    def feed(self, chunk):
+        """텍스트 조각 추가 → 새로 완성된 (키, 항목) 리스트"""
+        self.text += chunk
+        text = self.text
+        items = []
+        for pos in range(self._pos, len(text)):
+            ch = text[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._stack == ["{"]:
+                        self._last_key = json.loads(text[self._string_start:pos + 1])
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = pos
+            elif ch in "{[":
+                if self._in_array():
+                    self._item_start = pos
+                elif ch == "[" and self._stack in (["{"], []):
+                    self._array_key = self._last_key if self._stack else None
+                if self._stack == ["{"]:
+                    self._value_start = pos
+                self._stack.append(ch)
+            elif ch in "}]":
+                if self._stack:
+                    self._stack.pop()
+                if self._in_array() and self._item_start is not None:
+                    items.append((self._array_key,
+                                  json.loads(text[self._item_start:pos + 1])))
+                    self._item_start = None
+                elif self._stack == ["{"] and self._value_start is not None:
+                    self.fields[self._last_key] = json.loads(text[self._value_start:pos + 1])
+                    self._value_start = None
+        self._pos = len(text)
+        return items
+
+    def _in_array(self):
+        """현재 위치가 추출 대상 배열의 바로 안쪽인지"""
+        return self._stack in (["{", "["], ["["])
+
+
+def get_async_client():
+    """현재 이벤트 루프 전용 비동기 클라이언트 (client.aio)
+
+    비동기 HTTP 커넥션 풀은 이벤트 루프에 묶이므로 루프마다 하나씩 만들고,
+    같은 루프 안의 동시 요청끼리 공유합니다.
+    """
+    loop = asyncio.get_running_loop()
+    with _client_lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            client = _async_clients[loop] = create_client().aio
+    return client
+
+
+async def _generate_async(prompt, system_instruction, temperature, mime_type=None,
+                          use_cache=None, parse=None, step=None):
+    """_generate의 asyncio 버전"""
+    started = time.perf_counter()
+    model = SETTINGS["model"]
+    key = ResponseCache.make_key(model, system_instruction, temperature, mime_type, prompt)
+    estimated = estimate_tokens(prompt, system_instruction)
+    hit, cached = _cache_lookup(key, use_cache)
+    if hit:
+        _log_call(step, estimated, started, cached=True)
+        return parse(cached) if parse else cached
+
+    try:
+        response = await call_with_retry_async(
+            lambda: get_async_client().models.generate_content(
+                model=model,
+                contents=prompt,
+                config=_content_config(temperature, mime_type, system_instruction),
+            ),
+            RETRY, LIMITER, estimated,
+        )
+    except Exception as e:
+        _log_call(step, estimated, started, False, {"error": str(e)})
+        raise
+    _log_call(step, estimated, started, False, _record_usage(response, estimated))
+    return _finish(key, response.text, parse)
+
+
+def generate_text(prompt, system_instruction=None, temperature=None, use_cache=None,
+                  step=None):
+    """
+    Gemini 2.5 Pro로 텍스트 생성
+
+    Args:
+        prompt: 사용자 프롬프트
+        system_instruction: 시스템 지시사항
+        temperature: 창의성 조절 (0.0~1.0, 기본: SETTINGS["text_temperature"])
+        use_cache: False면 응답 캐시를 건너뜀 (기본: GEMINI_CACHE 설정)
+        step: 호출 기록에 남길 단계 이름
+
+    Returns:
+        생성된 텍스트 (str)
+    """
+    if temperature is None:
+        temperature = SETTINGS["text_temperature"]
+    return _generate(prompt, system_instruction, temperature, use_cache=use_cache, step=step)
 
 
-def generate_json(prompt, system_instruction=None, temperature=0.3):
+def generate_json(prompt, system_instruction=None, temperature=None, use_cache=None,
+                  step=None):
     """
     Gemini 2.5 Pro로 JSON 생성 (파싱까지 처리)
 
     Args:
         prompt: 사용자 프롬프트
         system_instruction: 시스템 지시사항
-        temperature: 낮을수록 일관된 출력
+        temperature: 낮을수록 일관된 출력 (기본: SETTINGS["json_temperature"])
+        use_cache: False면 응답 캐시를 건너뜀 (기본: GEMINI_CACHE 설정)
+        step: 호출 기록에 남길 단계 이름
 
     Returns:
         파싱된 dict/list
     """
-    from google.genai import types
+    if temperature is None:
+        temperature = SETTINGS["json_temperature"]
+    return _generate(
+        prompt, system_instruction, temperature,
+        mime_type="application/json", use_cache=use_cache, parse=json.loads, step=step,
+    )
 
-    client = create_client()
 
-    config = types.GenerateContentConfig(
-        temperature=temperature,
-        response_mime_type="application/json",
-    )
-    if system_instruction:
-        config.system_instruction = system_instruction
+async def generate_json_async(prompt, system_instruction=None, temperature=None,
+                              use_cache=None, step=None):
+    """
+    generate_json의 asyncio 버전 (asyncio.gather로 여러 요청 동시 실행)
 
-    response = client.models.generate_content(
-        model="gemini-2.5-flash",
-        contents=prompt,
-        config=config,
+    Returns:
+        파싱된 dict/list
+    """
+    if temperature is None:
+        temperature = SETTINGS["json_temperature"]
+    return await _generate_async(
+        prompt, system_instruction, temperature,
+        mime_type="application/json", use_cache=use_cache, parse=json.loads, step=step,
     )
 
-    return json.loads(response.text)
+
+def require_object(result, step):
+    """JSON 응답이 객체인지 확인 (배열/문자열 등이면 단계 이름과 함께 ValueError)"""
+    if not isinstance(result, dict):
+        raise ValueError(
+            f"{step} 응답이 JSON 객체가 아닙니다 ({type(result).__name__}): {str(result)[:80]}"
+        )
+    return result
+
+
+def _stream_chunks(prompt, system_instruction, temperature, mime_type, step=None):
+    """스트리밍 응답 텍스트 조각
+
+    첫 조각을 받을 때까지를 재시도 대상으로 삼습니다 (이후 끊기면 예외).
+    """
+    started = time.perf_counter()
+    estimated = estimate_tokens(prompt, system_instruction)
+
+    def start():
+        stream = iter(get_client().models.generate_content_stream(
+            model=SETTINGS["model"],
+            contents=prompt,
+            config=_content_config(temperature, mime_type, system_instruction),
+        ))
+        return stream, next(stream, None)
+
+    try:
+        stream, chunk = call_with_retry(start, RETRY, LIMITER, estimated)
+    except Exception as e:
+        _log_call(step, estimated, started, False, {"error": str(e)})
+        raise
+    last = None
+    while chunk is not None:
+        last = chunk
+        yield chunk.text or ""
+        chunk = next(stream, None)
+    _log_call(step, estimated, started, False, _record_usage(last, estimated))
+
+
+def generate_json_stream(prompt, system_instruction=None, temperature=None,
+                         use_cache=None, step=None):
+    """
+    스트리밍으로 JSON 생성: 최상위 배열 항목을 완성되는 즉시 전달
+
+    sections/competitors 같은 배열의 항목이 닫힐 때마다 (키, 항목)을
+    yield하고, 마지막에 (None, 전체 파싱 결과)를 yield합니다.
+    캐시에 있으면 저장된 응답을 같은 방식으로 재생합니다.
+
+    Raises:
+        PartialJSONError: 응답이 잘려 전체 JSON을 파싱할 수 없을 때
+            (그때까지 완성된 항목은 .items)
+    """
+    if temperature is None:
+        temperature = SETTINGS["json_temperature"]
+    started = time.perf_counter()
+    model = SETTINGS["model"]
+    mime_type = "application/json"
+    key = ResponseCache.make_key(model, system_instruction, temperature, mime_type, prompt)
+    hit, cached = _cache_lookup(key, use_cache)
+
+    if hit:
+        _log_call(step, estimate_tokens(prompt, system_instruction), started, cached=True)
+        chunks = [cached]
+    else:
+        chunks = _stream_chunks(prompt, system_instruction, temperature, mime_type, step)
+
+    stream = JSONArrayStream()
+    received = []
+    for chunk in chunks:
+        for item in stream.feed(chunk):
+            received.append(item)
+            yield item
+
+    try:
+        result = json.loads(stream.text)
+    except ValueError as e:
+        raise PartialJSONError(
+            f"스트리밍 응답 JSON 파싱 실패 ({len(received)}개 항목 수신 후): {e}",
+            received, stream.fields,
+        ) from e
+    if not hit and stream.text:
+        RESPONSE_CACHE.put(key, stream.text)
+    yield None, result
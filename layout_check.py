@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+레이아웃 검사 (dry-run): render_data.json → layout_report.json
+
+캔버스를 만들지 않고 render.py와 같은 폰트 메트릭/줄바꿈으로 요소별 영역을 계산해
+섹션마다 겹침, 캔버스 밖으로 넘침, 잘리는 텍스트를 보고합니다.
+여러 파일/폴더를 한 번에 검사할 수 있어 배치 결과 검증에도 쓸 수 있습니다.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, str(Path(__file__).parent))
+import render
+
+PROJECT_ROOT = Path(__file__).parent.parent
+OUTPUT_DIR = PROJECT_ROOT / "output"
+REPORT_PATH = OUTPUT_DIR / "layout_report.json"
+
+# 캔버스 경계 허용 오차 (rectangle은 [x, x+w]를 포함해 그리므로 1px)
+EDGE_TOLERANCE = 1
+# 서로 겹침을 검사할 글자 요소 (rectangle/line/circle은 배경 장식으로 간주)
+TEXT_TYPES = {"text", "badge", "icon_text"}
+
+# 측정 전용 draw (1x1, textbbox/getlength만 사용)
+_MEASURE = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+
+
+def _line_box(font, x, y, width):
+    ascent, descent = font.getmetrics()
+    return [x, y, x + width, y + ascent + descent]
+
+
+def _union(boxes):
+    return [min(b[0] for b in boxes), min(b[1] for b in boxes),
+            max(b[2] for b in boxes), max(b[3] for b in boxes)]
+
+
+def element_boxes(elem, canvas_width):
+    """요소 → 글자/도형 영역 목록 (텍스트는 줄마다 하나, 빈 요소는 [])"""
+    elem_type = elem.get("type", "")
+    if elem_type == "text":
+        font, placed = render.layout_text(_MEASURE, elem, canvas_width)
+        return [_line_box(font, x, y, width) for _, x, y, width in placed]
+    if elem_type == "badge":
+        _, lines, _, box = render.layout_badge(_MEASURE, elem)
+        return [box] if lines else []
+    if elem_type == "rectangle":
+        x, y = elem.get("x", 0), elem.get("y", 0)
+        return [[x, y, x + elem.get("width", 100), y + elem.get("height", 100)]]
+    if elem_type == "line":
+        half = elem.get("width", 1) / 2
+        x1, y1 = elem.get("x1", 0), elem.get("y1", 0)
+        x2, y2 = elem.get("x2", 100), elem.get("y2", 0)
+        return [[min(x1, x2) - half, min(y1, y2) - half, max(x1, x2) + half, max(y1, y2) + half]]
+    if elem_type == "circle":
+        cx, cy, r = elem.get("cx", 50), elem.get("cy", 50), elem.get("radius", 25)
+        return [[cx - r, cy - r, cx + r, cy + r]]
+    if elem_type == "icon_text":
+        # render.draw_icon_text와 같은 배치
+        icon = render.clean_emoji(elem.get("icon", ""))
+        label = render.clean_emoji(elem.get("label", ""))
+        x, y = elem.get("x", 60), elem.get("y", 0)
+        font = render.get_font(elem.get("font_size", 24))
+        pad, gap = elem.get("pad", 4), elem.get("gap", 12)
+        boxes = []
+        if icon:
+            diameter = (elem.get("font_size", 24) // 2 + pad) * 2
+            boxes.append([x, y - pad // 2, x + diameter, y + diameter - pad // 2])
+            x, y = x + diameter + gap, y + pad
+        if label:
+            boxes.append(_line_box(font, x, y, render.text_width(_MEASURE, label, font)))
+        return boxes
+    return []
+
+
+def _inside(box, width, height):
+    return (box[0] >= -EDGE_TOLERANCE and box[1] >= -EDGE_TOLERANCE
+            and box[2] <= width + EDGE_TOLERANCE and box[3] <= height + EDGE_TOLERANCE)
+
+
+def _outside(box, width, height):
+    return box[2] <= 0 or box[3] <= 0 or box[0] >= width or box[1] >= height
+
+
+def _intersects(a, b):
+    return min(a[2], b[2]) - max(a[0], b[0]) > 1 and min(a[3], b[3]) - max(a[1], b[1]) > 1
+
+
+def _photo_box(section, width, height, photos):
+    """side 배치 사진 영역 (cover는 배경이므로 제외, 사진 파일이 없으면 None)"""
+    spec = render.photo_spec(section)
+    if not spec or spec.get("layout", "cover") == "cover" or photos is None:
+        return None
+    source = photos.source_size(spec.get("slot", "product"))
+    if not source:
+        return None
+    x, y, w, h = render.side_photo_box(spec, source, width, height)
+    return [x, y, x + w, y + h]
+
+
+def check_section(section, photos=None, boxes=False):
+    """섹션 하나 검사 → {"id", "canvas", "issues", ("elements")}"""
+    canvas = section.get("canvas", {"width": 1080, "height": 800})
+    width = canvas.get("width", 1080)
+    height = canvas.get("height", 800)
+    issues = []
+    measured = []
+
+    for index, elem in enumerate(section.get("elements", [])):
+        elem_type = elem.get("type", "")
+        parts = element_boxes(elem, width)
+        if not parts:
+            continue
+        bbox = _union(parts)
+        measured.append((index, elem_type, bbox, parts))
+
+        def issue(kind, **detail):
+            issues.append({"type": kind, "element": index, "element_type": elem_type,
+                           "bbox": [round(v) for v in bbox], **detail})
+
+        if all(_outside(part, width, height) for part in parts):
+            issue("off_canvas")
+        elif elem_type in TEXT_TYPES:
+            clipped = [i for i, part in enumerate(parts) if not _inside(part, width, height)]
+            if clipped:
+                issue("clipped", lines=clipped, text=elem.get("content") or elem.get("label", ""))
+        elif not _inside(bbox, width, height):
+            issue("overflow")
+
+        if elem_type == "text":
+            limit = elem.get("max_width", width - 120)
+            widest = max(part[2] - part[0] for part in parts)
+            if widest > limit + EDGE_TOLERANCE:
+                issue("overflow", max_width=limit, width=round(widest))
+
+    # 글자 요소끼리 + side 사진과의 겹침
+    texts = [m for m in measured if m[1] in TEXT_TYPES]
+    for i, (index_a, type_a, box_a, parts_a) in enumerate(texts):
+        for index_b, type_b, box_b, parts_b in texts[i + 1:]:
+            if not _intersects(box_a, box_b):
+                continue
+            if any(_intersects(a, b) for a in parts_a for b in parts_b):
+                issues.append({"type": "overlap", "element": index_a, "element_type": type_a,
+                               "other": index_b, "other_type": type_b,
+                               "bbox": [round(v) for v in box_a]})
+    photo_box = _photo_box(section, width, height, photos)
+    if photo_box:
+        for index, elem_type, bbox, parts in texts:
+            if any(_intersects(part, photo_box) for part in parts):
+                issues.append({"type": "overlap", "element": index, "element_type": elem_type,
+                               "other": "photo", "bbox": [round(v) for v in bbox]})
+
+    result = {"id": section.get("id", ""), "canvas": [width, height], "issues": issues}
+    if boxes:
+        result["elements"] = [
+            {"element": index, "type": elem_type, "bbox": [round(v) for v in bbox]}
+            for index, elem_type, bbox, _ in measured
+        ]
+    return result
+
+
+def check_render_data(data, photos=None, boxes=False):
+    """render_data dict → 섹션별 검사 결과 목록"""
+    return [check_section(section, photos, boxes) for section in data.get("sections", [])]
+
+
+def find_render_data(paths):
+    """파일은 그대로, 폴더는 하위의 render_data.json을 모두 찾음"""
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            yield from sorted(path.rglob("render_data.json"))
+        else:
+            yield path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="레이아웃 검사: 래스터화 없이 겹침/넘침/잘림 보고")
+    parser.add_argument("paths", nargs="*", type=Path, default=[OUTPUT_DIR / "render_data.json"],
+                        help="render_data.json 파일 또는 폴더 (기본: output/render_data.json)")
+    parser.add_argument("--report", type=Path, default=REPORT_PATH,
+                        help=f"JSON 보고서 경로 (기본: {REPORT_PATH})")
+    parser.add_argument("--boxes", action="store_true", help="보고서에 모든 요소의 영역 포함")
+    parser.add_argument("--strict", action="store_true", help="문제가 하나라도 있으면 종료 코드 1")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    registries = {}
+    files = []
+    counts = {}
+    for path in find_render_data(args.paths):
+        entry = {"path": str(path)}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            entry["error"] = str(e)
+            files.append(entry)
+            print(f"  {path}: ERROR ({e})")
+            continue
+        # 사진은 render_data.json과 같은 폴더 기준 (헤더만 읽음)
+        photos = registries.setdefault(path.parent, render.PhotoRegistry(path.parent))
+        entry["sections"] = check_render_data(data, photos, args.boxes)
+        issues = [issue for section in entry["sections"] for issue in section["issues"]]
+        for issue in issues:
+            counts[issue["type"]] = counts.get(issue["type"], 0) + 1
+        files.append(entry)
+        if issues or len(args.paths) == 1:
+            print(f"  {path}: 문제 {len(issues)}개")
+            for section in entry["sections"]:
+                for issue in section["issues"]:
+                    other = f" ↔ {issue['other']}" if "other" in issue else ""
+                    print(f"    {section['id']} #{issue['element']} {issue['element_type']}: "
+                          f"{issue['type']}{other} {issue['bbox']}")
+    elapsed = time.perf_counter() - start
+
+    report = {"files": files, "summary": {"files": len(files), "issues": counts,
+                                          "seconds": round(elapsed, 3)}}
+    args.report.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    total = sum(counts.values())
+    rate = len(files) / elapsed if elapsed else 0
+    print(f"\n검사 완료: 파일 {len(files)}개, 문제 {total}개 "
+          f"({elapsed:.2f}초, {rate:.0f}파일/초) → {args.report}")
+    if total:
+        print("  " + ", ".join(f"{kind} {count}" for kind, count in sorted(counts.items())))
+    if args.strict and (total or any("error" in entry for entry in files)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
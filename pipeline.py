@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+파이프라인 러너: 리서치 → 디자인 → 렌더 데이터 컴파일 → 렌더링을 한 프로세스에서 실행
+단계 사이 산출물은 메모리(dict)로 넘기고, JSON 파일은 디버깅용으로 그대로 저장합니다.
+Claude 단계 결과(product_brief.json, page_copy.json)는 출력 폴더에서 읽습니다.
+"""
+
+import time
+
+_IMPORT_START = time.perf_counter()
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+import agent_designer
+import agent_researcher
+import render
+import render_compiler
+from gemini_client import (
+    SETTINGS, append_call_log, configure, format_cache_stats, format_call_stats,
+    format_limiter_stats, record_calls, require_object,
+)
+
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_START
+
+PROJECT_ROOT = Path(__file__).parent.parent
+OUTPUT_DIR = PROJECT_ROOT / "output"
+
+# 파이프라인 밖(Claude)에서 만들어지는 산출물과 해당 단계
+EXTERNAL_ARTIFACTS = {
+    "product_brief": "Step 1 (정보수집)",
+    "page_copy": "Step 3 (카피라이팅)",
+    "render_data": "compile 단계 또는 Step 5 (프롬프트)",
+}
+
+
+def load_artifact(output_dir, name):
+    path = Path(output_dir) / f"{name}.json"
+    if not path.exists():
+        hint = EXTERNAL_ARTIFACTS.get(name)
+        message = f"{path} 파일이 없습니다."
+        if hint:
+            message += f"\n먼저 {hint}을 실행하세요."
+        raise FileNotFoundError(message)
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path} 파일이 JSON 객체가 아닙니다 ({type(data).__name__})")
+    return data
+
+
+def save_artifact(output_dir, name, data):
+    """디버깅용 JSON 저장 (다음 단계는 메모리의 dict를 그대로 사용)"""
+    with open(Path(output_dir) / f"{name}.json", "w", encoding="utf-8") as f:
+        json.dump(data, ensure_ascii=False, indent=2, fp=f)
+
+
+def _count(data, key):
+    """요약 출력용 배열 길이 (배열이 아니면 0)"""
+    value = data.get(key)
+    return len(value) if isinstance(value, list) else 0
+
+
+# ──────────────────────────────────────────────
+# 단계: artifacts dict를 받아 새로 만든 산출물 dict를 반환
+# 응답 형태가 잘못되면 ValueError (run_pipeline이 단계 이름을 붙여 다시 올림)
+# ──────────────────────────────────────────────
+
+def stage_research(artifacts, output_dir, options):
+    result = require_object(agent_researcher.research(
+        artifacts["product_brief"], options["split"], options["use_cache"],
+    ), "research")
+    print(f"  경쟁사 {_count(result, 'competitors')}개 / "
+          f"셀링포인트 {_count(result, 'selling_points')}개")
+    return {"research_report": result}
+
+
+def stage_design(artifacts, output_dir, options):
+    result, failed = agent_designer.design(
+        artifacts["page_copy"], artifacts["research_report"],
+        options["design_mode"], use_cache=options["use_cache"],
+    )
+    require_object(result, "design")
+    global_style = require_object(result.get("global_style", {}), "design global_style")
+    print(f"  글로벌 스타일: {global_style.get('mood', '')} / "
+          f"섹션 {_count(result, 'sections')}개")
+    if failed:
+        print(f"  WARNING: 섹션 생성 실패 {len(failed)}개: {', '.join(failed)}")
+    return {"design_spec": result}
+
+
+def stage_compile(artifacts, output_dir, options):
+    result = render_compiler.compile_render_data(artifacts["page_copy"], artifacts["design_spec"])
+    print(f"  섹션 {len(result['sections'])}개")
+    return {"render_data": result}
+
+
+def stage_render(artifacts, output_dir, options):
+    render_options = dict(
+        workers=options["workers"], resample=options["resample"],
+        png_preset=options["png_preset"], slice_height=options["slice_height"],
+        force=options["force"],
+    )
+    if options.get("profiles"):
+        results = render.render_profiles(
+            artifacts["render_data"], options["profiles"], output_dir, **render_options,
+        )
+        failed = [f"{name}/{filename}" for name, result in results.items()
+                  for filename in result["failed"]]
+    else:
+        failed = render.render_page(artifacts["render_data"], output_dir, **render_options)["failed"]
+    if failed:
+        print(f"  WARNING: 렌더링 실패 {len(failed)}개: {', '.join(failed)}")
+    return {}
+
+
+# (이름, 표시 이름, 입력 산출물, 실행 함수)
+STAGES = [
+    ("research", "리서치", ["product_brief"], stage_research),
+    ("design", "디자인", ["page_copy", "research_report"], stage_design),
+    ("compile", "렌더 데이터", ["page_copy", "design_spec"], stage_compile),
+    ("render", "렌더링", ["render_data"], stage_render),
+]
+
+
+def run_pipeline(stages, output_dir=OUTPUT_DIR, options=None, artifacts=None, timings=None):
+    """stages에 든 단계를 순서대로 실행하고 (산출물 dict, 단계별 소요 시간) 반환
+
+    artifacts로 넘긴 산출물은 파일 대신 그대로 쓰고, 없는 입력만 output_dir에서 읽습니다.
+    입력이 없으면 FileNotFoundError, 입력/응답 형태가 잘못되면 단계 이름을 붙인 ValueError
+    (넘겨받은 timings에는 그때까지의 기록이 남음)
+    """
+    output_dir = Path(output_dir)
+    options = options or {}
+    artifacts = dict(artifacts or {})
+    timings = {} if timings is None else timings
+    selected = [stage for stage in STAGES if stage[0] in stages]
+
+    for number, (name, label, inputs, func) in enumerate(selected, 1):
+        print(f"\n[{number}/{len(selected)}] {label}")
+        for key in inputs:
+            if key not in artifacts:
+                artifacts[key] = load_artifact(output_dir, key)
+        start = time.perf_counter()
+        try:
+            produced = func(artifacts, output_dir, options)
+        except ValueError as e:
+            raise ValueError(f"{label} 단계 실패: {e}") from e
+        timings[name] = time.perf_counter() - start
+        for key, value in produced.items():
+            artifacts[key] = value
+            save_artifact(output_dir, key, value)
+        print(f"  {label} 완료 ({timings[name]:.2f}초)")
+    return artifacts, timings
+
+
+def format_timings(timings):
+    lines = [f"  {'모듈 import':<12} {IMPORT_SECONDS:7.2f}초"]
+    labels = {name: label for name, label, _, _ in STAGES}
+    for name, seconds in timings.items():
+        lines.append(f"  {labels[name]:<12} {seconds:7.2f}초")
+    lines.append(f"  {'합계':<12} {IMPORT_SECONDS + sum(timings.values()):7.2f}초")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    names = [name for name, _, _, _ in STAGES]
+    parser = argparse.ArgumentParser(description="리서치 → 디자인 → 렌더 데이터 → 렌더링을 한 프로세스에서 실행")
+    parser.add_argument("--stages", nargs="+", choices=names, default=names,
+                        help="실행할 단계 (기본: 전체, 항상 파이프라인 순서대로 실행)")
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR,
+                        help=f"입출력 폴더 (기본: {OUTPUT_DIR})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Gemini 응답 캐시를 읽지 않고 새로 호출")
+    parser.add_argument("--model", help=f"Gemini 모델 (기본: {SETTINGS['model']})")
+    parser.add_argument("--split", action="store_true", help="리서치를 작업별 동시 요청으로 실행")
+    parser.add_argument("--design-mode", choices=["single", "per_section", "stream"],
+                        default="single", help="디자인 에이전트 실행 방식 (기본 single)")
+    parser.add_argument("--workers", type=int, default=1, help="섹션 병렬 렌더링 프로세스 수")
+    parser.add_argument("--png-preset", choices=list(render.PNG_PRESETS), default=render.PNG_PRESET,
+                        help="렌더링 PNG 압축 프리셋")
+    parser.add_argument("--resample", choices=sorted(render.RESAMPLE_PRESETS),
+                        default=render.RESAMPLE_MODE, help="사진 축소 방식")
+    parser.add_argument("--slice-height", type=render.positive_int, default=None,
+                        help="통합 이미지를 최대 N px 높이로 나눠 함께 저장")
+    parser.add_argument("--force", action="store_true", help="모든 섹션을 다시 렌더링")
+    parser.add_argument("--profiles", nargs="+", type=render.parse_profile, default=None,
+                        metavar="PROFILE",
+                        help=f"여러 폭으로 함께 렌더링 ({', '.join(render.OUTPUT_PROFILES)} 또는 폭 px)")
+    args = parser.parse_args(argv)
+    configure(model=args.model)
+
+    options = {
+        "split": args.split,
+        "design_mode": args.design_mode,
+        "use_cache": False if args.no_cache else None,
+        "workers": args.workers,
+        "png_preset": args.png_preset,
+        "resample": args.resample,
+        "slice_height": args.slice_height,
+        "force": args.force,
+        "profiles": args.profiles,
+    }
+
+    timings = {}
+    with record_calls() as calls:
+        try:
+            run_pipeline(args.stages, args.output_dir, options, timings=timings)
+        except (FileNotFoundError, ValueError) as e:
+            print(f"ERROR: {e}")
+            sys.exit(1)
+        finally:
+            print(f"\n{'='*50}")
+            print("  단계별 소요 시간")
+            print(format_timings(timings))
+            print(f"{'='*50}")
+            if {"research", "design"} & set(args.stages):
+                print(format_cache_stats())
+                print(format_limiter_stats())
+                print(format_call_stats(calls))
+                append_call_log(args.output_dir / agent_researcher.CALL_LOG_NAME, calls)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+프롬프트 빌더: 에이전트 입력 직렬화와 단계별 토큰 예산
+입력은 공백 없는 JSON으로 직렬화하고 단계에서 쓰지 않는 필드/빈 값은 덜어낸 뒤,
+보내기 전에 토큰 수를 세어 단계별 예산을 넘으면 요청하지 않습니다
+(로컬 추정치로 넘을 때는 API로 다시 세어 실제로 넘을 때만 막음).
+"""
+
+import json
+
+from gemini_client import SETTINGS, api_count_tokens, env_setting, estimate_tokens
+
+# 단계별 입력 토큰 예산 (시스템 지시 포함, 0이면 제한 없음)
+# GEMINI_BUDGET_<단계> 환경변수로 변경 (예: GEMINI_BUDGET_DESIGN=20000)
+PROMPT_BUDGETS = {
+    "research": 6000,
+    "design": 16000,
+    "design_global": 4000,
+    "design_section": 4000,
+}
+
+
+class PromptBudgetError(ValueError):
+    """프롬프트가 단계의 토큰 예산을 넘음"""
+
+    def __init__(self, step, tokens, budget):
+        super().__init__(
+            f"{step} 프롬프트가 토큰 예산을 넘습니다: {tokens:,} > {budget:,} "
+            f"(GEMINI_BUDGET_{step.upper()} 환경변수로 조정)"
+        )
+        self.step = step
+        self.tokens = tokens
+        self.budget = budget
+
+
+def compact_json(data):
+    """공백/들여쓰기 없는 JSON (한글은 그대로)"""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def prune(data):
+    """None, 빈 문자열/리스트/dict를 재귀적으로 제거"""
+    if isinstance(data, dict):
+        items = ((key, prune(value)) for key, value in data.items())
+        return {key: value for key, value in items if value not in (None, "", [], {})}
+    if isinstance(data, list):
+        return [value for value in map(prune, data) if value not in (None, "", [], {})]
+    if isinstance(data, str):
+        return data.strip()
+    return data
+
+
+def select(data, fields):
+    """dict에서 fields만 남김 (하나도 없으면 스키마가 다른 입력으로 보고 전체 유지)"""
+    if not isinstance(data, dict):
+        return data
+    selected = {key: data[key] for key in fields if key in data}
+    return selected or data
+
+
+def budget_for(step):
+    """단계 예산 (환경변수 우선, 세부 이름 "design_section:01_hero"는 앞부분 기준)"""
+    step = step.split(":", 1)[0]
+    value = env_setting(f"GEMINI_BUDGET_{step.upper()}")
+    return int(value) if value else PROMPT_BUDGETS.get(step, 0)
+
+
+def check_budget(step, prompt, system_instruction=None):
+    """입력 토큰 수를 세어 예산과 비교 → 토큰 수 (실제 수가 넘으면 PromptBudgetError)
+
+    로컬 추정치는 한글을 1자당 1토큰으로 세어 실제보다 크게 나오므로, 추정치가
+    예산 안이면 그대로 통과시키고 넘을 때만 count_tokens API로 다시 셉니다
+    (GEMINI_TOKEN_COUNTER=api면 항상 API). API로 셀 수 없으면 경고만 출력하고 보냅니다.
+    """
+    name = step.split(":", 1)[0]
+    budget = budget_for(step)
+    tokens = estimate_tokens(prompt, system_instruction)
+    if SETTINGS["token_counter"] != "api" and (not budget or tokens <= budget):
+        return tokens
+    counted = api_count_tokens(prompt, system_instruction)
+    if counted is None:
+        if budget and tokens > budget:
+            print(f"  WARNING: {name} 프롬프트 추정치가 토큰 예산을 넘지만 ({tokens:,} > {budget:,}) "
+                  f"실제 토큰 수를 셀 수 없어 그대로 보냅니다")
+        return tokens
+    if budget and counted > budget:
+        raise PromptBudgetError(name, counted, budget)
+    return counted
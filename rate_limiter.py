@@ -0,0 +1,259 @@
+"""
+Gemini 호출용 쿼터 제한기 / 재시도 스케줄러
+분당·일일 요청 수(RPM/RPD)와 토큰 수(TPM/TPD)를 토큰 버킷으로 추적하고,
+429/5xx 응답은 지터가 들어간 지수 백오프로 재시도합니다.
+"""
+
+import asyncio
+import email.utils
+import random
+import re
+import threading
+import time
+
+# 재시도 대상 HTTP 상태 코드
+RETRY_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+# 재시도 대상 네트워크 예외 (httpx 등은 클래스 이름으로 판별)
+RETRY_EXCEPTION_NAMES = {
+    "TimeoutException", "ConnectTimeout", "ReadTimeout", "WriteTimeout", "PoolTimeout",
+    "ConnectError", "ReadError", "RemoteProtocolError",
+}
+
+
+class TokenBucket:
+    """capacity만큼 채워지고 period초에 걸쳐 다시 차는 버킷"""
+
+    def __init__(self, capacity, period):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.level = float(capacity)
+        self.updated = None
+
+    def _refill(self, now):
+        if self.updated is not None:
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount, now):
+        """amount를 꺼낼 수 있을 때까지 남은 시간 (초)"""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount):
+        self.level -= amount
+
+
+class QuotaLimiter:
+    """RPM/TPM/RPD/TPD 한도를 지키도록 호출 전에 대기시키는 제한기
+
+    한도가 0이면 해당 항목은 제한하지 않습니다. 일일 한도는 프로세스
+    안에서만 추적됩니다. 스레드와 asyncio 양쪽에서 사용할 수 있습니다.
+    """
+
+    def __init__(self, rpm=0, tpm=0, rpd=0, tpd=0, clock=time.monotonic):
+        self.clock = clock
+        self._requests = [TokenBucket(limit, period)
+                          for limit, period in ((rpm, 60), (rpd, 86400)) if limit]
+        self._tokens = [TokenBucket(limit, period)
+                        for limit, period in ((tpm, 60), (tpd, 86400)) if limit]
+        self._lock = threading.Lock()
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait = 0.0
+        self.retries = 0
+
+    def _try_acquire(self, tokens):
+        """지금 통과 가능하면 버킷에서 차감하고 0, 아니면 필요한 대기 시간"""
+        with self._lock:
+            now = self.clock()
+            wait = max(
+                [bucket.wait_time(1, now) for bucket in self._requests]
+                + [bucket.wait_time(tokens, now) for bucket in self._tokens]
+                + [0.0]
+            )
+            if wait <= 0:
+                for bucket in self._requests:
+                    bucket.take(1)
+                for bucket in self._tokens:
+                    bucket.take(tokens)
+            return wait
+
+    def _enter(self):
+        with self._lock:
+            self.queue_depth += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+
+    def _leave(self, waited):
+        with self._lock:
+            self.queue_depth -= 1
+            if waited > 0.001:
+                self.waits += 1
+                self.wait_seconds += waited
+                self.max_wait = max(self.max_wait, waited)
+
+    def acquire(self, tokens=0, sleep=time.sleep):
+        """한도 안에 들 때까지 대기 → 대기한 시간 (초)"""
+        start = self.clock()
+        self._enter()
+        try:
+            while True:
+                wait = self._try_acquire(tokens)
+                if wait <= 0:
+                    break
+                sleep(wait)
+        finally:
+            waited = self.clock() - start
+            self._leave(waited)
+        return waited
+
+    async def acquire_async(self, tokens=0):
+        """acquire의 asyncio 버전"""
+        start = self.clock()
+        self._enter()
+        try:
+            while True:
+                wait = self._try_acquire(tokens)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+        finally:
+            waited = self.clock() - start
+            self._leave(waited)
+        return waited
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def adjust(self, tokens):
+        """추정치와 실제 토큰 사용량의 차이를 반영 (음수면 환급)"""
+        with self._lock:
+            for bucket in self._tokens:
+                bucket.level = min(bucket.capacity, bucket.level - tokens)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "queue_depth": self.queue_depth,
+                "max_queue_depth": self.max_queue_depth,
+                "waits": self.waits,
+                "wait_seconds": self.wait_seconds,
+                "max_wait": self.max_wait,
+                "retries": self.retries,
+            }
+
+
+class RetryPolicy:
+    """지터가 들어간 지수 백오프 재시도 설정
+
+    attempts는 첫 호출을 포함한 최대 시도 횟수입니다. 서버가 재시도 시각을
+    알려 주면(Retry-After 헤더, RetryInfo.retryDelay) 그 값을 우선합니다.
+    """
+
+    def __init__(self, attempts=5, base_delay=1.0, max_delay=60.0):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt, hint=None):
+        """attempt번째 실패 후 대기 시간 (full jitter)"""
+        if hint is not None:
+            return min(self.max_delay, hint) + random.uniform(0, self.base_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+def error_status(error):
+    """예외에서 HTTP 상태 코드 추출 (없으면 None)"""
+    for name in ("code", "status_code"):
+        value = getattr(error, name, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(error, "response", None)
+    value = getattr(response, "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+def is_retryable(error):
+    if error_status(error) in RETRY_STATUS_CODES:
+        return True
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    return any(cls.__name__ in RETRY_EXCEPTION_NAMES for cls in type(error).__mro__)
+
+
+def _parse_seconds(value):
+    """"12", "1.5s", HTTP 날짜 → 초"""
+    value = str(value).strip()
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)s?", value)
+    if match:
+        return float(match.group(1))
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def _find_retry_delay(details):
+    if isinstance(details, dict):
+        if "retryDelay" in details:
+            return _parse_seconds(details["retryDelay"])
+        values = details.values()
+    elif isinstance(details, list):
+        values = details
+    else:
+        return None
+    for value in values:
+        found = _find_retry_delay(value)
+        if found is not None:
+            return found
+    return None
+
+
+def retry_after(error):
+    """서버가 알려 준 재시도 대기 시간 (초, 없으면 None)"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers:
+        value = headers.get("retry-after") or headers.get("Retry-After")
+        if value:
+            seconds = _parse_seconds(value)
+            if seconds is not None:
+                return seconds
+    return _find_retry_delay(getattr(error, "details", None))
+
+
+def call_with_retry(fn, policy, limiter=None, tokens=0, sleep=time.sleep):
+    """limiter 한도를 지키며 fn() 호출, 재시도 가능한 오류는 백오프 후 재시도"""
+    for attempt in range(policy.attempts):
+        if limiter:
+            limiter.acquire(tokens, sleep=sleep)
+        try:
+            return fn()
+        except Exception as e:
+            if attempt + 1 >= policy.attempts or not is_retryable(e):
+                raise
+            if limiter:
+                limiter.record_retry()
+            sleep(policy.delay(attempt, retry_after(e)))
+
+
+async def call_with_retry_async(fn, policy, limiter=None, tokens=0):
+    """call_with_retry의 asyncio 버전 (fn은 코루틴을 반환)"""
+    for attempt in range(policy.attempts):
+        if limiter:
+            await limiter.acquire_async(tokens)
+        try:
+            return await fn()
+        except Exception as e:
+            if attempt + 1 >= policy.attempts or not is_retryable(e):
+                raise
+            if limiter:
+                limiter.record_retry()
+            await asyncio.sleep(policy.delay(attempt, retry_after(e)))
@@ -5,23 +5,86 @@ output/render_data.json을 읽어서 10개 섹션 PNG를 생성하고
 하나의 긴 이미지로 합칩니다.
 """
 
+import argparse
+import hashlib
+import io
 import json
+import math
 import os
 import re
+import struct
 import sys
+import tempfile
+import threading
+import time
+import zlib
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import lru_cache
 from pathlib import Path
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageChops, ImageDraw, ImageFont
+
+from render_trace import Tracer
 
 # 프로젝트 루트
 PROJECT_ROOT = Path(__file__).parent.parent
 OUTPUT_DIR = PROJECT_ROOT / "output"
 RENDER_DATA = OUTPUT_DIR / "render_data.json"
+RENDER_MANIFEST = OUTPUT_DIR / "render_manifest.json"
+# 합성된 cover 배경 레이어 캐시 (RENDER_LAYER_CACHE=0 이면 사용 안 함)
+LAYER_CACHE_DIR = OUTPUT_DIR / ".cache" / "layers"
+LAYER_CACHE_ITEMS = 16
+LAYER_CACHE_MAX_BYTES = 512 * 1024 * 1024
+LAYER_CACHE_ENABLED = os.environ.get("RENDER_LAYER_CACHE", "1") != "0"
+# 구간 계측 (--trace로 켬, 꺼져 있으면 span()이 빈 컨텍스트)
+TRACE = Tracer()
+
+# 그리기 로직이 바뀌면 올려서 이전 manifest의 섹션 캐시를 무효화
+RENDERER_VERSION = "3"
 PRODUCT_PHOTO = OUTPUT_DIR / "product_photo.png"
 PHOTO_SCENE = OUTPUT_DIR / "photo_scene.jpg"
 PHOTO_LIFESTYLE = OUTPUT_DIR / "photo_lifestyle.jpg"
 PHOTO_NATURE = OUTPUT_DIR / "photo_nature.jpg"
 
+# 사진 슬롯 → output/ 안의 파일명
+PHOTO_SLOTS = {
+    "product": "product_photo.png",
+    "scene": "photo_scene.jpg",
+    "lifestyle": "photo_lifestyle.jpg",
+    "nature": "photo_nature.jpg",
+    "person_chair": "photo_person_chair.jpg",
+    "family": "photo_family.jpg",
+    "setup": "photo_setup.jpg",
+}
+
+# section_id별 기본 사진 배치 (render_data.json 섹션의 "photo"로 덮어쓰기)
+SECTION_PHOTOS = {
+    # 히어로: 우측 40%에 제품 사진
+    "01_hero": {"slot": "product", "layout": "side", "align": "right",
+                "height_ratio": 0.8, "max_width_ratio": 0.4, "margin": 20},
+    # 사진 배너: 풀폭 사진 + 다크 오버레이
+    "02_photo_banner": {"slot": "person_chair", "layout": "cover",
+                        "overlay": [0, 0, 0, 130]},
+    # 핵심 숫자: 배경에 살짝 씬 사진
+    "03_key_numbers": {"slot": "scene", "layout": "cover",
+                       "overlay": [255, 255, 255, 235]},
+    # 고민/해결: 좌측 45%에 제품 사진
+    "04_pain_solution": {"slot": "product", "layout": "side", "align": "left",
+                         "height_ratio": 0.7, "max_width_ratio": 0.42,
+                         "margin": 30, "offset_y": 20},
+    # 라이프스타일: 풀폭 사진 + 오버레이
+    "07_photo_lifestyle": {"slot": "family", "layout": "cover",
+                           "overlay": [0, 0, 0, 110]},
+    # 후기: 자연 배경 + 강한 오버레이
+    "09_reviews": {"slot": "nature", "layout": "cover",
+                   "overlay": [255, 255, 255, 210]},
+    # CTA: 우측에 제품
+    "10_cta": {"slot": "product", "layout": "side", "align": "right",
+               "height_ratio": 0.65, "margin": 30},
+}
+
 # macOS 한국어 폰트
 FONT_PATHS = [
     "/System/Library/Fonts/AppleSDGothicNeo.ttc",
@@ -81,31 +144,177 @@ EMOJI_MAP = {
 }
 
 
+# 폰트에 글리프가 없으면 대체하는 이모지 영역
+EMOJI_RANGES = [
+    (0x1F600, 0x1F9FF),  # emoticons, symbols
+    (0x2600, 0x27BF),    # misc symbols, dingbats
+    (0x1F300, 0x1F5FF),  # misc symbols and pictographs
+    (0x1FA00, 0x1FA6F),  # chess, extended-A
+    (0x1FA70, 0x1FAFF),  # symbols extended-A
+]
+# 항상 지우는 보이지 않는 수식 문자 (variation selector, ZWJ, 피부색)
+EMOJI_MODIFIERS = [(0xFE00, 0xFE0F), (0x200D, 0x200D), (0x1F3FB, 0x1F3FF)]
+EMOJI_FALLBACK = "●"
+# ZWJ 시퀀스(🏋️‍♂️, 👨‍👩‍👧)는 첫 글자 하나로: ZWJ + 뒤 이모지 구성 글자 (+ VS16) 제거
+# (일반 문자 사이의 ZWJ는 EMOJI_MODIFIERS로 ZWJ만 지움)
+_ZWJ_COMPONENT = re.compile("\u200d[\u2600-\u27bf\u2b00-\u2bff\U0001f300-\U0001faff]\ufe0f?")
+# 연속 ● 정리 (대체 결과와 EMOJI_MAP 심볼 모두)
+_FALLBACK_RUN = re.compile(EMOJI_FALLBACK + "{2,}")
+
+
+class GlyphCoverage:
+    """폰트 cmap에서 글리프가 있는 코드포인트 구간 (bisect로 조회)"""
+
+    def __init__(self, ranges):
+        merged = []
+        for start, end in sorted(ranges):
+            if merged and start <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        self.starts = [start for start, _ in merged]
+        self.ends = [end for _, end in merged]
+
+    def __contains__(self, ch):
+        cp = ord(ch) if isinstance(ch, str) else ch
+        i = bisect_right(self.starts, cp) - 1
+        return i >= 0 and cp <= self.ends[i]
+
+    def covers(self, text):
+        return all(ch in self for ch in text)
+
+
+def _read_cmap(path, index=0):
+    """TTF/OTF/TTC 파일에서 cmap 테이블 바이트만 읽기 (없으면 None)"""
+    with open(path, "rb") as f:
+        header = f.read(12)
+        offset = 0
+        if header[:4] == b"ttcf":
+            count = struct.unpack(">I", header[8:12])[0]
+            f.seek(12 + 4 * min(index, count - 1))
+            offset = struct.unpack(">I", f.read(4))[0]
+        f.seek(offset + 4)
+        num_tables = struct.unpack(">H", f.read(2))[0]
+        f.seek(offset + 12)
+        records = f.read(16 * num_tables)
+        for i in range(num_tables):
+            tag, _, table_offset, length = struct.unpack_from(">4sIII", records, 16 * i)
+            if tag == b"cmap":
+                f.seek(table_offset)
+                return f.read(length)
+    return None
+
+
+def _cmap_format4(cmap, offset):
+    """format 4 (BMP 세그먼트) → [(시작, 끝)]"""
+    seg_count = struct.unpack_from(">H", cmap, offset + 6)[0] // 2
+    ends_at = offset + 14
+    starts_at = ends_at + 2 * seg_count + 2
+    deltas_at = starts_at + 2 * seg_count
+    range_offsets_at = deltas_at + 2 * seg_count
+    ends = struct.unpack_from(f">{seg_count}H", cmap, ends_at)
+    starts = struct.unpack_from(f">{seg_count}H", cmap, starts_at)
+    deltas = struct.unpack_from(f">{seg_count}H", cmap, deltas_at)
+    range_offsets = struct.unpack_from(f">{seg_count}H", cmap, range_offsets_at)
+
+    ranges = []
+    for i, (start, end, delta, range_offset) in enumerate(zip(starts, ends, deltas, range_offsets)):
+        if start == 0xFFFF or start > end:
+            continue
+        if range_offset == 0:
+            ranges.append((start, end))
+            continue
+        # glyphIdArray를 거치는 세그먼트는 글자마다 glyph 0(.notdef) 여부 확인
+        base = range_offsets_at + 2 * i + range_offset
+        for cp in range(start, end + 1):
+            at = base + 2 * (cp - start)
+            if at + 2 <= len(cmap) and struct.unpack_from(">H", cmap, at)[0]:
+                ranges.append((cp, cp))
+    return ranges
+
+
+def _cmap_format12(cmap, offset):
+    """format 12 (전체 유니코드 그룹) → [(시작, 끝)]"""
+    num_groups = struct.unpack_from(">I", cmap, offset + 12)[0]
+    groups = struct.unpack_from(f">{3 * num_groups}I", cmap, offset + 16)
+    return [(groups[i], groups[i + 1]) for i in range(0, len(groups), 3)]
+
+
+# 유니코드 cmap 서브테이블 우선순위 (platform, encoding): 전체 유니코드 → BMP
+CMAP_SUBTABLES = [(3, 10), (0, 6), (0, 4), (3, 1), (0, 3)]
+
+
+@lru_cache(maxsize=None)
+def font_coverage(path, index=0):
+    """폰트의 글리프 커버리지 (프로세스당 1회, 읽을 수 없으면 None)"""
+    if not path:
+        return None
+    try:
+        cmap = _read_cmap(path, index)
+        if not cmap:
+            return None
+        count = struct.unpack_from(">H", cmap, 2)[0]
+        subtables = {}
+        for i in range(count):
+            platform, encoding, offset = struct.unpack_from(">HHI", cmap, 4 + 8 * i)
+            subtables.setdefault((platform, encoding), offset)
+        for key in CMAP_SUBTABLES:
+            if key not in subtables:
+                continue
+            offset = subtables[key]
+            fmt = struct.unpack_from(">H", cmap, offset)[0]
+            if fmt == 12:
+                return GlyphCoverage(_cmap_format12(cmap, offset))
+            if fmt == 4:
+                return GlyphCoverage(_cmap_format4(cmap, offset))
+    except (OSError, struct.error):
+        pass
+    return None
+
+
+@lru_cache(maxsize=8)
+def emoji_table(font_path):
+    """font_path 기준 str.translate 표
+
+    폰트에 글리프가 있는 글자는 그대로 두고, 없는 것만 바꿉니다.
+    - EMOJI_MAP 이모지 → 지정 심볼 (심볼도 없으면 ●)
+    - 그 외 EMOJI_RANGES 글자 → ● (clean_emoji가 연속 ●를 하나로 합침)
+    - EMOJI_MODIFIERS → 삭제
+    커버리지를 모르면 (폰트 없음/cmap 읽기 실패) 이모지 영역을 모두 바꿉니다.
+    """
+    coverage = font_coverage(font_path)
+
+    def has(text):
+        return coverage is not None and coverage.covers(text)
+
+    table = {}
+    for start, end in EMOJI_RANGES:
+        for cp in range(start, end + 1):
+            if not has(chr(cp)):
+                table[cp] = EMOJI_FALLBACK
+    for emoji, symbol in EMOJI_MAP.items():
+        base = emoji[0]
+        if has(base):
+            continue
+        if symbol and coverage is not None and not has(symbol):
+            symbol = EMOJI_FALLBACK
+        table[ord(base)] = symbol
+    for start, end in EMOJI_MODIFIERS:
+        for cp in range(start, end + 1):
+            table[cp] = None
+    return table
+
+
 def clean_emoji(text):
-    """이모지를 렌더링 가능한 심볼로 대체"""
+    """폰트에 없는 이모지를 렌더링 가능한 심볼로 대체 (str.translate 한 번)"""
     if not text:
         return text
-    for emoji, symbol in EMOJI_MAP.items():
-        text = text.replace(emoji, symbol)
-    # 남은 이모지 패턴 제거 (variation selector 등)
-    text = re.sub(r'[\ufe0f\u200d]', '', text)
-    # 기타 남은 이모지 → ● 로 대체
-    cleaned = []
-    for ch in text:
-        cp = ord(ch)
-        if (0x1F600 <= cp <= 0x1F9FF or  # emoticons, symbols
-            0x2600 <= cp <= 0x27BF or     # misc symbols
-            0x1F300 <= cp <= 0x1F5FF or   # misc symbols and pictographs
-            0x1FA00 <= cp <= 0x1FA6F or   # chess, extended-A
-            0x1FA70 <= cp <= 0x1FAFF or   # symbols extended-A
-            0xFE00 <= cp <= 0xFE0F):      # variation selectors
-            cleaned.append("●")
-        else:
-            cleaned.append(ch)
-    result = ''.join(cleaned)
-    # 연속 ● 정리
-    result = re.sub(r'●{2,}', '●', result)
-    return result
+    if "\u200d" in text:
+        text = _ZWJ_COMPONENT.sub("", text)
+    text = text.translate(emoji_table(FONT_PATH))
+    if EMOJI_FALLBACK * 2 in text:
+        text = _FALLBACK_RUN.sub(EMOJI_FALLBACK, text)
+    return text
 
 
 def find_font():
@@ -120,78 +329,222 @@ def find_font():
 FONT_PATH = find_font()
 
 
-def get_font(size, weight="normal"):
-    """폰트 로드"""
-    if not FONT_PATH:
+# 프로세스 전역 폰트 캐시 크기 ((경로, 크기, 페이스) 조합 수)
+FONT_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=None)
+def bold_face_index(path):
+    """TTC 컬렉션의 Bold 페이스 인덱스 탐색 (프로세스당 1회)
+
+    스타일 이름이 정확히 Bold인 페이스를 우선하고, 없으면 이름에 Bold가
+    들어간 페이스, 그래도 없으면 기존 규칙(index=5, 실패 시 0)을 따릅니다.
+    """
+    styles = []
+    for index in range(64):
+        try:
+            face = ImageFont.truetype(path, 12, index=index)
+        except Exception:
+            break
+        styles.append(face.getname()[1] or "")
+
+    for index, style in enumerate(styles):
+        if style.lower() == "bold":
+            return index
+    for index, style in enumerate(styles):
+        if "bold" in style.lower():
+            return index
+    return 5 if len(styles) > 5 else 0
+
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def load_font(path, size, index=0):
+    """폰트 파일 파싱 (path, size, index 조합별로 한 번만)"""
+    if not path:
         return ImageFont.load_default()
     try:
-        if weight == "bold" and FONT_PATH.endswith(".ttc"):
-            try:
-                return ImageFont.truetype(FONT_PATH, size, index=5)
-            except Exception:
-                return ImageFont.truetype(FONT_PATH, size, index=0)
-        return ImageFont.truetype(FONT_PATH, size, index=0)
+        with TRACE.span("font_load", "font", {"size": size}):
+            return ImageFont.truetype(path, size, index=index)
     except Exception:
+        if index:
+            return load_font(path, size, 0)
         return ImageFont.load_default()
 
 
-def wrap_text(text, font, max_width, draw):
-    """텍스트를 max_width에 맞게 줄바꿈"""
+def font_cache_info():
+    """폰트 캐시 적중/미스 카운터"""
+    info = load_font.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "maxsize": info.maxsize,
+    }
+
+
+def get_font(size, weight="normal"):
+    """폰트 로드 (프로세스 전역 LRU 캐시 사용)"""
+    if not FONT_PATH:
+        return load_font(None, 0)
+    if weight == "bold" and FONT_PATH.endswith(".ttc"):
+        return load_font(FONT_PATH, size, bold_face_index(FONT_PATH))
+    return load_font(FONT_PATH, size, 0)
+
+
+@lru_cache(maxsize=65536)
+def glyph_advance(font, ch):
+    """글자 하나의 advance 폭 (폰트별로 한 번만 측정)"""
+    return font.getlength(ch)
+
+
+def text_width(draw, text, font):
+    """textbbox 기준 실제 렌더링 폭"""
+    bbox = draw.textbbox((0, 0), text, font=font)
+    return bbox[2] - bbox[0]
+
+
+def _fit_count(fits, guess, n):
+    """fits(k)가 참인 최대 k (1 <= k <= n)를 guess 주변에서 탐색
+
+    폭은 글자를 추가할수록 단조 증가하므로, 추정 위치에서 지수 탐색으로
+    구간을 잡은 뒤 이진 탐색합니다. 한 글자도 안 들어가면 1을 반환합니다
+    (기존 wrap_text와 동일하게 최소 한 글자는 줄에 남김).
+    """
+    guess = min(max(guess, 1), n)
+    step = 1
+    if fits(guess):
+        lo = guess
+        while True:
+            if lo >= n:
+                return n
+            probe = min(lo + step, n)
+            if not fits(probe):
+                hi = probe - 1
+                break
+            lo = probe
+            step *= 2
+    else:
+        hi = guess - 1
+        while True:
+            if hi <= 1:
+                return 1
+            probe = max(hi - step, 1)
+            if fits(probe):
+                lo = probe
+                break
+            hi = probe - 1
+            step *= 2
+
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if fits(mid):
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _wrap_paragraph(paragraph, font, max_width, draw, mode):
+    """한 문단을 줄 단위로 분할"""
+    # 글자별 advance 누적합 → 줄바꿈 위치 추정용
+    prefix = [0.0]
+    for ch in paragraph:
+        prefix.append(prefix[-1] + glyph_advance(font, ch))
+
+    lines = []
+    start = 0
+    end = len(paragraph)
+    while start < end:
+        def fits(k):
+            return text_width(draw, paragraph[start:start + k], font) <= max_width
+
+        guess = bisect_right(prefix, prefix[start] + max_width) - 1 - start
+        count = _fit_count(fits, guess, end - start)
+        stop = start + count
+
+        if stop >= end:
+            lines.append(paragraph[start:])
+            break
+
+        if mode == "word":
+            # 어절(띄어쓰기) 경계 우선: 넘친 글자가 공백이어도 그 자리에서 끊음
+            space = paragraph.rfind(" ", start, stop + 1)
+            line = paragraph[start:space].rstrip(" ") if space > start else ""
+            if line:
+                lines.append(line)
+                start = space + 1
+                while start < end and paragraph[start] == " ":
+                    start += 1
+                continue
+
+        # 글자 단위 줄바꿈 (어절이 한 줄보다 긴 경우 포함)
+        lines.append(paragraph[start:stop])
+        start = stop
+
+    return lines
+
+
+def wrap_text(text, font, max_width, draw, mode="word"):
+    """텍스트를 max_width에 맞게 줄바꿈
+
+    mode="word"는 어절(띄어쓰기) 경계에서 우선 줄바꿈하고, 한 어절이
+    max_width보다 길면 글자 단위로 끊습니다. mode="char"는 기존과 동일한
+    글자 단위 줄바꿈입니다.
+    """
     if not max_width or max_width <= 0:
         return [text]
 
     lines = []
-    for paragraph in text.split("\n"):
-        if not paragraph.strip():
-            lines.append("")
-            continue
-
-        current_line = ""
-        for char in paragraph:
-            test_line = current_line + char
-            bbox = draw.textbbox((0, 0), test_line, font=font)
-            if bbox[2] - bbox[0] > max_width and current_line:
-                lines.append(current_line)
-                current_line = char
-            else:
-                current_line = test_line
-        if current_line:
-            lines.append(current_line)
+    with TRACE.span("wrap_text", "text"):
+        for paragraph in text.split("\n"):
+            if not paragraph.strip():
+                lines.append("")
+                continue
+            lines.extend(_wrap_paragraph(paragraph, font, max_width, draw, mode))
 
     return lines
 
 
-def draw_text_element(draw, elem, canvas_width):
-    """텍스트 요소 렌더링"""
+def layout_text(draw, elem, canvas_width):
+    """텍스트 요소의 줄 배치: (폰트, [(줄, x, y, 폭)]) — 그리기와 레이아웃 검사가 공유"""
     content = clean_emoji(elem.get("content", ""))
     if not content:
-        return
+        return None, []
 
     font_size = elem.get("font_size", 24)
     font_weight = elem.get("font_weight", "normal")
-    color = elem.get("color", "#333333")
     align = elem.get("align", "left")
     x = elem.get("x", 60)
     y = elem.get("y", 0)
     max_width = elem.get("max_width", canvas_width - 120)
+    wrap_mode = elem.get("wrap", "word")
 
     font = get_font(font_size, font_weight)
-    lines = wrap_text(content, font, max_width, draw)
+    lines = wrap_text(content, font, max_width, draw, wrap_mode)
 
     line_height = int(font_size * 1.5)
 
+    placed = []
     for i, line in enumerate(lines):
         line_y = y + i * line_height
-        bbox = draw.textbbox((0, 0), line, font=font)
-        text_width = bbox[2] - bbox[0]
+        line_width = text_width(draw, line, font)
 
         if align == "center":
-            line_x = x - text_width // 2
+            line_x = x - line_width // 2
         elif align == "right":
-            line_x = x - text_width
+            line_x = x - line_width
         else:
             line_x = x
 
+        placed.append((line, line_x, line_y, line_width))
+    return font, placed
+
+
+def draw_text_element(draw, elem, canvas_width):
+    """텍스트 요소 렌더링"""
+    font, placed = layout_text(draw, elem, canvas_width)
+    color = elem.get("color", "#333333")
+    for line, line_x, line_y, _ in placed:
         draw.text((line_x, line_y), line, fill=color, font=font)
 
 
@@ -235,30 +588,54 @@ def draw_line(draw, elem):
     draw.line([(x1, y1), (x2, y2)], fill=color, width=width)
 
 
-def draw_badge(draw, elem):
-    """배지 요소 렌더링"""
+def layout_badge(draw, elem):
+    """배지 배치: (폰트, 줄 목록, 행간, 배경 박스 [x0, y0, x1, y1])"""
     content = clean_emoji(elem.get("content", ""))
     if not content:
-        return
+        return None, [], 0, None
 
     x = elem.get("x", 0)
     y = elem.get("y", 0)
-    bg_color = elem.get("bg_color", "#FF4444")
-    text_color = elem.get("text_color", "#FFFFFF")
     font_size = elem.get("font_size", 20)
     padding = elem.get("padding", 12)
 
+    max_width = elem.get("max_width")
+    wrap_mode = elem.get("wrap", "word")
+
     font = get_font(font_size, "bold")
-    bbox = draw.textbbox((0, 0), content, font=font)
-    text_w = bbox[2] - bbox[0]
-    text_h = bbox[3] - bbox[1]
-
-    draw.rounded_rectangle(
-        [x, y, x + text_w + padding * 2, y + text_h + padding * 2],
-        radius=8,
-        fill=bg_color,
-    )
-    draw.text((x + padding, y + padding), content, fill=text_color, font=font)
+    lines = wrap_text(content, font, max_width, draw, wrap_mode)
+    # 여러 줄 배지: 본문 텍스트와 같은 1.5배 행간
+    line_height = int(font_size * 1.5)
+    if len(lines) == 1:
+        lines = [content]
+        bbox = draw.textbbox((0, 0), content, font=font)
+        text_w = bbox[2] - bbox[0]
+        text_h = bbox[3] - bbox[1]
+    else:
+        last = draw.textbbox((0, 0), lines[-1], font=font)
+        text_w = max(text_width(draw, line, font) for line in lines)
+        text_h = line_height * (len(lines) - 1) + last[3] - last[1]
+
+    box = [x, y, x + text_w + padding * 2, y + text_h + padding * 2]
+    return font, lines, line_height, box
+
+
+def draw_badge(draw, elem):
+    """배지 요소 렌더링"""
+    font, lines, line_height, box = layout_badge(draw, elem)
+    if not lines:
+        return
+
+    bg_color = elem.get("bg_color", "#FF4444")
+    text_color = elem.get("text_color", "#FFFFFF")
+    padding = elem.get("padding", 12)
+
+    draw.rounded_rectangle(box, radius=elem.get("radius", 8), fill=bg_color)
+    for i, line in enumerate(lines):
+        draw.text(
+            (box[0] + padding, box[1] + padding + i * line_height),
+            line, fill=text_color, font=font,
+        )
 
 
 def draw_circle(draw, elem):
@@ -268,11 +645,13 @@ def draw_circle(draw, elem):
     radius = elem.get("radius", 25)
     fill = elem.get("fill", None)
     outline = elem.get("outline", None)
+    outline_width = elem.get("outline_width", 1)
 
     draw.ellipse(
         [cx - radius, cy - radius, cx + radius, cy + radius],
         fill=fill,
         outline=outline,
+        width=outline_width,
     )
 
 
@@ -285,15 +664,18 @@ def draw_icon_text(draw, elem, canvas_width):
     font_size = elem.get("font_size", 24)
     color = elem.get("color", "#333333")
     accent = elem.get("accent_color", "#2ECC71")
+    # 원 여백(pad)과 원-라벨 간격(gap), 출력 프로필에서 함께 조정됨
+    pad = elem.get("pad", 4)
+    gap = elem.get("gap", 12)
 
     font = get_font(font_size)
     bold_font = get_font(font_size, "bold")
 
     # 아이콘을 accent 색상 원으로 대체
     if icon:
-        circle_r = font_size // 2 + 4
+        circle_r = font_size // 2 + pad
         draw.ellipse(
-            [x, y - 2, x + circle_r * 2, y + circle_r * 2 - 2],
+            [x, y - pad // 2, x + circle_r * 2, y + circle_r * 2 - pad // 2],
             fill=accent,
         )
         # 아이콘 심볼을 원 안에 흰색으로
@@ -302,14 +684,38 @@ def draw_icon_text(draw, elem, canvas_width):
         iw = bbox[2] - bbox[0]
         ih = bbox[3] - bbox[1]
         draw.text(
-            (x + circle_r - iw // 2, y + circle_r - ih // 2 - 2),
+            (x + circle_r - iw // 2, y + circle_r - ih // 2 - pad // 2),
             icon, fill="#FFFFFF", font=icon_font,
         )
-        draw.text((x + circle_r * 2 + 12, y + 4), label, fill=color, font=font)
+        draw.text((x + circle_r * 2 + gap, y + pad), label, fill=color, font=font)
     else:
         draw.text((x, y), label, fill=color, font=font)
 
 
+# 사진 축소 프리셋 (--resample speed|quality)
+# - draft_margin: JPEG draft 디코딩 시 목표 크기 대비 남겨둘 해상도 배수
+# - reducing_gap: 정수 reduce() 후 최종 리샘플에 남길 배수 (작을수록 빠름)
+RESAMPLE_PRESETS = {
+    "quality": {"draft_margin": 1.5, "reducing_gap": 3.0, "resample": Image.LANCZOS},
+    "speed": {"draft_margin": 1.0, "reducing_gap": 1.0, "resample": Image.BILINEAR},
+}
+RESAMPLE_MODE = "quality"
+
+# 디코딩한 픽셀 vs 출력한 픽셀 (메가픽셀)
+SCALE_STATS = {"decoded_mpx": 0.0, "emitted_mpx": 0.0}
+
+# PNG 저장 프리셋 (--png-preset). default는 Pillow 기본값과 같은 결과
+PNG_PRESETS = {
+    "preview": {"compress_level": 1},
+    "default": {"compress_level": 6},
+    "publish": {"compress_level": 9, "optimize": True},
+}
+PNG_PRESET = "default"
+
+# 단계별 누적 시간 (초): 그리기 / PNG 인코딩 / 파일 쓰기
+TIMINGS = {"draw": 0.0, "encode": 0.0, "write": 0.0}
+
+
 def load_photo(path):
     """사진 로드 (RGBA 변환)"""
     if path.exists():
@@ -317,104 +723,352 @@ def load_photo(path):
     return None
 
 
-def fit_photo(photo, target_w, target_h):
-    """사진을 target 크기에 맞게 crop+resize (비율 유지, 꽉 채움)"""
-    pw, ph = photo.size
+def cover_box(photo_w, photo_h, target_w, target_h):
+    """target 비율로 꽉 채울 때 잘라낼 중앙 영역 (photo 좌표)"""
     target_ratio = target_w / target_h
-    photo_ratio = pw / ph
+    photo_ratio = photo_w / photo_h
 
     if photo_ratio > target_ratio:
         # 사진이 더 넓음 → 높이 맞추고 좌우 크롭
-        new_h = ph
-        new_w = int(ph * target_ratio)
-        left = (pw - new_w) // 2
-        photo = photo.crop((left, 0, left + new_w, new_h))
-    else:
-        # 사진이 더 높음 → 폭 맞추고 상하 크롭
-        new_w = pw
-        new_h = int(pw / target_ratio)
-        top = (ph - new_h) // 2
-        photo = photo.crop((0, top, new_w, top + new_h))
-
-    return photo.resize((target_w, target_h), Image.LANCZOS)
-
-
-def paste_product_photo(img, section_id, canvas_width, canvas_height):
-    """제품 사진을 해당 섹션에 삽입"""
-    product = load_photo(PRODUCT_PHOTO)
-    scene = load_photo(PHOTO_SCENE)
-    lifestyle = load_photo(PHOTO_LIFESTYLE)
-
-    nature = load_photo(PHOTO_NATURE)
-    person = load_photo(OUTPUT_DIR / "photo_person_chair.jpg")
-    family = load_photo(OUTPUT_DIR / "photo_family.jpg")
-    setup = load_photo(OUTPUT_DIR / "photo_setup.jpg")
-
-    if section_id == "01_hero" and product:
-        # 히어로: 우측 40%에 제품 사진
-        target_h = int(canvas_height * 0.8)
-        ratio = target_h / product.height
-        target_w = int(product.width * ratio)
-        if target_w > canvas_width * 0.4:
-            target_w = int(canvas_width * 0.4)
-            ratio = target_w / product.width
-            target_h = int(product.height * ratio)
-        resized = product.resize((target_w, target_h), Image.LANCZOS)
-        x = canvas_width - target_w - 20
-        y = (canvas_height - target_h) // 2
-        img.paste(resized, (x, y), resized)
-
-    elif section_id == "02_photo_banner" and person:
-        # 사진 배너: 풀폭 사진 + 다크 오버레이
-        resized = fit_photo(person, canvas_width, canvas_height)
-        overlay = Image.new("RGBA", (canvas_width, canvas_height), (0, 0, 0, 130))
-        resized = Image.alpha_composite(resized, overlay)
-        img.paste(resized, (0, 0), resized)
+        new_w = int(photo_h * target_ratio)
+        left = (photo_w - new_w) // 2
+        return (left, 0, left + new_w, photo_h)
+
+    # 사진이 더 높음 → 폭 맞추고 상하 크롭
+    new_h = int(photo_w / target_ratio)
+    top = (photo_h - new_h) // 2
+    return (0, top, photo_w, top + new_h)
+
+
+def resample_photo(photo, size, box=None, mode=None):
+    """photo의 box 영역을 size로 축소
+
+    crop 사본을 만들지 않고 box 영역만 정수 reduce()로 줄인 뒤,
+    남은 배율만 프리셋의 리샘플 필터로 처리합니다.
+    """
+    preset = RESAMPLE_PRESETS[mode or RESAMPLE_MODE]
+    target_w, target_h = size
+    if box is None:
+        box = (0, 0, photo.width, photo.height)
+    box_w = box[2] - box[0]
+    box_h = box[3] - box[1]
+
+    factor = int(min(box_w / target_w, box_h / target_h) / preset["reducing_gap"])
+    SCALE_STATS["emitted_mpx"] += target_w * target_h / 1_000_000
+    with TRACE.span("photo_resample", "photo"):
+        if factor >= 2:
+            photo = photo.reduce(factor, box=box)
+            box = None
+        return photo.resize(size, preset["resample"], box=box)
 
-    elif section_id == "03_key_numbers" and scene:
-        # 핵심 숫자: 배경에 살짝 씬 사진
-        resized = fit_photo(scene, canvas_width, canvas_height)
-        overlay = Image.new("RGBA", (canvas_width, canvas_height), (255, 255, 255, 235))
-        resized = Image.alpha_composite(resized, overlay)
-        img.paste(resized, (0, 0), resized)
 
-    elif section_id == "04_pain_solution" and product:
-        # 고민/해결: 좌측 45%에 제품 사진
-        target_h = int(canvas_height * 0.7)
-        ratio = target_h / product.height
-        target_w = int(product.width * ratio)
-        if target_w > canvas_width * 0.42:
-            target_w = int(canvas_width * 0.42)
-            ratio = target_w / product.width
-            target_h = int(product.height * ratio)
-        resized = product.resize((target_w, target_h), Image.LANCZOS)
-        x = 30
-        y = (canvas_height - target_h) // 2 + 20
-        img.paste(resized, (x, y), resized)
-
-    elif section_id == "07_photo_lifestyle" and family:
-        # 라이프스타일: 풀폭 사진 + 오버레이
-        resized = fit_photo(family, canvas_width, canvas_height)
-        overlay = Image.new("RGBA", (canvas_width, canvas_height), (0, 0, 0, 110))
-        resized = Image.alpha_composite(resized, overlay)
-        img.paste(resized, (0, 0), resized)
+def fit_photo(photo, target_w, target_h):
+    """사진을 target 크기에 맞게 crop+resize (비율 유지, 꽉 채움)"""
+    box = cover_box(photo.width, photo.height, target_w, target_h)
+    return resample_photo(photo, (target_w, target_h), box)
+
 
-    elif section_id == "09_reviews" and nature:
-        # 후기: 자연 배경 + 강한 오버레이
-        resized = fit_photo(nature, canvas_width, canvas_height)
-        overlay = Image.new("RGBA", (canvas_width, canvas_height), (255, 255, 255, 210))
-        resized = Image.alpha_composite(resized, overlay)
+class PhotoRegistry:
+    """사진을 필요할 때 한 번만 디코딩해 실행 동안 보관하는 레지스트리
+
+    파일의 mtime/size가 바뀌면 다음 요청 때 다시 디코딩합니다.
+    JPEG는 필요한 해상도에 맞춰 draft(1/2~1/8 DCT 스케일)로 디코딩하고,
+    축척별 결과를 따로 보관합니다. 요청마다 같은 draft 크기의 디코딩만
+    재사용하므로, 축소 결과는 앞서 렌더링한 섹션/프로필과 관계없이 같습니다
+    (섹션 해시로 PNG를 재사용하는 증분 렌더링의 전제).
+    """
+
+    def __init__(self, base_dir):
+        self.base_dir = Path(base_dir)
+        self._photos = {}
+        self._sizes = {}
+        self.decodes = 0
+
+    def path(self, slot):
+        """슬롯 이름(product, scene ...) 또는 파일명 → 경로"""
+        return self.base_dir / PHOTO_SLOTS.get(slot, slot)
+
+    def _version(self, path):
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def source_size(self, slot):
+        """원본 크기 (헤더만 읽음, 파일이 없으면 None)"""
+        path = self.path(slot)
+        version = self._version(path)
+        if version is None:
+            return None
+        cached = self._sizes.get(path)
+        if cached and cached[0] == version:
+            return cached[1]
+        with Image.open(path) as im:
+            size = im.size
+        self._sizes[path] = (version, size)
+        return size
+
+    def get(self, slot, scale=1.0):
+        """슬롯의 RGBA 사진 (파일이 없으면 None)
+
+        scale은 필요한 최소 축척(원본 대비)입니다. JPEG는 그 이상을
+        보장하는 가장 작은 draft 크기로 디코딩합니다.
+        """
+        path = self.path(slot)
+        version = self._version(path)
+        if version is None:
+            self._photos = {k: v for k, v in self._photos.items() if k[0] != path}
+            return None
+
+        im = Image.open(path)
+        if im.format == "JPEG" and scale < 1.0:
+            im.draft("RGB", (max(1, math.ceil(im.width * scale)),
+                             max(1, math.ceil(im.height * scale))))
+
+        # 같은 파일을 같은 draft 크기로 이미 디코딩했다면 재사용
+        cached = self._photos.get((path, im.size))
+        if cached and cached[0] == version:
+            im.close()
+            return cached[1]
+
+        with im, TRACE.span("photo_decode", "photo", {"file": path.name}):
+            photo = im.convert("RGBA")
+        self.decodes += 1
+        SCALE_STATS["decoded_mpx"] += photo.width * photo.height / 1_000_000
+        self._photos = {
+            key: value for key, value in self._photos.items()
+            if key[0] != path or value[0] == version
+        }
+        self._photos[(path, photo.size)] = (version, photo)
+        return photo
+
+    def scaled(self, slot, size, box=None, mode=None):
+        """원본 좌표 box 영역을 size로 축소한 RGBA 사진"""
+        source = self.source_size(slot)
+        if source is None:
+            return None
+        if box is None:
+            box = (0, 0, source[0], source[1])
+
+        preset = RESAMPLE_PRESETS[mode or RESAMPLE_MODE]
+        scale = max(size[0] / (box[2] - box[0]), size[1] / (box[3] - box[1]))
+        photo = self.get(slot, min(1.0, scale * preset["draft_margin"]))
+
+        # draft로 줄어든 만큼 box 좌표 환산
+        scaled_box = box
+        if photo.size != source:
+            sx = photo.width / source[0]
+            sy = photo.height / source[1]
+            scaled_box = (round(box[0] * sx), round(box[1] * sy),
+                          round(box[2] * sx), round(box[3] * sy))
+        return resample_photo(photo, size, scaled_box, mode)
+
+    def clear(self):
+        self._photos.clear()
+        self._sizes.clear()
+
+
+PHOTOS = PhotoRegistry(OUTPUT_DIR)
+
+
+class LayerCache:
+    """사진 + 오버레이를 합성한 cover 배경 레이어의 메모리/디스크 캐시
+
+    키는 사진 파일 내용 해시, 캔버스 크기, 오버레이 색, 리샘플 방식,
+    렌더러 버전으로 만듭니다 (content-addressed). 문구만 바뀐 재렌더링은
+    사진 디코딩/축소/합성 없이 저장된 레이어를 씁니다. 메모리에는 최근
+    max_items개를, 디스크에는 max_bytes까지 PNG로 보관합니다.
+    """
+
+    def __init__(self, directory, max_items=LAYER_CACHE_ITEMS,
+                 max_bytes=LAYER_CACHE_MAX_BYTES, enabled=True):
+        self.directory = Path(directory)
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._memory = OrderedDict()
+        self._digests = {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _file_digest(self, path):
+        """파일 내용 sha256 (mtime/size가 같으면 다시 읽지 않음)"""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._digests.get(path)
+        if cached and cached[0] == version:
+            return cached[1]
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        self._digests[path] = (version, digest.hexdigest())
+        return digest.hexdigest()
+
+    def key(self, photo_path, *params):
+        """레이어 키 (캐시를 안 쓰거나 사진이 없으면 None)"""
+        if not self.enabled:
+            return None
+        digest = self._file_digest(Path(photo_path))
+        if digest is None:
+            return None
+        payload = json.dumps([digest, params, RENDERER_VERSION], default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        if key is None:
+            return None
+        layer = self._memory.get(key)
+        if layer is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return layer
+        path = self.directory / f"{key}.png"
+        try:
+            with Image.open(path) as im:
+                layer = im.convert("RGBA")
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.disk_hits += 1
+        self._remember(key, layer)
+        return layer
+
+    def put(self, key, layer):
+        if key is None:
+            return
+        self._remember(key, layer)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                layer.save(f, format="PNG", compress_level=1)
+            os.replace(tmp_path, self.directory / f"{key}.png")
+            self._prune()
+        except OSError:
+            pass  # 디스크 캐시는 최선 노력 (메모리 캐시는 유지)
+
+    def _remember(self, key, layer):
+        self._memory[key] = layer
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def _prune(self):
+        """디스크 용량이 max_bytes를 넘으면 오래된 레이어부터 삭제"""
+        files = []
+        for path in self.directory.glob("*.png"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self):
+        self._memory.clear()
+        for path in self.directory.glob("*.png"):
+            path.unlink(missing_ok=True)
+
+
+LAYERS = LayerCache(LAYER_CACHE_DIR, enabled=LAYER_CACHE_ENABLED)
+
+
+def photo_spec(section_data):
+    """섹션의 사진 배치 스펙 (없으면 None)
+
+    render_data.json 섹션의 "photo" 값이 section_id 기본값(SECTION_PHOTOS)을
+    덮어씁니다. 문자열은 슬롯 이름으로, null은 사진 없음으로 처리합니다.
+    """
+    section_id = section_data.get("id", "")
+    default = SECTION_PHOTOS.get(section_id)
+    if "photo" not in section_data:
+        return default
+
+    spec = section_data["photo"]
+    if not spec:
+        return None
+    if isinstance(spec, str):
+        spec = {"slot": spec}
+    return {"layout": "cover", **(default or {}), **spec}
+
+
+def _overlay_color(value):
+    """[r, g, b, a] 리스트 또는 "#RRGGBBAA" 문자열"""
+    if isinstance(value, (list, tuple)):
+        return tuple(value)
+    return value
+
+
+def side_photo_box(spec, source, canvas_width, canvas_height):
+    """side 배치 사진의 (x, y, 폭, 높이)
+
+    비율 유지하며 캔버스 높이 기준으로 축소, 폭 제한 시 폭 기준으로 재계산
+    """
+    photo_w, photo_h = source
+    target_h = int(canvas_height * spec.get("height_ratio", 0.7))
+    ratio = target_h / photo_h
+    target_w = int(photo_w * ratio)
+    max_width_ratio = spec.get("max_width_ratio")
+    if max_width_ratio and target_w > canvas_width * max_width_ratio:
+        target_w = int(canvas_width * max_width_ratio)
+        ratio = target_w / photo_w
+        target_h = int(photo_h * ratio)
+
+    margin = spec.get("margin", 20)
+    if spec.get("align", "right") == "left":
+        x = margin
+    else:
+        x = canvas_width - target_w - margin
+    y = (canvas_height - target_h) // 2 + spec.get("offset_y", 0)
+    return x, y, target_w, target_h
+
+
+def paste_product_photo(img, section_id, canvas_width, canvas_height, spec=None):
+    """제품 사진을 해당 섹션에 삽입
+
+    spec을 생략하면 section_id 기본 배치(SECTION_PHOTOS)를 사용합니다.
+    - cover: 풀폭 사진 crop+resize, overlay 색상으로 덮음
+    - side: height_ratio 높이로 좌/우(align)에 배치, max_width_ratio로 폭 제한
+    """
+    if spec is None:
+        spec = SECTION_PHOTOS.get(section_id)
+    if not spec:
+        return img
+
+    slot = spec.get("slot", "product")
+    source = PHOTOS.source_size(slot)
+    if not source:
+        return img
+
+    if spec.get("layout", "cover") == "cover":
+        overlay = spec.get("overlay")
+        key = LAYERS.key(PHOTOS.path(slot), canvas_width, canvas_height,
+                         overlay and _overlay_color(overlay), RESAMPLE_MODE)
+        resized = LAYERS.get(key)
+        if resized is None:
+            box = cover_box(source[0], source[1], canvas_width, canvas_height)
+            resized = PHOTOS.scaled(slot, (canvas_width, canvas_height), box)
+            if overlay:
+                layer = Image.new("RGBA", (canvas_width, canvas_height), _overlay_color(overlay))
+                resized = Image.alpha_composite(resized, layer)
+            LAYERS.put(key, resized)
         img.paste(resized, (0, 0), resized)
+        return img
 
-    elif section_id == "10_cta" and product:
-        # CTA: 우측에 제품
-        target_h = int(canvas_height * 0.65)
-        ratio = target_h / product.height
-        target_w = int(product.width * ratio)
-        resized = product.resize((target_w, target_h), Image.LANCZOS)
-        x = canvas_width - target_w - 30
-        y = (canvas_height - target_h) // 2
-        img.paste(resized, (x, y), resized)
+    x, y, target_w, target_h = side_photo_box(spec, source, canvas_width, canvas_height)
+    resized = PHOTOS.scaled(slot, (target_w, target_h))
+    img.paste(resized, (x, y), resized)
 
     return img
 
@@ -427,35 +1081,41 @@ def render_section(section_data):
     bg_color = section_data.get("background", "#FFFFFF")
     section_id = section_data.get("id", "")
 
-    # RGBA 캔버스 (사진 합성 위해)
-    img = Image.new("RGBA", (width, height), bg_color)
-
-    # 1단계: 사진을 먼저 삽입 (텍스트 뒤에 깔림)
-    img = paste_product_photo(img, section_id, width, height)
-
-    # 2단계: 요소를 사진 위에 렌더링
-    draw = ImageDraw.Draw(img)
-    elements = section_data.get("elements", [])
-    for elem in elements:
-        elem_type = elem.get("type", "")
-
-        if elem_type == "text":
-            draw_text_element(draw, elem, width)
-        elif elem_type == "rectangle":
-            draw_rectangle(draw, elem)
-        elif elem_type == "line":
-            draw_line(draw, elem)
-        elif elem_type == "badge":
-            draw_badge(draw, elem)
-        elif elem_type == "circle":
-            draw_circle(draw, elem)
-        elif elem_type == "icon_text":
-            draw_icon_text(draw, elem, width)
-        else:
-            print(f"  [SKIP] 알 수 없는 요소 타입: {elem_type}")
-
-    # RGB로 변환
-    return img.convert("RGB")
+    with TRACE.span(section_id or "section", "section"):
+        # RGBA 캔버스 (사진 합성 위해)
+        img = Image.new("RGBA", (width, height), bg_color)
+
+        # 1단계: 사진을 먼저 삽입 (텍스트 뒤에 깔림)
+        spec = photo_spec(section_data)
+        if spec:
+            with TRACE.span("photo_paste", "photo", {"layout": spec.get("layout", "cover")}):
+                img = paste_product_photo(img, section_id, width, height, spec)
+
+        # 2단계: 요소를 사진 위에 렌더링
+        draw = ImageDraw.Draw(img)
+        elements = section_data.get("elements", [])
+        for elem in elements:
+            elem_type = elem.get("type", "")
+
+            with TRACE.span(elem_type, "element"):
+                if elem_type == "text":
+                    draw_text_element(draw, elem, width)
+                elif elem_type == "rectangle":
+                    draw_rectangle(draw, elem)
+                elif elem_type == "line":
+                    draw_line(draw, elem)
+                elif elem_type == "badge":
+                    draw_badge(draw, elem)
+                elif elem_type == "circle":
+                    draw_circle(draw, elem)
+                elif elem_type == "icon_text":
+                    draw_icon_text(draw, elem, width)
+                else:
+                    print(f"  [SKIP] 알 수 없는 요소 타입: {elem_type}")
+
+        # RGB로 변환
+        with TRACE.span("to_rgb", "image"):
+            return img.convert("RGB")
 
 
 def merge_sections(section_images):
@@ -478,58 +1138,723 @@ def merge_sections(section_images):
     return merged
 
 
-def main():
-    if not RENDER_DATA.exists():
-        print(f"ERROR: {RENDER_DATA} 파일이 없습니다.")
-        sys.exit(1)
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _png_chunk(kind, data):
+    """PNG 청크 (length + type + data + CRC)"""
+    return (struct.pack(">I", len(data)) + kind + data
+            + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+
+def _filtered_scanlines(band):
+    """RGB band → PNG 필터가 적용된 스캔라인 바이트
+
+    한 행 아래로 민 band를 빼서(ImageChops.subtract_modulo) Up 필터(2)를
+    직접 만듭니다. 첫 행은 이전 band의 행을 참조하지 않도록 필터 없음(0)으로
+    두며, 위 행을 0으로 보고 뺀 값이라 원래 픽셀과 같습니다.
+    """
+    width, height = band.size
+    above = Image.new("RGB", band.size)
+    above.paste(band.crop((0, 0, width, height - 1)), (0, 1))
+    data = ImageChops.subtract_modulo(band, above).tobytes()
+    stride = width * 3
+    return b"".join(
+        (b"\x02" if start else b"\x00") + data[start:start + stride]
+        for start in range(0, len(data), stride)
+    )
+
+
+class StreamingPNG:
+    """행 band 단위로 이어 쓰는 RGB PNG 파일
+
+    압축된 IDAT 데이터는 임시 파일에 쌓고, close()에서 높이가 확정되면
+    헤더와 함께 최종 파일로 씁니다. 메모리에는 band 하나만 올라갑니다.
+    """
+
+    def __init__(self, path, width, compress_level=6):
+        self.path = Path(path)
+        self.width = width
+        self.height = 0
+        self._compressor = zlib.compressobj(compress_level)
+        self._idat = tempfile.TemporaryFile(dir=self.path.parent)
+
+    def write(self, band):
+        """폭이 self.width인 RGB band를 이어 붙임"""
+        self._idat.write(self._compressor.compress(_filtered_scanlines(band)))
+        self.height += band.height
+
+    def close(self):
+        """파일 완성 (쓴 행이 없으면 파일을 만들지 않고 False)"""
+        with self._idat:
+            if not self.height:
+                return False
+            self._idat.write(self._compressor.flush())
+            self._idat.seek(0)
+            header = struct.pack(">IIBBBBB", self.width, self.height, 8, 2, 0, 0, 0)
+            with open(self.path, "wb") as f:
+                f.write(PNG_SIGNATURE + _png_chunk(b"IHDR", header))
+                for data in iter(lambda: self._idat.read(1 << 20), b""):
+                    f.write(_png_chunk(b"IDAT", data))
+                f.write(_png_chunk(b"IEND", b""))
+        return True
+
+
+class MergedPageWriter:
+    """섹션 이미지를 받는 즉시 통합 이미지(와 분할 이미지)에 스트리밍으로 씀
+
+    merge_sections와 같은 결과(폭이 좁은 섹션은 흰 배경에 중앙 정렬)를
+    전체 캔버스 없이 만들어 냅니다. slice_height를 주면 같은 패스에서
+    최대 slice_height px 높이의 분할 파일도 함께 씁니다. 작업은 전용
+    스레드 하나에서 순서대로 처리되며, 처리 대기 중인 섹션이 max_pending개를
+    넘으면 append가 기다리므로 메모리에 쌓이는 섹션 이미지 수가 제한됩니다.
+    """
+
+    def __init__(self, path, width, slice_height=None, slice_pattern=None,
+                 compress_level=6, band_height=256, max_pending=2):
+        self.path = Path(path)
+        self.width = width
+        self.slice_height = slice_height
+        self.slice_pattern = slice_pattern or (self.path.stem + "_{:02d}.png")
+        self.compress_level = compress_level
+        self.band_height = band_height
+        self.slices = []
+        self._page = StreamingPNG(self.path, width, compress_level)
+        self._slice = None
+        self._pool = ThreadPoolExecutor(max_workers=1)
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._futures = []
+
+    def append(self, img):
+        """섹션 이미지를 아래에 이어 붙임 (백그라운드 처리, 대기열이 차면 기다림)"""
+        self._slots.acquire()
+        future = self._pool.submit(self._append, img)
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures.append(future)
+
+    def _append(self, img):
+        if img.width != self.width:
+            # 폭이 다른 경우 중앙 정렬
+            row = Image.new("RGB", (self.width, img.height), "#FFFFFF")
+            row.paste(img, ((self.width - img.width) // 2, 0))
+            img = row
+
+        with TRACE.span("page_append", "encode"):
+            for top in range(0, img.height, self.band_height):
+                band = img.crop((0, top, self.width, min(top + self.band_height, img.height)))
+                self._page.write(band)
+                if self.slice_height:
+                    self._write_slices(band)
+
+    def _write_slices(self, band):
+        top = 0
+        while top < band.height:
+            if self._slice is None or self._slice.height >= self.slice_height:
+                self._close_slice()
+                name = self.slice_pattern.format(len(self.slices) + 1)
+                self._slice = StreamingPNG(self.path.parent / name, self.width,
+                                           self.compress_level)
+            rows = min(band.height - top, self.slice_height - self._slice.height)
+            self._slice.write(band.crop((0, top, self.width, top + rows)))
+            top += rows
+
+    def _close_slice(self):
+        if self._slice and self._slice.close():
+            self.slices.append((self._slice.path, self._slice.height))
+        self._slice = None
+
+    def close(self):
+        """남은 band를 모두 쓰고 파일 완성 → 통합 이미지 높이 (행이 없으면 0)"""
+        try:
+            for future in self._futures:
+                future.result()
+            self._close_slice()
+            return self._page.height if self._page.close() else 0
+        finally:
+            self._pool.shutdown()
+
+
+def encode_png(img, preset=None):
+    """PNG 인코딩 → bytes (프리셋의 compress_level/optimize 적용)"""
+    buffer = io.BytesIO()
+    with TRACE.span("png_encode", "encode"):
+        img.save(buffer, "PNG", **PNG_PRESETS[preset or PNG_PRESET])
+    return buffer.getvalue()
+
+
+class PNGWriter:
+    """PNG 인코딩과 파일 쓰기를 백그라운드 스레드에서 처리
+
+    zlib 인코딩과 디스크 쓰기는 GIL을 놓기 때문에 다음 섹션 렌더링과
+    겹쳐서 실행됩니다. 대기 작업이 max_pending개를 넘으면 submit이
+    기다리므로 메모리에 쌓이는 이미지 수가 제한됩니다.
+    """
+
+    def __init__(self, threads=2, max_pending=4, preset=None):
+        self.preset = preset or PNG_PRESET
+        self.errors = []
+        self._pool = ThreadPoolExecutor(max_workers=threads)
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._futures = []
+
+    def submit(self, path, img=None, data=None):
+        """img를 인코딩해서, 또는 이미 인코딩된 data를 path에 저장"""
+        self._slots.acquire()
+        future = self._pool.submit(self._write, Path(path), img, data)
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures.append(future)
+        return future
+
+    def _write(self, path, img, data):
+        try:
+            if data is None:
+                start = time.perf_counter()
+                data = encode_png(img, self.preset)
+                self._add("encode", time.perf_counter() - start)
+            start = time.perf_counter()
+            with TRACE.span("png_write", "io"):
+                path.write_bytes(data)
+            self._add("write", time.perf_counter() - start)
+        except Exception as e:
+            with self._lock:
+                self.errors.append((path, e))
+            raise
+
+    def _add(self, key, seconds):
+        with self._lock:
+            TIMINGS[key] += seconds
+
+    def close(self):
+        """남은 작업을 모두 끝내고 스레드 종료"""
+        wait(self._futures)
+        self._pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _file_version(path):
+    """해시용 파일 식별자 (경로 + mtime + 크기, 없으면 missing)"""
+    if not path:
+        return "none"
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return f"{path}:missing"
+    return f"{path}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def section_hash(section):
+    """섹션 출력에 영향을 주는 입력 전체의 해시
+
+    섹션 dict, 참조하는 사진 파일, 폰트 파일, 렌더러 버전과 사진 축소/PNG
+    프리셋을 포함합니다.
+    """
+    spec = photo_spec(section)
+    photo = PHOTOS.path(spec.get("slot", "product")) if spec else None
+    parts = [
+        RENDERER_VERSION,
+        json.dumps(section, ensure_ascii=False, sort_keys=True),
+        json.dumps(spec, sort_keys=True),
+        _file_version(photo),
+        _file_version(FONT_PATH),
+        RESAMPLE_MODE,
+        PNG_PRESET,
+    ]
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def readable_png(path):
+    """저장된 섹션 PNG가 있고 끝까지 읽히는지 (청크 CRC 검사, 픽셀 디코딩 없음)"""
+    try:
+        with Image.open(path) as im:
+            im.verify()
+        return True
+    except Exception:
+        return False
+
+
+def load_manifest(path=None):
+    """이전 렌더링 manifest (없거나 깨졌으면 빈 manifest)"""
+    path = Path(path or RENDER_MANIFEST)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {"sections": {}}
+    if manifest.get("renderer_version") != RENDERER_VERSION:
+        return {"sections": {}}
+    manifest.setdefault("sections", {})
+    return manifest
+
+
+def save_manifest(manifest, path=None):
+    """manifest 저장 (임시 파일에 쓴 뒤 교체)"""
+    path = Path(path or RENDER_MANIFEST)
+    manifest["renderer_version"] = RENDERER_VERSION
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+# --workers 모드에서 워커들이 보고한 폰트 캐시 카운터 합계
+WORKER_FONT_STATS = {"hits": 0, "misses": 0, "size": 0}
+
+
+def render_stats():
+    """현재 프로세스의 캐시/디코딩 카운터"""
+    fonts = font_cache_info()
+    return {
+        "photo_decodes": PHOTOS.decodes,
+        "layer_hits": LAYERS.hits,
+        "layer_disk_hits": LAYERS.disk_hits,
+        "layer_misses": LAYERS.misses,
+        "decoded_mpx": SCALE_STATS["decoded_mpx"],
+        "emitted_mpx": SCALE_STATS["emitted_mpx"],
+        "font_hits": fonts["hits"],
+        "font_misses": fonts["misses"],
+        "font_cached": fonts["size"],
+    }
+
+
+def _font_keys(sections):
+    """섹션들이 사용하는 (font_size, weight) 조합"""
+    keys = set()
+    for section in sections:
+        for elem in section.get("elements", []):
+            elem_type = elem.get("type", "")
+            if elem_type == "text":
+                keys.add((elem.get("font_size", 24), elem.get("font_weight", "normal")))
+            elif elem_type == "badge":
+                keys.add((elem.get("font_size", 20), "bold"))
+            elif elem_type == "icon_text":
+                size = elem.get("font_size", 24)
+                keys.update({(size, "normal"), (size, "bold"), (size - 4, "bold")})
+    return keys
+
+
+def _init_worker(font_path, photo_dir, resample_mode, png_preset, font_keys, photo_slots,
+                 trace=False):
+    """워커 프로세스 초기화: 부모 설정을 맞추고 폰트/사진 헤더를 미리 로드"""
+    global FONT_PATH, PHOTOS, RESAMPLE_MODE, PNG_PRESET
+
+    FONT_PATH = font_path
+    PHOTOS = PhotoRegistry(photo_dir)
+    RESAMPLE_MODE = resample_mode
+    PNG_PRESET = png_preset
+    TRACE.clear()
+    if trace:
+        TRACE.enable()
+    for size, weight in font_keys:
+        get_font(size, weight)
+    for slot in photo_slots:
+        PHOTOS.source_size(slot)
+
+
+def _render_worker(section):
+    """워커에서 섹션 렌더링 → (PNG 바이트, 워커 pid, 워커 카운터, 소요 시간, 계측 구간)"""
+    start = time.perf_counter()
+    img = render_section(section)
+    drawn = time.perf_counter()
+    png = encode_png(img)
+    timings = {"draw": drawn - start, "encode": time.perf_counter() - drawn}
+    return png, os.getpid(), render_stats(), timings, TRACE.drain()
+
+
+def iter_rendered_sections(sections, workers=1):
+    """섹션을 입력 순서대로 렌더링해 (section, img, png, error) 생성
+
+    workers > 1이면 프로세스 풀에서 렌더링/PNG 인코딩을 하고 PNG 바이트를
+    돌려받습니다 (serial 모드에서는 png가 None). 실패한 섹션은 error에
+    예외가 담기며, 결과 순서는 항상 sections 순서와 같습니다.
+    """
+    if workers <= 1:
+        for section in sections:
+            start = time.perf_counter()
+            try:
+                img = render_section(section)
+            except Exception as e:
+                yield section, None, None, e
+                continue
+            finally:
+                TIMINGS["draw"] += time.perf_counter() - start
+            yield section, img, None, None
+        return
+
+    photo_slots = {spec.get("slot", "product")
+                   for spec in map(photo_spec, sections) if spec}
+    initargs = (FONT_PATH, str(PHOTOS.base_dir), RESAMPLE_MODE, PNG_PRESET,
+                _font_keys(sections), photo_slots, TRACE.enabled)
+    worker_stats = {}
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=initargs) as pool:
+        futures = [pool.submit(_render_worker, section) for section in sections]
+        for section, future in zip(sections, futures):
+            try:
+                png, pid, stats, timings, events = future.result()
+                img = Image.open(io.BytesIO(png))
+                img.load()
+            except Exception as e:
+                yield section, None, None, e
+                continue
+            worker_stats[pid] = stats
+            for key, seconds in timings.items():
+                TIMINGS[key] += seconds
+            TRACE.extend(events)
+            yield section, img, png, None
+
+    # 워커 카운터를 부모 쪽 요약에 합산
+    for stats in worker_stats.values():
+        PHOTOS.decodes += stats["photo_decodes"]
+        LAYERS.hits += stats["layer_hits"]
+        LAYERS.disk_hits += stats["layer_disk_hits"]
+        LAYERS.misses += stats["layer_misses"]
+        SCALE_STATS["decoded_mpx"] += stats["decoded_mpx"]
+        SCALE_STATS["emitted_mpx"] += stats["emitted_mpx"]
+        WORKER_FONT_STATS["hits"] += stats["font_hits"]
+        WORKER_FONT_STATS["misses"] += stats["font_misses"]
+        WORKER_FONT_STATS["size"] += stats["font_cached"]
+
+
+# 출력 프로필: 이름 → 페이지 폭 (px)
+OUTPUT_PROFILES = {
+    "desktop": 1080,
+    "mobile": 860,
+    "retina": 2160,
+}
+
+# 프로필 배율로 함께 조정할 요소별 px 속성과 draw_* 함수의 기본값
+# (기본값이 None이면 값이 있을 때만 조정)
+SCALED_PROPERTIES = {
+    "text": {"x": 60, "y": 0, "font_size": 24},
+    "rectangle": {"x": 0, "y": 0, "width": 100, "height": 100,
+                  "radius": 0, "outline_width": 1},
+    "line": {"x1": 0, "y1": 0, "x2": 100, "y2": 0, "width": 1},
+    "badge": {"x": 0, "y": 0, "font_size": 20, "padding": 12,
+              "radius": 8, "max_width": None},
+    "circle": {"cx": 50, "cy": 50, "radius": 25, "outline_width": 1},
+    "icon_text": {"x": 60, "y": 0, "font_size": 24, "pad": 4, "gap": 12},
+}
+SCALED_PHOTO_PROPERTIES = {"margin": 20, "offset_y": 0}
+# 축소해도 1px 아래로 내려가면 안 되는 속성 (글자 크기, 선 굵기)
+MIN_ONE_PROPERTIES = {"font_size", "outline_width"}
+
+
+def _scale_properties(values, defaults, factor, min_one=()):
+    scaled = dict(values)
+    for key, default in defaults.items():
+        value = values.get(key, default)
+        if value is None:
+            continue
+        value = round(value * factor)
+        scaled[key] = max(1, value) if key in min_one else value
+    return scaled
 
-    with open(RENDER_DATA, "r", encoding="utf-8") as f:
-        data = json.load(f)
+
+def scale_section(section, factor):
+    """섹션 레이아웃을 factor배로 조정한 사본 (글자 크기, 좌표, 반경, 선 굵기, 사진 여백)"""
+    canvas = section.get("canvas", {"width": 1080, "height": 800})
+    width = canvas.get("width", 1080)
+    height = canvas.get("height", 800)
+
+    elements = []
+    for elem in section.get("elements", []):
+        elem_type = elem.get("type", "")
+        defaults = SCALED_PROPERTIES.get(elem_type)
+        if defaults is None:
+            elements.append(elem)
+            continue
+        # line의 width는 선 굵기 (0이 되면 안 됨)
+        min_one = MIN_ONE_PROPERTIES | ({"width"} if elem_type == "line" else set())
+        scaled = _scale_properties(elem, defaults, factor, min_one)
+        if elem_type == "text":
+            # 기본 max_width(캔버스 폭 - 120)는 원래 캔버스 기준으로 고정.
+            # None/0 이하는 wrap_text가 줄바꿈하지 않는 값이므로 그대로 둠
+            max_width = elem.get("max_width", width - 120)
+            if max_width and max_width > 0:
+                scaled["max_width"] = round(max_width * factor)
+        elements.append(scaled)
+
+    scaled_section = {
+        **section,
+        "canvas": {**canvas, "width": round(width * factor), "height": round(height * factor)},
+        "elements": elements,
+    }
+    spec = photo_spec(section)
+    if spec:
+        scaled_section["photo"] = _scale_properties(spec, SCALED_PHOTO_PROPERTIES, factor)
+    return scaled_section
+
+
+def scale_render_data(data, factor):
+    """render_data 전체를 factor배로 조정 (1이면 그대로 반환)"""
+    if factor == 1:
+        return data
+    return {**data, "sections": [scale_section(s, factor) for s in data.get("sections", [])]}
+
+
+def page_width_of(data):
+    """통합 이미지 폭 (선언된 캔버스 중 최대 폭)"""
+    return max(s.get("canvas", {}).get("width", 1080) for s in data.get("sections", []))
+
+
+def positive_int(value):
+    """argparse 타입: 1 이상의 정수"""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"1 이상의 정수여야 합니다: {value}")
+    return number
+
+
+def parse_profile(value):
+    """프로필 이름(OUTPUT_PROFILES) 또는 폭("860", "860px") → (이름, 폭)"""
+    if value in OUTPUT_PROFILES:
+        return value, OUTPUT_PROFILES[value]
+    digits = value[:-2] if value.endswith("px") else value
+    if not digits.isdigit() or int(digits) <= 0:
+        raise argparse.ArgumentTypeError(
+            f"알 수 없는 프로필: {value} (이름: {', '.join(OUTPUT_PROFILES)} 또는 폭 px)"
+        )
+    return f"{int(digits)}px", int(digits)
+
+
+def render_profiles(data, profiles, output_dir=None, **options):
+    """한 번 읽은 레이아웃을 여러 폭으로 조정해 프로필마다 렌더링
+
+    profiles는 (이름, 폭) 목록입니다. render_data와 폭이 같은 프로필은
+    output_dir에, 나머지는 output_dir/<이름>/에 저장합니다. 폰트 캐시와
+    디코딩한 사진(PhotoRegistry)을 프로필끼리 공유합니다. 사진은 프로필마다
+    원본 디코딩에서 축소하므로 각 프로필 결과는 그 폭으로 따로 렌더링한 것과 같습니다.
+    {이름: render_page 결과}를 반환합니다.
+    """
+    global PHOTOS
+
+    output_dir = Path(output_dir or OUTPUT_DIR)
+    if not data.get("sections"):
+        raise ValueError("render_data.json에 섹션 데이터가 없습니다.")
+    base_width = page_width_of(data)
+    if PHOTOS.base_dir != output_dir:
+        PHOTOS = PhotoRegistry(output_dir)
+
+    results = {}
+    timings = {}
+    for name, width in sorted(profiles, key=lambda profile: -profile[1]):
+        profile_dir = output_dir if width == base_width else output_dir / name
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        print(f"\n  [프로필 {name}] {width}px ({width / base_width:.3g}배) → {profile_dir}")
+        start = time.perf_counter()
+        results[name] = render_page(
+            scale_render_data(data, width / base_width), profile_dir,
+            photo_dir=output_dir, **options,
+        )
+        timings[name] = time.perf_counter() - start
+
+    print(f"{'='*50}")
+    print("  출력 프로필 요약")
+    for name, width in profiles:
+        result = results[name]
+        failed = f", 실패 {len(result['failed'])}개" if result["failed"] else ""
+        print(f"  {name:<10} {width:>5}px  {timings[name]:6.2f}초  "
+              f"파일 {len(result['generated'])}개{failed}")
+    print(f"  {'합계':<10} {'':>7}  {sum(timings.values()):6.2f}초 "
+          f"(사진 디코딩 {PHOTOS.decodes}회)")
+    print(f"{'='*50}\n")
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="render_data.json → 상세페이지 PNG")
+    parser.add_argument(
+        "--resample", choices=sorted(RESAMPLE_PRESETS), default=RESAMPLE_MODE,
+        help="사진 축소 방식: speed(draft+reduce+BILINEAR) / quality(기본, LANCZOS)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="섹션 병렬 렌더링 프로세스 수 (기본 1 = 순차)",
+    )
+    parser.add_argument(
+        "--png-preset", choices=list(PNG_PRESETS), default=PNG_PRESET,
+        help="PNG 압축: preview(빠름) / default / publish(최대 압축)",
+    )
+    parser.add_argument(
+        "--slice-height", type=positive_int, default=None,
+        help="통합 이미지를 최대 N px 높이로 나눈 detail_page_NN.png도 함께 저장",
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="변경 여부와 관계없이 모든 섹션을 다시 렌더링",
+    )
+    parser.add_argument(
+        "--encode-threads", type=int, default=2,
+        help="PNG 인코딩/저장 백그라운드 스레드 수",
+    )
+    parser.add_argument(
+        "--output-dir", type=Path, default=OUTPUT_DIR,
+        help=f"render_data.json과 사진이 있는 입출력 폴더 (기본: {OUTPUT_DIR})",
+    )
+    parser.add_argument(
+        "--profiles", nargs="+", type=parse_profile, default=None, metavar="PROFILE",
+        help=f"한 번의 레이아웃으로 여러 폭 출력: {' / '.join(f'{k}({v})' for k, v in OUTPUT_PROFILES.items())} "
+             "또는 폭 px (render_data와 폭이 같은 프로필은 출력 폴더, 나머지는 하위 폴더)",
+    )
+    parser.add_argument(
+        "--trace", type=Path, default=None, metavar="PATH",
+        help="섹션/요소 타입/사진/인코딩 구간을 계측해 Chrome trace JSON으로 저장하고 요약 표 출력",
+    )
+    return parser.parse_args(argv)
+
+
+def render_page(data, output_dir=None, workers=1, resample=None, png_preset=None,
+                slice_height=None, force=False, encode_threads=2, photo_dir=None):
+    """render_data dict → output_dir에 섹션 PNG + 통합 이미지
+
+    사진은 photo_dir(기본: output_dir)에서 읽습니다.
+    생성된 파일 경로와 실패한 섹션 파일명을 dict로 반환합니다.
+    """
+    global RESAMPLE_MODE, PNG_PRESET, PHOTOS
+
+    output_dir = Path(output_dir or OUTPUT_DIR)
+    photo_dir = Path(photo_dir or output_dir)
+    RESAMPLE_MODE = resample or RESAMPLE_MODE
+    PNG_PRESET = png_preset or PNG_PRESET
+    if PHOTOS.base_dir != photo_dir:
+        PHOTOS = PhotoRegistry(photo_dir)
+    for counters in (TIMINGS, SCALE_STATS, WORKER_FONT_STATS):
+        for key in counters:
+            counters[key] = 0
+    LAYERS.hits = LAYERS.disk_hits = LAYERS.misses = 0
 
     sections = data.get("sections", [])
     if not sections:
-        print("ERROR: render_data.json에 섹션 데이터가 없습니다.")
-        sys.exit(1)
+        raise ValueError("render_data.json에 섹션 데이터가 없습니다.")
 
-    photo_status = "있음" if PRODUCT_PHOTO.exists() else "없음"
+    photo_status = "있음" if PHOTOS.path("product").exists() else "없음"
 
     print(f"\n{'='*50}")
     print(f"  상세페이지 PNG 렌더링 시작")
     print(f"  섹션 수: {len(sections)}")
     print(f"  제품 사진: {photo_status}")
-    print(f"  출력 폴더: {OUTPUT_DIR}")
+    print(f"  출력 폴더: {output_dir}")
     print(f"{'='*50}\n")
 
-    section_images = []
     generated = []
+    failed = []
+    writer = PNGWriter(threads=encode_threads)
+
+    # 이전 실행과 입력이 같은 섹션은 건너뛰고 저장된 PNG를 재사용
+    manifest = {"sections": {}} if force else load_manifest(output_dir / "render_manifest.json")
+    previous = manifest["sections"]
+    hashes = [section_hash(section) for section in sections]
+    filenames = [
+        section.get("filename", f"{section.get('id', 'unknown')}.png")
+        for section in sections
+    ]
+    # 파일이 지워졌거나 잘렸거나 손상됐으면 다시 렌더링
+    unchanged = [
+        previous.get(filename) == digest and readable_png(output_dir / filename)
+        for filename, digest in zip(filenames, hashes)
+    ]
+    current = {}
+
+    # 통합 이미지 폭은 선언된 캔버스 중 최대 폭
+    page_width = page_width_of(data)
+    merged_path = output_dir / "detail_page_full.png"
+    page_key = hashlib.sha256(
+        json.dumps([hashes, page_width, slice_height]).encode("utf-8")
+    ).hexdigest()
+    slice_paths = [output_dir / name for name in manifest.get("slices", [])]
+    reuse_page = (
+        all(unchanged) and manifest.get("page") == page_key and merged_path.exists()
+        and all(path.exists() for path in slice_paths)
+    )
+    page = None
+    if not reuse_page:
+        page = MergedPageWriter(
+            merged_path, page_width,
+            slice_height=slice_height,
+            slice_pattern="detail_page_{:02d}.png",
+            compress_level=PNG_PRESETS[PNG_PRESET].get("compress_level", 6),
+        )
 
-    for section in sections:
-        section_id = section.get("id", "unknown")
-        filename = section.get("filename", f"{section_id}.png")
-        output_path = OUTPUT_DIR / filename
+    stale = [section for section, same in zip(sections, unchanged) if not same]
+    rendered = iter_rendered_sections(stale, workers)
 
-        print(f"  렌더링: {filename} ... ", end="")
+    for section, filename, digest, same in zip(sections, filenames, hashes, unchanged):
+        output_path = output_dir / filename
 
-        try:
-            img = render_section(section)
-            img.save(output_path, "PNG", quality=95)
-            print(f"OK ({img.width}x{img.height})")
+        print(f"  렌더링: {filename} ... ", end="", flush=True)
+
+        if same:
+            if page:
+                with Image.open(output_path) as cached:
+                    img = cached.convert("RGB")
+                page.append(img)
+            print("SKIP (변경 없음)")
+            current[filename] = digest
             generated.append(str(output_path))
-            section_images.append(img)
+            continue
+
+        _, img, png, error = next(rendered)
+        if error:
+            print(f"FAILED ({error})")
+            failed.append(filename)
+            continue
+        writer.submit(output_path, img=None if png else img, data=png)
+        if page:
+            page.append(img)
+        print(f"OK ({img.width}x{img.height})")
+        current[filename] = digest
+        generated.append(str(output_path))
+    # 제너레이터를 끝까지 소진해야 워커 카운터가 요약에 합산됨
+    next(rendered, None)
+
+    # 하나의 긴 이미지로 합치기 (섹션마다 이미 스트리밍으로 기록됨)
+    print(f"\n  합치기: detail_page_full.png ... ", end="")
+    if reuse_page:
+        print("SKIP (변경 없음)")
+        generated.append(str(merged_path))
+        generated.extend(str(path) for path in slice_paths)
+    else:
+        try:
+            merged_height = page.close()
+            if merged_height:
+                print(f"OK ({page_width}x{merged_height})")
+                generated.append(str(merged_path))
+            for slice_path, slice_height in page.slices:
+                print(f"  분할: {slice_path.name} ... OK ({page_width}x{slice_height})")
+                generated.append(str(slice_path))
+            manifest["page"] = page_key
+            manifest["slices"] = [path.name for path, _ in page.slices]
+            # 분할 설정이 바뀌어 이번에 쓰지 않은 이전 분할 파일 정리
+            written = {path.name for path, _ in page.slices}
+            for stale_slice in output_dir.glob("detail_page_[0-9][0-9]*.png"):
+                if stale_slice.name not in written:
+                    stale_slice.unlink(missing_ok=True)
         except Exception as e:
             print(f"FAILED ({e})")
+            manifest.pop("page", None)
 
-    # 하나의 긴 이미지로 합치기
-    print(f"\n  합치기: detail_page_full.png ... ", end="")
-    try:
-        merged = merge_sections(section_images)
-        if merged:
-            merged_path = OUTPUT_DIR / "detail_page_full.png"
-            merged.save(merged_path, "PNG", quality=95)
-            print(f"OK ({merged.width}x{merged.height})")
-            generated.append(str(merged_path))
-    except Exception as e:
-        print(f"FAILED ({e})")
+    writer.close()
+    for path, e in writer.errors:
+        print(f"  저장 실패: {path.name} ({e})")
+        generated.remove(str(path))
+        failed.append(path.name)
+        current.pop(path.name, None)
+
+    # 실패한 섹션이 있으면 다음 실행에서 통합 이미지를 다시 만들도록
+    if len(current) != len(sections):
+        manifest.pop("page", None)
+    manifest["sections"] = current
+    save_manifest(manifest, output_dir / "render_manifest.json")
 
     print(f"\n{'='*50}")
     print(f"  완료: {len(generated)} 파일 생성")
@@ -538,7 +1863,69 @@ def main():
     for path in generated:
         print(f"  -> {path}")
 
+    print(f"\n  사진 디코딩: {PHOTOS.decodes}회 "
+          f"(디코딩 {SCALE_STATS['decoded_mpx']:.1f}MP → 출력 {SCALE_STATS['emitted_mpx']:.1f}MP, "
+          f"{RESAMPLE_MODE})")
+    if LAYERS.hits or LAYERS.disk_hits or LAYERS.misses:
+        print(f"  배경 레이어 캐시: hit {LAYERS.hits + LAYERS.disk_hits}회 "
+              f"(디스크 {LAYERS.disk_hits}) / miss {LAYERS.misses}회")
+    print(f"  소요 시간: 그리기 {TIMINGS['draw']:.2f}s / "
+          f"PNG 인코딩 {TIMINGS['encode']:.2f}s / 파일 쓰기 {TIMINGS['write']:.2f}s "
+          f"({PNG_PRESET})")
+    fonts = font_cache_info()
+    for key, value in WORKER_FONT_STATS.items():
+        fonts[key] += value
+    print(f"  폰트 캐시: hit {fonts['hits']} / miss {fonts['misses']} "
+          f"(보관 {fonts['size']}/{fonts['maxsize']})")
+
     print()
+    return {"generated": generated, "failed": failed}
+
+
+def run(output_dir=None, profiles=None, **options):
+    """output_dir의 render_data.json을 읽어 render_page 실행
+
+    profiles를 주면 같은 레이아웃으로 프로필마다 렌더링합니다 (render_profiles).
+    """
+    output_dir = Path(output_dir or OUTPUT_DIR)
+    render_data = output_dir / "render_data.json"
+    if not render_data.exists():
+        raise FileNotFoundError(f"{render_data} 파일이 없습니다.")
+
+    with open(render_data, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if profiles:
+        return render_profiles(data, profiles, output_dir, **options)
+    return render_page(data, output_dir, **options)
+
+
+def print_trace_summary(limit=20):
+    """TRACE 요약 표 출력 (누적 시간 상위 limit개)"""
+    if not TRACE.events:
+        return
+    print(f"  계측 구간 (누적 시간 상위 {limit}개, 자기 시간 = 안쪽 구간 제외):")
+    for line in TRACE.format_summary(limit):
+        print(line)
+    print()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.trace:
+        TRACE.enable()
+    try:
+        run(
+            workers=args.workers, resample=args.resample, png_preset=args.png_preset,
+            slice_height=args.slice_height, force=args.force,
+            encode_threads=args.encode_threads, output_dir=args.output_dir,
+            profiles=args.profiles,
+        )
+    except (FileNotFoundError, ValueError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    if args.trace:
+        print_trace_summary()
+        print(f"  trace: {TRACE.save(args.trace)} (chrome://tracing / ui.perfetto.dev)")
 
 
 if __name__ == "__main__":
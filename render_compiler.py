@@ -0,0 +1,678 @@
+#!/usr/bin/env python3
+"""
+⑤ 렌더 데이터 컴파일러 (Step 5 로컬 대체)
+page_copy.json + design_spec.json → render_data.json
+
+디자인 에이전트가 설계하는 10개 섹션마다 정해진 레이아웃으로 카피를 배치합니다.
+텍스트는 render.py와 같은 폰트/줄바꿈으로 실제 측정해 위치를 정하고, 내용이
+권장 높이보다 길면 캔버스를 늘려 캔버스 밖으로 나가는 요소가 없게 합니다.
+LLM(Claude) 병합은 비표준 카피/섹션을 위한 대안으로 남겨 둡니다.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, str(Path(__file__).parent))
+import render
+from agent_designer import DESIGN_SECTIONS, section_copy
+
+PROJECT_ROOT = Path(__file__).parent.parent
+OUTPUT_DIR = PROJECT_ROOT / "output"
+
+MARGIN = 60          # 디자인 원칙: 최소 60px 마진
+LINE_SPACING = 1.5   # render.draw_text_element 행간
+SIDE_COLUMN = 0.55   # 히어로/CTA 텍스트 폭 (나머지는 SECTION_PHOTOS 제품 사진 자리)
+
+DEFAULT_STYLE = {
+    "primary_color": "#2C3E50",
+    "secondary_color": "#ECF0F1",
+    "accent_color": "#E67E22",
+    "bg_color": "#FFFFFF",
+    "text_color": "#222222",
+}
+
+# 카피 필드 이름 후보 (카피라이팅 단계가 자유 형식이므로 영문/국문 키를 모두 찾음)
+HEADLINE_KEYS = ("headline", "title", "heading", "main_copy", "헤드라인", "타이틀", "제목")
+SUB_KEYS = ("subcopy", "sub_copy", "subheadline", "sub_headline", "subtitle", "description",
+            "desc", "body", "서브카피", "설명")
+BADGE_KEYS = ("badge", "badges", "배지")
+MESSAGE_KEYS = ("key_message", "keymessage", "message", "키메시지")
+BUTTON_KEYS = ("button_text", "button", "cta", "버튼텍스트", "버튼")
+ITEM_TITLE_KEYS = ("title", "name", "feature", "label", "item", "category", "step_title",
+                   "headline", "summary", "question", "q", "항목", "제목", "기능명", "질문")
+ITEM_BODY_KEYS = ("description", "benefit", "detail", "content", "text", "review", "desc",
+                  "value", "answer", "a", "설명", "내용", "상세", "답변")
+ICON_KEYS = ("icon", "icon_keyword", "emoji", "아이콘")
+RATING_KEYS = ("rating", "stars", "score", "별점")
+AUTHOR_KEYS = ("author", "reviewer", "nickname", "작성자")
+GENERAL_KEYS = ("general", "normal", "others", "competitor", "before", "일반", "타사")
+OURS_KEYS = ("ours", "our", "us", "our_product", "after", "우리")
+
+# 측정 전용 draw (render.py와 같은 textbbox 기준)
+_MEASURE = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+
+
+# ──────────────────────────────────────────────
+# 카피/스타일 해석
+# ──────────────────────────────────────────────
+
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return " · ".join(_text(v) for v in value if v)
+    if isinstance(value, dict):
+        return " ".join(_text(v) for v in value.values() if v)
+    return str(value).strip()
+
+
+def _field(data, keys, default=""):
+    if not isinstance(data, dict):
+        return default
+    for key in keys:
+        value = data.get(key)
+        if value not in (None, "", [], {}):
+            return value
+    return default
+
+
+def _items(copy):
+    """섹션 카피에서 리스트 항목 찾기 (첫 번째 리스트 값, dict 스펙 테이블은 쌍으로)"""
+    if isinstance(copy, list):
+        return copy
+    if not isinstance(copy, dict):
+        return []
+    for key, value in copy.items():
+        if isinstance(value, list) and value and key not in BADGE_KEYS:
+            return value
+    for key in ("specs", "spec", "table", "스펙"):
+        if isinstance(copy.get(key), dict):
+            return [{"label": k, "value": v} for k, v in copy[key].items()]
+    return []
+
+
+def _item_parts(item):
+    """리스트 항목 → (제목, 본문)"""
+    if isinstance(item, dict):
+        title = _text(_field(item, ITEM_TITLE_KEYS))
+        body = _text(_field(item, ITEM_BODY_KEYS))
+        if not title and not body:
+            body = _text(item)
+        return title, body
+    return "", _text(item)
+
+
+def _hex_rgb(color):
+    color = str(color).lstrip("#")
+    if len(color) == 3:
+        color = "".join(c * 2 for c in color)
+    try:
+        return tuple(int(color[i:i + 2], 16) for i in (0, 2, 4))
+    except ValueError:
+        return (255, 255, 255)
+
+
+def _mix(color, other, amount):
+    """두 색을 amount 비율로 섞은 hex"""
+    a, b = _hex_rgb(color), _hex_rgb(other)
+    return "#{:02X}{:02X}{:02X}".format(
+        *(round(x + (y - x) * amount) for x, y in zip(a, b))
+    )
+
+
+def _is_dark(color):
+    r, g, b = _hex_rgb(color)
+    return (r * 299 + g * 587 + b * 114) / 1000 < 128
+
+
+def section_style(design_section, global_style, index):
+    """섹션 색상/크기: 섹션 스펙 → global_style → 기본값 순"""
+    style = dict(DEFAULT_STYLE)
+    style.update({k: v for k, v in (global_style or {}).items() if isinstance(v, str) and v})
+    # 섹션 배경을 지정하지 않았으면 배경/보조색 교차 (시각적 리듬감)
+    bg = design_section.get("bg_color") or (
+        style["bg_color"] if index % 2 == 0 else style["secondary_color"]
+    )
+    text = design_section.get("text_color") or style["text_color"]
+    if _is_dark(bg) == _is_dark(text):
+        text = "#FFFFFF" if _is_dark(bg) else "#222222"
+    accent = design_section.get("accent_color") or style["accent_color"]
+
+    sizes = sorted(
+        e["font_size"] for e in design_section.get("elements", [])
+        if isinstance(e, dict) and isinstance(e.get("font_size"), (int, float))
+    )
+    return {
+        "bg": bg,
+        "text": text,
+        "muted": _mix(text, bg, 0.35),
+        "accent": accent,
+        "on_accent": "#FFFFFF" if _is_dark(accent) else "#222222",
+        "card": _mix(bg, text, 0.06),
+        "line": _mix(bg, text, 0.15),
+        "title_size": int(min(max(sizes[-1] if sizes else 48, 36), 72)),
+        "body_size": int(min(max(sizes[0] if sizes else 24, 20), 30)),
+    }
+
+
+# ──────────────────────────────────────────────
+# 측정
+# ──────────────────────────────────────────────
+
+def measure_text(content, font_size, max_width, weight="normal", wrap="word"):
+    """render.draw_text_element와 같은 방식으로 (줄 목록, 최대 줄 폭, 높이) 계산"""
+    content = render.clean_emoji(content)
+    if not content:
+        return [], 0, 0
+    font = render.get_font(font_size, weight)
+    lines = render.wrap_text(content, font, max_width, _MEASURE, wrap)
+    widest = max(render.text_width(_MEASURE, line, font) for line in lines)
+    return lines, widest, len(lines) * int(font_size * LINE_SPACING)
+
+
+def fit_font_size(content, font_size, max_width, max_lines, min_size, weight="bold"):
+    """max_lines 줄 안에 들어갈 때까지 글자 크기를 4px씩 줄임"""
+    while font_size > min_size:
+        lines, _, _ = measure_text(content, font_size, max_width, weight)
+        if len(lines) <= max_lines:
+            break
+        font_size -= 4
+    return max(font_size, min_size)
+
+
+def badge_size(content, font_size, padding=12):
+    """render.draw_badge 한 줄 배지의 (폭, 높이)"""
+    font = render.get_font(font_size, "bold")
+    left, top, right, bottom = _MEASURE.textbbox((0, 0), render.clean_emoji(content), font=font)
+    return right - left + padding * 2, bottom - top + padding * 2
+
+
+# ──────────────────────────────────────────────
+# 레이아웃
+# ──────────────────────────────────────────────
+
+class Layout:
+    """위에서 아래로 요소를 쌓으며 y 위치를 측정값으로 계산"""
+
+    def __init__(self, width, style, left=MARGIN, right=None):
+        self.width = width
+        self.style = style
+        self.left = left
+        self.right = width - MARGIN if right is None else right
+        self.y = 0
+        self.elements = []
+
+    @property
+    def column(self):
+        return self.right - self.left
+
+    def gap(self, height):
+        self.y += height
+
+    def text(self, content, font_size, align="left", weight="normal", color=None,
+             left=None, right=None, y=None):
+        """텍스트 요소 추가 후 차지한 높이 반환 (y를 주면 커서를 움직이지 않음)"""
+        left = self.left if left is None else left
+        right = self.right if right is None else right
+        content = _text(content)
+        _, _, height = measure_text(content, font_size, right - left, weight)
+        if not height:
+            return 0
+        x = {"center": (left + right) // 2, "right": right}.get(align, left)
+        self.elements.append({
+            "type": "text", "content": content,
+            "x": x, "y": self.y if y is None else y,
+            "font_size": font_size, "font_weight": weight,
+            "color": color or self.style["text"], "align": align,
+            "max_width": right - left,
+        })
+        if y is None:
+            self.y += height
+        return height
+
+    def title(self, content, align="center", max_lines=2):
+        size = fit_font_size(_text(content), self.style["title_size"], self.column,
+                             max_lines, 28)
+        height = self.text(content, size, align, "bold")
+        if height:
+            self.gap(32)
+
+    def badge(self, content, align="center"):
+        content = _text(content)
+        if not content:
+            return
+        font_size = max(self.style["body_size"] - 2, 18)
+        width, height = badge_size(content, font_size)
+        if width > self.column:
+            # 한 줄 배지가 안 들어가면 accent 색 굵은 텍스트로
+            self.text(content, font_size, align, "bold", self.style["accent"])
+            self.gap(16)
+            return
+        x = (self.left + self.right - width) // 2 if align == "center" else self.left
+        self.elements.append({
+            "type": "badge", "content": content, "x": x, "y": self.y,
+            "bg_color": self.style["accent"], "text_color": self.style["on_accent"],
+            "font_size": font_size, "padding": 12,
+        })
+        self.gap(height + 24)
+
+    def rectangle(self, x, y, width, height, fill, radius=16):
+        self.elements.append({
+            "type": "rectangle", "x": x, "y": y, "width": width, "height": height,
+            "fill": fill, "radius": radius,
+        })
+
+    def card(self, title, body, left, right, padding=28, marker=None):
+        """제목 + 본문 카드를 y 위치에 놓고 높이 반환 (커서는 그대로)"""
+        body_size = self.style["body_size"]
+        start = len(self.elements)
+        inner_left = left + padding + (40 if marker else 0)
+        y = self.y + padding
+        if title:
+            y += self.text(title, body_size + 2, weight="bold", left=inner_left,
+                           right=right - padding, y=y)
+            if body:
+                y += 8
+        if body:
+            y += self.text(body, body_size, color=self.style["muted"] if title else None,
+                           left=inner_left, right=right - padding, y=y)
+        height = y - self.y + padding
+        self.elements.insert(start, {
+            "type": "rectangle", "x": left, "y": self.y, "width": right - left,
+            "height": height, "fill": self.style["card"], "radius": 16,
+        })
+        if marker:
+            self._marker(marker, left + padding + 14, self.y + padding + body_size * 3 // 4)
+        return height
+
+    def _marker(self, label, cx, cy, radius=14):
+        """카드 왼쪽 accent 원 (번호가 있으면 가운데에 표시)"""
+        self.elements.append({
+            "type": "circle", "cx": cx, "cy": cy, "radius": radius,
+            "fill": self.style["accent"],
+        })
+        if label is not True:
+            size = radius + 2
+            self.elements.append({
+                "type": "text", "content": str(label), "x": cx,
+                "y": cy - int(size * LINE_SPACING) // 2 + 2,
+                "font_size": size, "font_weight": "bold",
+                "color": self.style["on_accent"], "align": "center",
+                "max_width": radius * 2,
+            })
+
+    def cards(self, items, columns=1, marker=None, gap=20):
+        """카드 목록 (columns열 그리드, 같은 행의 카드는 높이를 맞춤)"""
+        col_width = (self.column - gap * (columns - 1)) // columns
+        for row_start in range(0, len(items), columns):
+            row = items[row_start:row_start + columns]
+            heights = []
+            for col, (title, body) in enumerate(row):
+                left = self.left + col * (col_width + gap)
+                label = (row_start + col + 1) if marker == "number" else marker
+                start = len(self.elements)
+                heights.append((start, self.card(title, body, left, left + col_width,
+                                                 marker=label)))
+            tallest = max(height for _, height in heights)
+            for start, _ in heights:
+                self.elements[start]["height"] = tallest
+            self.gap(tallest + gap)
+
+    def table(self, rows, weights, header=None, highlight=None):
+        """표: 열 폭 비율 weights, 행 사이 구분선, highlight 열은 accent 굵게"""
+        body_size = self.style["body_size"]
+        total = sum(weights)
+        edges = [self.left]
+        for weight in weights:
+            edges.append(edges[-1] + self.column * weight // total)
+        edges[-1] = self.right
+        padding = 16
+
+        def add_row(cells, bold=False, header_row=False):
+            start = len(self.elements)
+            heights = []
+            for col, cell in enumerate(cells):
+                strong = bold or col == 0 or col == highlight
+                color = None
+                if col == highlight:
+                    color = self.style["on_accent"] if header_row else self.style["accent"]
+                heights.append(self.text(
+                    cell, body_size, "left", "bold" if strong else "normal", color,
+                    left=edges[col] + padding, right=edges[col + 1] - padding,
+                    y=self.y + padding,
+                ))
+            height = max(heights + [body_size]) + padding * 2
+            if header_row and highlight is not None:
+                self.elements.insert(start, {
+                    "type": "rectangle", "x": edges[highlight], "y": self.y,
+                    "width": edges[highlight + 1] - edges[highlight], "height": height,
+                    "fill": self.style["accent"], "radius": 8,
+                })
+            self.y += height
+            self.elements.append({
+                "type": "line", "x1": self.left, "y1": self.y, "x2": self.right,
+                "y2": self.y, "color": self.style["line"], "width": 1,
+            })
+
+        if header:
+            add_row(header, bold=True, header_row=True)
+        for cells in rows:
+            add_row(cells)
+        self.gap(24)
+
+    def button(self, content, align="center"):
+        content = _text(content)
+        if not content:
+            return
+        font_size = self.style["body_size"] + 4
+        lines, text_w, text_h = measure_text(content, font_size, self.column - 96, "bold")
+        width = min(text_w + 96, self.column)
+        x = (self.left + self.right - width) // 2 if align == "center" else self.left
+        height = text_h + 40
+        self.rectangle(x, self.y, width, height, self.style["accent"], radius=height // 2)
+        self.text(content, font_size, "center", "bold", self.style["on_accent"],
+                  left=x + 48, right=x + width - 48, y=self.y + 20)
+        self.gap(height + 24)
+
+
+# ──────────────────────────────────────────────
+# 섹션별 레이아웃: (Layout, 섹션 카피) → 요소 추가
+# ──────────────────────────────────────────────
+
+def _side_column(layout):
+    """히어로/CTA: 오른쪽은 제품 사진(SECTION_PHOTOS side) 자리로 비워 둠"""
+    layout.right = int(layout.width * SIDE_COLUMN)
+
+
+def layout_hero(layout, copy):
+    _side_column(layout)
+    badges = _field(copy, BADGE_KEYS)
+    for badge in badges if isinstance(badges, list) else [badges]:
+        layout.badge(badge, align="left")
+    size = fit_font_size(_text(_field(copy, HEADLINE_KEYS)), layout.style["title_size"] + 8,
+                         layout.column, 3, 36)
+    if layout.text(_field(copy, HEADLINE_KEYS), size, weight="bold"):
+        layout.gap(28)
+    layout.text(_field(copy, SUB_KEYS), layout.style["body_size"] + 4,
+                color=layout.style["muted"])
+
+
+def layout_pain_point(layout, copy):
+    layout.title(_field(copy, HEADLINE_KEYS))
+    layout.cards([_item_parts(item) for item in _items(copy)], marker=True)
+
+
+def layout_solution(layout, copy):
+    layout.title(_field(copy, HEADLINE_KEYS))
+    if layout.text(_field(copy, SUB_KEYS), layout.style["body_size"] + 2, "center",
+                   color=layout.style["muted"]):
+        layout.gap(40)
+    message = _text(_field(copy, MESSAGE_KEYS))
+    if message:
+        size = layout.style["body_size"] + 6
+        _, _, height = measure_text(message, size, layout.column - 80, "bold")
+        layout.rectangle(layout.left, layout.y, layout.column, height + 64,
+                         layout.style["accent"])
+        layout.text(message, size, "center", "bold", layout.style["on_accent"],
+                    left=layout.left + 40, right=layout.right - 40, y=layout.y + 32)
+        layout.gap(height + 64)
+
+
+def layout_features(layout, copy):
+    layout.title(_field(copy, HEADLINE_KEYS))
+    items = []
+    for item in _items(copy):
+        title, body = _item_parts(item)
+        icon = _text(_field(item, ICON_KEYS)) if isinstance(item, dict) else ""
+        if icon and not title:
+            title = icon
+        items.append((title, body))
+    layout.cards(items, columns=2 if len(items) > 1 else 1)
+
+
+def _pair(item, first_keys, second_keys):
+    if isinstance(item, dict):
+        first = _text(_field(item, first_keys))
+        second = _text(_field(item, second_keys))
+        if first or second:
+            return first, second
+        if len(item) == 1:
+            key, value = next(iter(item.items()))
+            return _text(key), _text(value)
+    if isinstance(item, (list, tuple)) and len(item) >= 2:
+        return _text(item[0]), _text(item[1])
+    text = _text(item)
+    if ":" in text:
+        first, second = text.split(":", 1)
+        return first.strip(), second.strip()
+    return text, ""
+
+
+def layout_specs(layout, copy):
+    layout.title(_field(copy, HEADLINE_KEYS) or "제품 사양")
+    rows = [_pair(item, ("label", "name", "item", "key", "항목"), ("value", "spec", "값", "내용"))
+            for item in _items(copy)]
+    layout.table(rows, [35, 65])
+
+
+def layout_how_to_use(layout, copy):
+    layout.title(_field(copy, HEADLINE_KEYS) or "사용 방법")
+    layout.cards([_item_parts(item) for item in _items(copy)], marker="number")
+
+
+def layout_difference(layout, copy):
+    layout.title(_field(copy, HEADLINE_KEYS))
+    rows = []
+    for item in _items(copy):
+        if isinstance(item, dict):
+            rows.append((
+                _text(_field(item, ("item", "category", "label", "항목", "title"))),
+                _text(_field(item, GENERAL_KEYS)),
+                _text(_field(item, OURS_KEYS)),
+            ))
+        else:
+            rows.append(("", "", _text(item)))
+    labels = copy.get("labels") if isinstance(copy, dict) else None
+    header = ["", "일반 제품", "우리 제품"]
+    if isinstance(labels, (list, tuple)) and len(labels) >= 2:
+        header = ["", _text(labels[0]), _text(labels[1])]
+    layout.table(rows, [26, 37, 37], header=header, highlight=2)
+
+
+def _rating_label(rating):
+    """별점(5, "4.5", "★★★★★") → "4.5점"
+
+    ★는 폰트에 글리프가 없으면 clean_emoji가 ●로 바꾸므로, 폰트와 관계없이
+    같게 보이도록 숫자로 표시합니다.
+    """
+    if isinstance(rating, str) and "★" in rating:
+        rating = rating.count("★")
+    try:
+        score = min(max(float(rating), 0), 5)
+    except (TypeError, ValueError):
+        return ""
+    return f"{score:.1f}점"
+
+
+def layout_reviews(layout, copy):
+    layout.title(_field(copy, HEADLINE_KEYS) or "구매 후기")
+    for item in _items(copy):
+        title, body = _item_parts(item)
+        if isinstance(item, dict):
+            rating = _field(item, RATING_KEYS)
+            author = _text(_field(item, AUTHOR_KEYS))
+            label = _rating_label(rating)
+            if label:
+                title = f"[{label}]  {title}".strip()
+            if author:
+                body = f"{body}\n- {author}" if body else f"- {author}"
+        layout.cards([(title, body)])
+
+
+def layout_faq(layout, copy):
+    layout.title(_field(copy, HEADLINE_KEYS) or "자주 묻는 질문")
+    for item in _items(copy):
+        question, answer = _pair(item, ("question", "q", "질문"), ("answer", "a", "답변"))
+        layout.text(f"Q. {question}", layout.style["body_size"] + 2, weight="bold")
+        layout.gap(10)
+        if answer:
+            layout.text(f"A. {answer}", layout.style["body_size"], color=layout.style["muted"])
+        layout.gap(20)
+        layout.elements.append({
+            "type": "line", "x1": layout.left, "y1": layout.y, "x2": layout.right,
+            "y2": layout.y, "color": layout.style["line"], "width": 1,
+        })
+        layout.gap(28)
+
+
+def layout_cta(layout, copy):
+    _side_column(layout)
+    size = fit_font_size(_text(_field(copy, HEADLINE_KEYS)), layout.style["title_size"],
+                         layout.column, 3, 32)
+    if layout.text(_field(copy, HEADLINE_KEYS), size, weight="bold"):
+        layout.gap(24)
+    if layout.text(_field(copy, SUB_KEYS), layout.style["body_size"] + 2,
+                   color=layout.style["muted"]):
+        layout.gap(40)
+    layout.button(_field(copy, BUTTON_KEYS) or "지금 구매하기", align="left")
+
+
+def layout_generic(layout, copy):
+    """알 수 없는 섹션: 제목 + 설명 + 항목 카드"""
+    layout.title(_field(copy, HEADLINE_KEYS))
+    if layout.text(_field(copy, SUB_KEYS), layout.style["body_size"], "center"):
+        layout.gap(32)
+    layout.cards([_item_parts(item) for item in _items(copy)])
+
+
+SECTION_LAYOUTS = {
+    "01_hero": layout_hero,
+    "02_pain_point": layout_pain_point,
+    "03_solution": layout_solution,
+    "04_features": layout_features,
+    "05_specs": layout_specs,
+    "06_how_to_use": layout_how_to_use,
+    "07_difference": layout_difference,
+    "08_reviews": layout_reviews,
+    "09_faq": layout_faq,
+    "10_cta": layout_cta,
+}
+
+
+# ──────────────────────────────────────────────
+# 컴파일
+# ──────────────────────────────────────────────
+
+def _design_sections(design_spec):
+    sections = design_spec.get("sections", []) if isinstance(design_spec, dict) else []
+    return {
+        str(s.get("id", "")).split("_", 1)[0]: s for s in sections if isinstance(s, dict)
+    }
+
+
+def _shift(elements, dy):
+    for elem in elements:
+        for key in ("y", "y1", "y2", "cy"):
+            if key in elem:
+                elem[key] += dy
+
+
+def compile_section(section_id, size, copy, design_section, global_style, index):
+    """섹션 하나 → render_data 섹션 dict"""
+    width, height = (int(v) for v in size.split("×"))
+    width = int(design_section.get("width") or width)
+    height = int(design_section.get("height") or height)
+    style = section_style(design_section, global_style, index)
+
+    layout = Layout(width, style)
+    SECTION_LAYOUTS.get(section_id, layout_generic)(layout, copy if isinstance(copy, dict) else {})
+
+    # 내용이 짧으면 세로 가운데, 길면 캔버스를 늘려 위아래 마진 확보
+    content_height = max([_bottom(e) for e in layout.elements], default=0)
+    height = max(height, content_height + MARGIN * 2)
+    _shift(layout.elements, max(MARGIN, (height - content_height) // 2))
+
+    section = {
+        "id": section_id,
+        "filename": f"{section_id}.png",
+        "canvas": {"width": width, "height": height},
+        "background": style["bg"],
+        "elements": layout.elements,
+    }
+    if design_section.get("image_prompt"):
+        section["image_prompt"] = design_section["image_prompt"]
+    return section
+
+
+def _bottom(elem):
+    if elem["type"] == "text":
+        _, _, height = measure_text(elem["content"], elem["font_size"], elem["max_width"],
+                                    elem["font_weight"])
+        return elem["y"] + height
+    if elem["type"] == "rectangle":
+        return elem["y"] + elem["height"]
+    if elem["type"] == "badge":
+        # layout_check.element_boxes와 같은 배경 박스 (padding/여러 줄 포함)
+        _, lines, _, box = render.layout_badge(_MEASURE, elem)
+        return box[3] if lines else elem["y"]
+    if elem["type"] == "circle":
+        return elem["cy"] + elem["radius"]
+    if elem["type"] == "line":
+        return max(elem["y1"], elem["y2"])
+    return elem.get("y", 0)
+
+
+def compile_render_data(copy_data, design_spec):
+    """page_copy + design_spec dict → render_data dict (10개 섹션, 파일 입출력 없음)"""
+    design = _design_sections(design_spec)
+    global_style = design_spec.get("global_style", {}) if isinstance(design_spec, dict) else {}
+    sections = []
+    for index, (section_id, size, _) in enumerate(DESIGN_SECTIONS):
+        design_section = design.get(section_id.split("_", 1)[0], {})
+        copy = section_copy(copy_data, section_id)
+        if copy is copy_data:
+            # 카피에 해당 섹션이 없으면 전체 카피를 반복하지 않고 건너뜀
+            continue
+        sections.append(compile_section(section_id, size, copy, design_section,
+                                        global_style, index))
+    return {"sections": sections}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="렌더 데이터 컴파일러: page_copy.json + design_spec.json → render_data.json")
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR,
+                        help=f"입출력 폴더 (기본: {OUTPUT_DIR})")
+    args = parser.parse_args(argv)
+
+    inputs = {}
+    for name in ("page_copy", "design_spec"):
+        path = args.output_dir / f"{name}.json"
+        if not path.exists():
+            print(f"ERROR: {path} 파일이 없습니다.")
+            sys.exit(1)
+        with open(path, "r", encoding="utf-8") as f:
+            inputs[name] = json.load(f)
+
+    start = time.perf_counter()
+    result = compile_render_data(inputs["page_copy"], inputs["design_spec"])
+    elapsed = time.perf_counter() - start
+
+    output_path = args.output_dir / "render_data.json"
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(result, ensure_ascii=False, indent=2, fp=f)
+
+    print(f"완료: {output_path} ({elapsed * 1000:.0f}ms)")
+    for section in result["sections"]:
+        canvas = section["canvas"]
+        print(f"  {section['id']}: {canvas['width']}x{canvas['height']}, "
+              f"요소 {len(section['elements'])}개")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+렌더링 계측 (opt-in): 구간(span)을 기록해 Chrome trace JSON과 요약 표로 내보냄
+
+render.py가 섹션, 요소 타입(text/badge/icon_text ...), 폰트 로드, 줄바꿈,
+사진 디코딩/축소/붙이기, PNG 인코딩/쓰기 구간을 TRACE.span()으로 감쌉니다.
+꺼져 있으면 span()은 미리 만든 빈 컨텍스트를 돌려주므로 비용은 메서드 호출 한 번입니다.
+
+저장한 JSON은 chrome://tracing 또는 https://ui.perfetto.dev 에서 열 수 있습니다.
+시각은 time.perf_counter (Linux/macOS에서는 프로세스 간 공통 단조 시계)라서
+워커 프로세스의 구간도 같은 타임라인에 놓입니다.
+
+사용 예:
+    python3 render.py --trace output/render_trace.json
+"""
+
+import json
+import os
+import threading
+import time
+import unicodedata
+from contextlib import nullcontext
+from pathlib import Path
+
+_NULL_SPAN = nullcontext()
+
+
+def _pad(text, width, right=False):
+    """터미널 표시 폭 기준 정렬 (한글은 2칸)"""
+    shown = sum(2 if unicodedata.east_asian_width(ch) in "WF" else 1 for ch in text)
+    fill = " " * max(0, width - shown)
+    return fill + text if right else text + fill
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.add(self.name, self.cat, self.start, time.perf_counter(), self.args)
+
+
+class Tracer:
+    """구간 기록기
+
+    이벤트는 (이름, 분류, 시작, 끝, pid, tid, args) 튜플로 쌓고, 내보낼 때만
+    trace-event 형식으로 바꿉니다. 리스트 append는 GIL 아래에서 원자적이라
+    PNG 인코딩 스레드에서도 잠금 없이 기록합니다.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.events = []
+        self._pid = os.getpid()
+        self._threads = {}
+
+    def enable(self):
+        self.enabled = True
+        self._pid = os.getpid()
+
+    def disable(self):
+        self.enabled = False
+
+    def clear(self):
+        self.events = []
+        self._threads = {}
+
+    def span(self, name, cat, args=None):
+        """with 블록 하나를 구간으로 기록 (꺼져 있으면 빈 컨텍스트)"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, args)
+
+    def add(self, name, cat, start, end, args=None):
+        tid = threading.get_ident()
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+        self.events.append((name, cat, start, end, self._pid, tid, args))
+
+    def drain(self):
+        """기록한 이벤트를 꺼내고 비움 (워커 → 부모 전달용)"""
+        events, self.events = self.events, []
+        return events
+
+    def extend(self, events):
+        """다른 프로세스에서 drain한 이벤트 합치기"""
+        self.events.extend(tuple(event) for event in events)
+
+    # ──────────────────────────────────────────
+    # 내보내기
+    # ──────────────────────────────────────────
+
+    def trace_events(self):
+        """Chrome trace-event 목록 (complete 이벤트 + 프로세스/스레드 이름)"""
+        if not self.events:
+            return []
+        origin = min(event[2] for event in self.events)
+        out = []
+        for pid in sorted({event[4] for event in self.events}):
+            name = "render" if pid == self._pid else f"render worker {pid}"
+            out.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                        "args": {"name": name}})
+        for tid, name in self._threads.items():
+            out.append({"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid,
+                        "args": {"name": name}})
+        for name, cat, start, end, pid, tid, args in self.events:
+            event = {
+                "name": name, "cat": cat, "ph": "X", "pid": pid, "tid": tid,
+                "ts": round((start - origin) * 1e6, 3),
+                "dur": round((end - start) * 1e6, 3),
+            }
+            if args:
+                event["args"] = args
+            out.append(event)
+        return out
+
+    def save(self, path):
+        """Chrome trace JSON 저장"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.trace_events(), "displayTimeUnit": "ms"},
+                      f, ensure_ascii=False)
+        return path
+
+    def summary(self):
+        """(분류, 이름)별 횟수 / 누적 시간 / 자기 시간(하위 구간 제외) / 최대, 누적 시간 내림차순"""
+        self_times = self._self_times()
+        rows = {}
+        for event, self_time in zip(self.events, self_times):
+            name, cat, start, end = event[:4]
+            row = rows.setdefault((cat, name), {
+                "cat": cat, "name": name, "count": 0, "total": 0.0, "self": 0.0, "max": 0.0,
+            })
+            row["count"] += 1
+            row["total"] += end - start
+            row["self"] += self_time
+            row["max"] = max(row["max"], end - start)
+        return sorted(rows.values(), key=lambda row: row["total"], reverse=True)
+
+    def _self_times(self):
+        """이벤트마다 같은 스레드에서 안쪽에 있는 구간을 뺀 시간"""
+        self_times = [event[3] - event[2] for event in self.events]
+        by_thread = {}
+        for i, event in enumerate(self.events):
+            by_thread.setdefault((event[4], event[5]), []).append(i)
+        for indices in by_thread.values():
+            # 시작 순 (같으면 긴 구간이 바깥)
+            indices.sort(key=lambda i: (self.events[i][2], -self.events[i][3]))
+            stack = []
+            for i in indices:
+                start, end = self.events[i][2], self.events[i][3]
+                while stack and self.events[stack[-1]][3] <= start:
+                    stack.pop()
+                if stack:
+                    self_times[stack[-1]] -= end - start
+                stack.append(i)
+        return self_times
+
+    def format_summary(self, limit=None):
+        """요약 표 (문자열 줄 목록, limit이 있으면 누적 시간 상위 N개)"""
+        rows = self.summary()
+        if limit:
+            rows = rows[:limit]
+        headers = [("분류", 8), ("이름", 24), ("횟수", 6), ("누적(ms)", 10), ("자기(ms)", 10),
+                   ("평균(ms)", 9), ("최대(ms)", 9)]
+        lines = ["  " + " ".join(_pad(text, width, right=i >= 2)
+                                 for i, (text, width) in enumerate(headers))]
+        for row in rows:
+            lines.append(
+                f"  {row['cat']:<8} {row['name'][:24]:<24} {row['count']:>6} "
+                f"{row['total'] * 1000:>10.1f} {row['self'] * 1000:>10.1f} "
+                f"{row['total'] * 1000 / row['count']:>9.2f} {row['max'] * 1000:>9.2f}"
+            )
+        return lines